@@ -0,0 +1,42 @@
+"""Add game archives
+
+Finished games and their action logs are moved to game_archives by the
+retention job; the indexes serve its batch selection and deletes.
+
+Revision ID: add_game_archives
+Revises: add_lobby_listing_index
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_game_archives'
+down_revision = 'add_lobby_listing_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'game_archives',
+        sa.Column('game_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('lobby_id', sa.Integer(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('action_count', sa.Integer(), nullable=False),
+        sa.Column('players_json', sa.Text(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint('game_id'),
+    )
+    op.create_index('ix_game_archives_finished_at', 'game_archives', ['finished_at'])
+    op.create_index('ix_games_status_updated_at', 'games', ['status', 'updated_at'])
+    op.create_index('ix_game_actions_game_id_id', 'game_actions', ['game_id', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_game_actions_game_id_id', table_name='game_actions')
+    op.drop_index('ix_games_status_updated_at', table_name='games')
+    op.drop_index('ix_game_archives_finished_at', table_name='game_archives')
+    op.drop_table('game_archives')
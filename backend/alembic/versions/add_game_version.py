@@ -0,0 +1,25 @@
+"""Add game version
+
+Version counter used to sequence WebSocket state updates.
+
+Revision ID: add_game_version
+Revises: add_solo_game_support
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_game_version'
+down_revision = 'add_solo_game_support'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('games', sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    op.drop_column('games', 'version')
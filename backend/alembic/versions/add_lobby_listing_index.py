@@ -0,0 +1,28 @@
+"""Add lobby listing index
+
+Serves the lobby browser's keyset pagination over waiting lobbies.
+
+Revision ID: add_lobby_listing_index
+Revises: add_game_version
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_lobby_listing_index'
+down_revision = 'add_game_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_lobbies_status_created_at',
+        'lobbies',
+        ['status', 'created_at', 'id'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_lobbies_status_created_at', table_name='lobbies')
@@ -0,0 +1,135 @@
+"""
+Shared API dependencies.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+import time
+
+from fastapi import Depends, Header, HTTPException, status
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.security import decode_token, get_token_from_header
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """The authenticated user, detached from any session"""
+    id: int
+    email: str
+    username: str
+    is_active: bool
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(user.id, user.email, user.username, user.is_active, user.created_at)
+
+
+# access token -> user ID, for tokens whose signature and expiry were checked
+token_cache: TTLCache[int] = TTLCache(settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_SIZE)
+# user ID -> user, active or not (changing is_active evicts it)
+user_cache: TTLCache[CurrentUser] = TTLCache(settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_SIZE)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Make the next request of a user reload it (e.g. after deactivation)."""
+    user_cache.pop(user_id)
+
+
+@event.listens_for(User.is_active, "set")
+def _on_is_active_set(target: User, value, oldvalue, initiator) -> None:
+    # Deactivation through the ORM takes effect here at once; other
+    # processes notice within AUTH_CACHE_TTL_SECONDS
+    if target.id is not None and value != oldvalue:
+        invalidate_user(target.id)
+
+
+def _verify_access_token(token: str) -> int:
+    """Get the user ID of a valid access token, checking the cache first."""
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+
+    payload = decode_token(token)
+    if not payload or payload.get("type") != "access":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid access token",
+        )
+
+    sub = payload.get("sub")
+    if not sub:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload",
+        )
+
+    user_id = int(sub)
+    # Never keep a token past its expiry
+    token_cache.set(token, user_id, ttl=payload.get("exp", 0) - time.time())
+    return user_id
+
+
+async def get_authenticated_user(
+    db: AsyncSession = Depends(get_db),
+    authorization: str | None = Header(None),
+) -> CurrentUser:
+    """
+    Authenticate the request's bearer token, whether or not the account
+    is still active.
+
+    Verified tokens and users are cached for AUTH_CACHE_TTL_SECONDS, so
+    most requests need no database query.
+
+    Raises:
+        HTTPException: 401 if the token is missing or invalid, or the user
+            does not exist
+    """
+    token = get_token_from_header(authorization)
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing or invalid authorization header",
+        )
+
+    user_id = _verify_access_token(token)
+
+    current = user_cache.get(user_id)
+    if current is not None:
+        return current
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found or inactive",
+        )
+
+    current = CurrentUser.from_user(user)
+    user_cache.set(user_id, current)
+    return current
+
+
+async def get_current_user(
+    user: CurrentUser = Depends(get_authenticated_user),
+) -> CurrentUser:
+    """
+    Authenticate the request's bearer token as an active user.
+
+    Raises:
+        HTTPException: 401 if the token is missing or invalid, or the user
+            does not exist or is inactive
+    """
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found or inactive",
+        )
+    return user
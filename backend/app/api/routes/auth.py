@@ -1,18 +1,18 @@
 """
 Authentication endpoints.
 """
-from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import CurrentUser, get_authenticated_user
 from app.core.database import get_db
 from app.core.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    get_password_hash,
-    get_token_from_header,
-    verify_password,
+    PasswordHasherBusy,
+    password_hasher,
 )
 from app.models.user import User
 from app.schemas.auth import (
@@ -27,6 +27,15 @@ from app.schemas.auth import (
 router = APIRouter()
 
 
+def password_service_busy() -> HTTPException:
+    """503 for a password operation refused by admission control."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts in progress, try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(request: RegisterRequest, db: AsyncSession = Depends(get_db)):
     """Register a new user."""
@@ -46,11 +55,16 @@ async def register(request: RegisterRequest, db: AsyncSession = Depends(get_db))
             detail="Username already taken",
         )
 
+    try:
+        hashed_password = await password_hasher.hash(request.password)
+    except PasswordHasherBusy:
+        raise password_service_busy()
+
     # Create user
     user = User(
         email=request.email,
         username=request.username,
-        hashed_password=get_password_hash(request.password),
+        hashed_password=hashed_password,
     )
     db.add(user)
     await db.flush()
@@ -66,7 +80,14 @@ async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.email == request.email))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(request.password, user.hashed_password):
+    try:
+        verified = user is not None and await password_hasher.verify(
+            request.password, user.hashed_password
+        )
+    except PasswordHasherBusy:
+        raise password_service_busy()
+
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -132,45 +153,11 @@ async def refresh_token(request: RefreshTokenRequest, db: AsyncSession = Depends
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user(
-    db: AsyncSession = Depends(get_db),
-    authorization: str | None = Header(None),
-):
+async def get_me(user: CurrentUser = Depends(get_authenticated_user)):
     """Get current user info."""
-    token = get_token_from_header(authorization)
-    if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing or invalid authorization header",
-        )
-
-    payload = decode_token(token)
-    if not payload or payload.get("type") != "access":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid access token",
-        )
-
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-        )
-
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
-
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is disabled",
         )
-
     return user
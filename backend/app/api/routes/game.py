@@ -1,74 +1,97 @@
 """
 Game API endpoints.
 """
-from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.api.deps import CurrentUser, get_current_user
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import decode_token, get_token_from_header
+from app.core.request_metrics import label_action
 from app.models.game import Game, GameStatus
 from app.models.lobby import Lobby, LobbyStatus
-from app.models.user import User
 from app.schemas.game import (
+    ActionHistoryResponse,
     GameActionRequest,
     GameState,
-    ActionType,
 )
+from app.services.action_service import GameActionService
 from app.services.game_service import GameService
-from app.websocket.game_manager import game_manager, GameMessage, MessageType
+from app.services.history_service import ActionHistoryService
+from app.services.projection_service import StateProjectionService
+from app.services.retention_service import RetentionService
+from app.websocket.game_manager import game_manager
 
 router = APIRouter()
 
 
-async def get_current_user(
-    db: AsyncSession,
-    authorization: str | None,
-) -> User:
-    """Get current user from token."""
-    token = get_token_from_header(authorization)
-    if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing or invalid authorization header",
-        )
+def _game_etag(kind: str, game_id: int, version: int, user_id: int) -> str:
+    """
+    Strong ETag of a game read: the state only changes with the version,
+    and responses are projected per viewer. The kind keeps the tags of
+    different endpoints apart, so a spectator's state tag never passes
+    for a player-only resource.
+    """
+    return f'"{kind}.{game_id}.{version}.{user_id}"'
 
-    payload = decode_token(token)
-    if not payload or payload.get("type") != "access":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid access token",
-        )
 
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-        )
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 specifies for it)."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
 
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
 
-    if not user or not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found or inactive",
-        )
+async def _not_modified(
+    kind: str,
+    db: AsyncSession,
+    game_id: int,
+    user_id: int,
+    if_none_match: str | None,
+) -> Response | None:
+    """
+    Answer a conditional read with 304 if the client's copy is current.
+
+    Only the version column is read, so an unchanged game costs no state
+    decoding. Returns None when the full response has to be built.
+    """
+    if not if_none_match:
+        return None
+    version = await GameService.get_game_version(db, game_id)
+    if version is None:
+        return None
+    etag = _game_etag(kind, game_id, version, user_id)
+    if not _etag_matches(if_none_match, etag):
+        return None
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag))
+
+
+async def _get_game_or_archived(db: AsyncSession, game_id: int) -> Game | None:
+    """Get a game, rebuilt from its archive once the retention job moved it."""
+    game = await GameService.get_game(db, game_id)
+    if game is None:
+        game = await RetentionService.get_archived_game(db, game_id)
+    return game
+
 
-    return user
+def _cache_headers(etag: str) -> dict[str, str]:
+    # Per-user and always revalidated, so polling clients send If-None-Match
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
 
 
 @router.post("/from-lobby/{lobby_id}", status_code=status.HTTP_201_CREATED)
 async def create_game_from_lobby(
     lobby_id: int,
     db: AsyncSession = Depends(get_db),
-    authorization: str | None = Header(None),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Create a new game from a lobby (host only)."""
-    user = await get_current_user(db, authorization)
-
     # Get lobby with players
     from app.models.lobby import LobbyPlayer
     result = await db.execute(
@@ -101,23 +124,100 @@ async def create_game_from_lobby(
     # Check if game already exists
     existing_game = await GameService.get_game_by_lobby(db, lobby_id)
     if existing_game:
-        return GameService.to_game_state_response(existing_game)
+        return GameService.to_game_state_response(existing_game, user.id)
 
     # Create game
     game = await GameService.create_game(db, lobby)
     await db.commit()
 
-    return GameService.to_game_state_response(game)
+    return GameService.to_game_state_response(game, user.id)
+
+
+@router.get("/actions/export")
+async def export_actions(
+    game_ids: list[int] = Query(..., alias="game_id"),
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Export the action logs of several games as NDJSON (one action per line,
+    ordered by game, then action), streamed as it is read.
+
+    Pass game_id once per game; unknown games are skipped.
+    """
+    game_ids = list(dict.fromkeys(game_ids))
+    if len(game_ids) > settings.ACTION_EXPORT_MAX_GAMES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.ACTION_EXPORT_MAX_GAMES} games per export",
+        )
+
+    statuses = await ActionHistoryService.get_statuses(db, game_ids)
+    return StreamingResponse(
+        ActionHistoryService.export_ndjson(statuses, user.id),
+        media_type="application/x-ndjson",
+    )
 
 
 @router.get("/{game_id}")
 async def get_game(
     game_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    """Get game state (conditional on If-None-Match)."""
+    not_modified = await _not_modified("state", db, game_id, user.id, if_none_match)
+    if not_modified:
+        return not_modified
+
+    game = await _get_game_or_archived(db, game_id)
+    if not game:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Game not found",
+        )
+
+    response.headers.update(_cache_headers(_game_etag("state", game.id, game.version, user.id)))
+    return GameService.to_game_state_response(game, user.id)
+
+
+@router.get("/{game_id}/changes")
+async def wait_for_changes(
+    game_id: int,
+    since: int = Query(..., ge=0),
+    timeout: float = Query(30.0, ge=0, le=settings.LONG_POLL_MAX_TIMEOUT_SECONDS),
     db: AsyncSession = Depends(get_db),
-    authorization: str | None = Header(None),
+    user: CurrentUser = Depends(get_current_user),
 ):
-    """Get game state."""
-    await get_current_user(db, authorization)
+    """
+    Long-poll for the next game state (for clients that cannot keep a
+    WebSocket open).
+
+    Returns the state as soon as the game's version is past since, waiting
+    up to timeout seconds for a change; 204 if none came. The wait is on
+    this process's state broadcasts, not the database.
+    """
+    with game_manager.watch_version(game_id) as watch:
+        version = await GameService.get_game_version(db, game_id)
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Game not found",
+            )
+
+        if version <= since:
+            # Give the pooled connection back while parked
+            await db.commit()
+            if not await watch.wait_past(since, timeout):
+                return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+            if watch.state is not None:
+                return {
+                    "version": watch.version,
+                    "game_state": StateProjectionService.for_user(watch.state, user.id),
+                }
 
     game = await GameService.get_game(db, game_id)
     if not game:
@@ -125,8 +225,40 @@ async def get_game(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Game not found",
         )
+    return {
+        "version": game.version,
+        "game_state": GameService.to_game_state_response(game, user.id),
+    }
 
-    return GameService.to_game_state_response(game)
+
+@router.get("/{game_id}/actions", response_model=ActionHistoryResponse)
+async def get_action_history(
+    game_id: int,
+    after: int = Query(0, ge=0),
+    limit: int = Query(
+        settings.ACTION_HISTORY_PAGE_SIZE, ge=1, le=settings.ACTION_HISTORY_MAX_PAGE_SIZE
+    ),
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Get a game's actions, oldest first, one page at a time.
+
+    Pass the previous page's next_after as after for the next page.
+    """
+    game_status = await ActionHistoryService.get_status(db, game_id)
+    if game_status is None:
+        archive = await RetentionService.get_archive(db, game_id)
+        if archive is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Game not found",
+            )
+        return ActionHistoryService.list_archived_actions(archive, user.id, after, limit)
+
+    return await ActionHistoryService.list_actions(
+        db, game_id, user.id, game_status == GameStatus.FINISHED, after, limit
+    )
 
 
 @router.post("/{game_id}/action")
@@ -134,11 +266,10 @@ async def perform_action(
     game_id: int,
     request: GameActionRequest,
     db: AsyncSession = Depends(get_db),
-    authorization: str | None = Header(None),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Perform a game action."""
-    user = await get_current_user(db, authorization)
-
+    label_action(request.action_type.value)
     game = await GameService.get_game(db, game_id)
     if not game:
         raise HTTPException(
@@ -154,116 +285,45 @@ async def perform_action(
         )
 
     # Find player in game
-    player = None
-    for p in game.players:
-        if p["user_id"] == user.id:
-            player = p
-            break
-
+    player = GameActionService.find_player(game, user.id)
     if not player:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not in this game",
         )
 
-    # Process action based on type
     try:
-        # NOTE: GameService methods check current_turn_player_id which stores user_id
-        if request.action_type == ActionType.PLACE_WORKER:
-            payload = request.payload
-            result = await GameService.place_worker(
-                db,
-                game,
-                player["user_id"],
-                payload.worker_type.value,
-                payload.target_position.model_dump(),
-                payload.slot_index,
-            )
-        elif request.action_type == ActionType.PLACE_TILE:
-            payload = request.payload
-            result = await GameService.place_tile(
-                db,
-                game,
-                player["user_id"],
-                payload.tile_id,
-                payload.position.model_dump(),
-            )
-        elif request.action_type == ActionType.SELECT_BLUEPRINT:
-            payload = request.payload
-            result = await GameService.select_blueprint(
-                db,
-                game,
-                player["user_id"],
-                payload.blueprint_id,
-            )
-        elif request.action_type == ActionType.END_TURN:
-            result = await GameService.end_turn(db, game, player["user_id"])
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Action type {request.action_type} not yet implemented",
-            )
-
-        await db.commit()
-
-        # Broadcast game state update to all players via WebSocket
-        new_state = GameService.to_game_state_response(game)
-        await game_manager.broadcast_to_game(
-            game_id,
-            GameMessage(
-                type=MessageType.GAME_STATE_UPDATE,
-                data={"game_state": new_state}
-            )
-        )
-
-        # If turn changed, notify new current player
-        if game.current_turn_player_id != player["user_id"]:
-            await game_manager.send_to_player(
-                game_id,
-                game.current_turn_player_id,
-                GameMessage(
-                    type=MessageType.YOUR_TURN,
-                    data={"message": "It's your turn!", "round": game.current_round}
-                )
-            )
-
-        # If game ended, broadcast game ended message
-        if game.status == GameStatus.FINISHED:
-            final_scores = GameService.calculate_final_scores(game)
-            winner = final_scores[0] if final_scores else None
-            await game_manager.broadcast_to_game(
-                game_id,
-                GameMessage(
-                    type=MessageType.GAME_ENDED,
-                    data={
-                        "winner_id": winner["player_id"] if winner else None,
-                        "winner_name": winner["username"] if winner else None,
-                        "rankings": final_scores
-                    }
-                )
-            )
-
-        return {
-            "success": True,
-            "action_result": result,
-            "new_state": new_state,
-        }
-
+        result = await GameActionService.perform(db, game, player, request)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
 
+    await db.commit()
+
+    # Broadcast the new state and turn/game changes via WebSocket
+    new_state = await GameActionService.announce(game, player)
+
+    return {
+        "success": True,
+        "action_result": result,
+        "new_state": StateProjectionService.for_user(new_state, user.id),
+    }
+
 
 @router.get("/{game_id}/valid-actions")
 async def get_valid_actions(
     game_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
-    authorization: str | None = Header(None),
+    user: CurrentUser = Depends(get_current_user),
 ):
-    """Get list of valid actions for current player."""
-    user = await get_current_user(db, authorization)
+    """Get list of valid actions for current player (conditional on If-None-Match)."""
+    not_modified = await _not_modified("actions", db, game_id, user.id, if_none_match)
+    if not_modified:
+        return not_modified
 
     game = await GameService.get_game(db, game_id)
     if not game:
@@ -285,6 +345,8 @@ async def get_valid_actions(
             detail="You are not in this game",
         )
 
+    response.headers.update(_cache_headers(_game_etag("actions", game.id, game.version, user.id)))
+
     # Check if it's player's turn (current_turn_player_id stores user_id)
     if game.current_turn_player_id != player["user_id"]:
         return {"valid_actions": [], "message": "Not your turn"}
@@ -416,11 +478,15 @@ def _get_available_worker_slots(game: Game, worker_type: str) -> list[dict]:
 @router.get("/{game_id}/blueprints")
 async def get_player_blueprints(
     game_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
-    authorization: str | None = Header(None),
+    user: CurrentUser = Depends(get_current_user),
 ):
-    """Get player's blueprint cards (dealt and selected)."""
-    user = await get_current_user(db, authorization)
+    """Get player's blueprint cards, dealt and selected (conditional on If-None-Match)."""
+    not_modified = await _not_modified("blueprints", db, game_id, user.id, if_none_match)
+    if not_modified:
+        return not_modified
 
     game = await GameService.get_game(db, game_id)
     if not game:
@@ -442,6 +508,8 @@ async def get_player_blueprints(
             detail="You are not in this game",
         )
 
+    response.headers.update(_cache_headers(_game_etag("blueprints", game.id, game.version, user.id)))
+
     from app.services.blueprint_service import BlueprintService
 
     # Get dealt blueprints (not yet selected)
@@ -473,12 +541,10 @@ async def get_player_blueprints(
 async def get_game_result(
     game_id: int,
     db: AsyncSession = Depends(get_db),
-    authorization: str | None = Header(None),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Get game result (only for finished games)."""
-    await get_current_user(db, authorization)
-
-    game = await GameService.get_game(db, game_id)
+    game = await _get_game_or_archived(db, game_id)
     if not game:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
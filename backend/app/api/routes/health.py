@@ -1,7 +1,12 @@
 """
 Health check endpoints.
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+
+from app.core.metrics import CONTENT_TYPE, registry
+from app.core.security import password_hasher
+from app.websocket.game_manager import game_manager
+from app.websocket.lobby_manager import lobby_manager
 
 router = APIRouter()
 
@@ -10,3 +15,21 @@ router = APIRouter()
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@router.get("/health/ws")
+async def websocket_stats():
+    """Live WebSocket connection and sweep counts for this process."""
+    return {**game_manager.get_stats(), "lobby": lobby_manager.get_stats()}
+
+
+@router.get("/health/auth")
+async def password_hasher_stats():
+    """bcrypt queue depth, rejections and timings for this process."""
+    return password_hasher.get_stats()
+
+
+@router.get("/metrics")
+async def metrics():
+    """Metrics of this process in the Prometheus text format."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
@@ -1,66 +1,29 @@
 """
 Lobby API endpoints.
 """
-from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.api.deps import CurrentUser, get_current_user
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import decode_token, get_token_from_header
 from app.models.lobby import Lobby, LobbyPlayer, LobbyStatus, PlayerColor
-from app.models.user import User
 from app.schemas.lobby import (
     CreateLobbyRequest,
     JoinLobbyResponse,
-    LobbyPlayerResponse,
+    LobbyListResponse,
     LobbyResponse,
     ReadyRequest,
     StartGameResponse,
 )
 from app.services.game_service import GameService
+from app.services.lobby_service import InvalidCursor, LobbyService
 
 router = APIRouter()
 
 
-async def get_current_user(
-    db: AsyncSession,
-    authorization: str | None,
-) -> User:
-    """Get current user from token."""
-    token = get_token_from_header(authorization)
-    if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing or invalid authorization header",
-        )
-
-    payload = decode_token(token)
-    if not payload or payload.get("type") != "access":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid access token",
-        )
-
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-        )
-
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
-
-    if not user or not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found or inactive",
-        )
-
-    return user
-
-
 def get_available_color(players: list[LobbyPlayer]) -> PlayerColor:
     """Get the first available player color."""
     used_colors = {p.color for p in players}
@@ -77,11 +40,9 @@ def get_available_color(players: list[LobbyPlayer]) -> PlayerColor:
 async def create_lobby(
     request: CreateLobbyRequest,
     db: AsyncSession = Depends(get_db),
-    authorization: str | None = Header(None),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Create a new lobby."""
-    user = await get_current_user(db, authorization)
-
     # Create lobby
     lobby = Lobby(
         name=request.name,
@@ -111,26 +72,23 @@ async def create_lobby(
     )
     lobby = result.scalar_one()
 
-    return _to_lobby_response(lobby, user.id)
+    return LobbyService.to_lobby_response(lobby, user.id)
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=LobbyListResponse)
 async def list_lobbies(
+    cursor: str | None = None,
+    limit: int = Query(settings.LOBBY_PAGE_SIZE, ge=1, le=settings.LOBBY_MAX_PAGE_SIZE),
     db: AsyncSession = Depends(get_db),
 ):
-    """List all waiting lobbies."""
-    result = await db.execute(
-        select(Lobby)
-        .options(selectinload(Lobby.players).selectinload(LobbyPlayer.user))
-        .where(Lobby.status == LobbyStatus.WAITING)
-        .order_by(Lobby.created_at.desc())
-    )
-    lobbies = result.scalars().all()
-
-    return {
-        "lobbies": [_to_lobby_response(lobby) for lobby in lobbies],
-        "total": len(lobbies),
-    }
+    """List waiting lobbies, newest first, one page at a time."""
+    try:
+        return await LobbyService.list_waiting(db, limit, cursor)
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
 
 
 @router.get("/{lobby_id}", response_model=LobbyResponse)
@@ -152,7 +110,7 @@ async def get_lobby(
             detail="Lobby not found",
         )
 
-    return _to_lobby_response(lobby)
+    return LobbyService.to_lobby_response(lobby)
 
 
 @router.get("/join/{invite_code}", response_model=LobbyResponse)
@@ -174,18 +132,16 @@ async def get_lobby_by_invite_code(
             detail="Invalid invite code",
         )
 
-    return _to_lobby_response(lobby)
+    return LobbyService.to_lobby_response(lobby)
 
 
 @router.post("/{lobby_id}/join", response_model=JoinLobbyResponse)
 async def join_lobby(
     lobby_id: int,
     db: AsyncSession = Depends(get_db),
-    authorization: str | None = Header(None),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Join a lobby."""
-    user = await get_current_user(db, authorization)
-
     result = await db.execute(
         select(Lobby)
         .options(selectinload(Lobby.players).selectinload(LobbyPlayer.user))
@@ -203,8 +159,8 @@ async def join_lobby(
     for player in lobby.players:
         if player.user_id == user.id:
             return JoinLobbyResponse(
-                lobby=_to_lobby_response(lobby, user.id),
-                player=_to_player_response(player),
+                lobby=LobbyService.to_lobby_response(lobby, user.id),
+                player=LobbyService.to_player_response(player),
             )
 
     # Check lobby status
@@ -245,8 +201,8 @@ async def join_lobby(
     for player in lobby.players:
         if player.user_id == user.id:
             return JoinLobbyResponse(
-                lobby=_to_lobby_response(lobby, user.id),
-                player=_to_player_response(player),
+                lobby=LobbyService.to_lobby_response(lobby, user.id),
+                player=LobbyService.to_player_response(player),
             )
 
     raise HTTPException(
@@ -260,11 +216,9 @@ async def toggle_ready(
     lobby_id: int,
     request: ReadyRequest,
     db: AsyncSession = Depends(get_db),
-    authorization: str | None = Header(None),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Toggle ready status."""
-    user = await get_current_user(db, authorization)
-
     result = await db.execute(
         select(Lobby)
         .options(selectinload(Lobby.players).selectinload(LobbyPlayer.user))
@@ -312,18 +266,24 @@ async def toggle_ready(
     await db.flush()
     await db.refresh(lobby)
 
-    return _to_lobby_response(lobby, user.id)
+    # Reload lobby with relationships
+    result = await db.execute(
+        select(Lobby)
+        .options(selectinload(Lobby.players).selectinload(LobbyPlayer.user))
+        .where(Lobby.id == lobby.id)
+    )
+    lobby = result.scalar_one()
+
+    return LobbyService.to_lobby_response(lobby, user.id)
 
 
 @router.post("/{lobby_id}/start", response_model=StartGameResponse)
 async def start_game(
     lobby_id: int,
     db: AsyncSession = Depends(get_db),
-    authorization: str | None = Header(None),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Start the game (host only)."""
-    user = await get_current_user(db, authorization)
-
     result = await db.execute(
         select(Lobby)
         .options(selectinload(Lobby.players).selectinload(LobbyPlayer.user))
@@ -377,36 +337,3 @@ async def start_game(
 
     return StartGameResponse(game_id=game.id)
 
-
-def _to_player_response(player: LobbyPlayer) -> LobbyPlayerResponse:
-    """Convert LobbyPlayer to response model."""
-    return LobbyPlayerResponse(
-        id=player.id,
-        user_id=player.user_id,
-        username=player.user.username if player.user else "Unknown",
-        color=player.color.value,
-        turn_order=player.turn_order,
-        is_host=False,  # Will be set by _to_lobby_response
-        is_ready=player.is_ready,
-    )
-
-
-def _to_lobby_response(lobby: Lobby, current_user_id: int | None = None) -> LobbyResponse:
-    """Convert Lobby to response model."""
-    players = []
-    for p in sorted(lobby.players, key=lambda x: x.turn_order):
-        player_response = _to_player_response(p)
-        player_response.is_host = p.user_id == lobby.host_id
-        players.append(player_response)
-
-    return LobbyResponse(
-        id=lobby.id,
-        name=lobby.name,
-        host_id=lobby.host_id,
-        invite_code=lobby.invite_code,
-        status=lobby.status.value,
-        max_players=lobby.max_players,
-        game_id=lobby.game_id,
-        players=players,
-        created_at=lobby.created_at.isoformat(),
-    )
@@ -3,24 +3,23 @@ Solo play API endpoints.
 Allows single player games against AI opponents.
 """
 import json
-from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import CurrentUser, get_current_user
 from app.core.database import get_db
-from app.core.security import decode_token, get_token_from_header
 from app.models.game import Game, GameStatus
-from app.models.user import User
 from app.services.game_service import GameService
 from app.services.ai_service import (
     AIService,
     AIPlayer,
     AIDifficulty,
-    AIDecision,
     create_ai_opponent,
+    get_player_weights,
     AI_PERSONALITIES,
 )
+from app.services.ai_scheduler import ai_scheduler, execute_ai_decision, public_action
 from app.services.resource_service import ResourceService
 from app.services.worker_service import WorkerService
 from app.services.blueprint_service import BlueprintService
@@ -40,6 +39,12 @@ class SoloGameResponse(BaseModel):
     message: str
 
 
+class AIPacingRequest(BaseModel):
+    """Request to change how fast server-driven AI moves are pushed."""
+    action_delay_ms: int | None = Field(default=None, ge=0, le=5000)
+    turn_delay_ms: int | None = Field(default=None, ge=0, le=10000)
+
+
 class AIActionResponse(BaseModel):
     """Response for AI action execution."""
     action_type: str
@@ -48,44 +53,6 @@ class AIActionResponse(BaseModel):
     is_ai_turn: bool
 
 
-async def get_current_user(
-    db: AsyncSession,
-    authorization: str | None,
-) -> User:
-    """Get current user from token."""
-    token = get_token_from_header(authorization)
-    if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing or invalid authorization header",
-        )
-
-    payload = decode_token(token)
-    if not payload or payload.get("type") != "access":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid access token",
-        )
-
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-        )
-
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
-
-    if not user or not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found or inactive",
-        )
-
-    return user
-
-
 @router.get("/personalities")
 async def get_ai_personalities():
     """Get available AI personalities."""
@@ -107,7 +74,7 @@ async def get_ai_personalities():
 async def create_solo_game(
     request: CreateSoloGameRequest,
     db: AsyncSession = Depends(get_db),
-    authorization: str | None = Header(None),
+    user: CurrentUser = Depends(get_current_user),
 ) -> dict:
     """
     Create a new solo game with AI opponents.
@@ -120,8 +87,6 @@ async def create_solo_game(
     Returns:
         Created game information
     """
-    user = await get_current_user(db, authorization)
-
     # Map difficulty string to enum
     difficulty_map = {
         "easy": AIDifficulty.EASY,
@@ -155,14 +120,15 @@ async def create_solo_game(
 
     # Create AI player states
     ai_colors = ["red", "green", "yellow"]
-    ai_names = ["AI - 자원 수집가", "AI - 풍수 대가", "AI - 초보 도전자"]
+    ai_personalities = ["resource_hoarder", "feng_shui_master", "beginner"]
 
     for i in range(request.num_ai_opponents):
         ai_user_id = -(i + 1)  # Negative IDs for AI
+        personality = ai_personalities[i % len(ai_personalities)]
         ai_player = GameService.create_initial_player(
             player_id=i + 2,
             user_id=ai_user_id,
-            username=ai_names[i % len(ai_names)],
+            username=f"AI - {AI_PERSONALITIES[personality]['name']}",
             color=ai_colors[i % len(ai_colors)],
             turn_order=i + 1,
             is_host=False,
@@ -171,6 +137,7 @@ async def create_solo_game(
         ai_player["blueprints"] = []
         ai_player["is_ai"] = True
         ai_player["ai_difficulty"] = difficulty.value
+        ai_player["ai_personality"] = personality
 
         players.append(ai_player)
         turn_order_list.append(ai_user_id)
@@ -214,7 +181,7 @@ async def create_solo_game(
 async def execute_ai_turn(
     game_id: int,
     db: AsyncSession = Depends(get_db),
-    authorization: str | None = Header(None),
+    user: CurrentUser = Depends(get_current_user),
 ) -> dict:
     """
     Execute the current AI player's turn.
@@ -222,9 +189,9 @@ async def execute_ai_turn(
     This endpoint is called when it's an AI player's turn.
     It makes a decision and executes the action.
     """
-    user = await get_current_user(db, authorization)
-
-    game = await GameService.get_game(db, game_id)
+    # Locked until commit so a scheduler on another worker cannot play the
+    # same turn; it sees the committed turn once the lock is released
+    game = await GameService.get_game(db, game_id, lock=True)
     if not game:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -237,6 +204,12 @@ async def execute_ai_turn(
             detail="Game is not in progress",
         )
 
+    if ai_scheduler.is_running(game_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="AI turns are already being played by the server",
+        )
+
     # Find current player
     current_player = None
     for p in game.players:
@@ -264,12 +237,17 @@ async def execute_ai_turn(
     game_state = GameService.to_game_state_response(game)
 
     # Get AI decision
-    decision = AIService.make_decision(game_state, current_player, difficulty)
+    weights = get_player_weights(current_player)
+    decision = AIService.make_decision(game_state, current_player, difficulty, weights)
 
     # Execute the decision
-    result = await _execute_ai_decision(db, game, current_player, decision)
+    result = await execute_ai_decision(db, game, current_player, decision)
 
     await db.commit()
+    if game.status == GameStatus.FINISHED:
+        ai_scheduler.clear_pacing(game_id)
+
+    _, result = public_action(decision.action_type, decision.params, result)
 
     # Check if next turn is also AI
     next_is_ai = False
@@ -281,6 +259,7 @@ async def execute_ai_turn(
     return {
         "action_type": decision.action_type,
         "action_result": result,
+        "search": decision.search.to_dict() if decision.search else None,
         "next_player_id": game.current_turn_player_id,
         "is_ai_turn": next_is_ai,
         "game_status": game.status.value,
@@ -292,7 +271,7 @@ async def auto_play_ai_turns(
     game_id: int,
     max_turns: int = 10,
     db: AsyncSession = Depends(get_db),
-    authorization: str | None = Header(None),
+    user: CurrentUser = Depends(get_current_user),
 ) -> dict:
     """
     Automatically execute all AI turns until it's the human player's turn.
@@ -301,9 +280,7 @@ async def auto_play_ai_turns(
         game_id: Game ID
         max_turns: Maximum number of AI turns to execute (safety limit)
     """
-    user = await get_current_user(db, authorization)
-
-    game = await GameService.get_game(db, game_id)
+    game = await GameService.get_game(db, game_id, lock=True)
     if not game:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -316,6 +293,12 @@ async def auto_play_ai_turns(
             detail="Game is not in progress",
         )
 
+    if ai_scheduler.is_running(game_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="AI turns are already being played by the server",
+        )
+
     executed_actions = []
     turns_executed = 0
 
@@ -341,19 +324,23 @@ async def auto_play_ai_turns(
         # Get AI decision and execute
         difficulty = AIDifficulty(current_player.get("ai_difficulty", "medium"))
         game_state = GameService.to_game_state_response(game)
-        decision = AIService.make_decision(game_state, current_player, difficulty)
+        weights = get_player_weights(current_player)
+        decision = AIService.make_decision(game_state, current_player, difficulty, weights)
 
-        result = await _execute_ai_decision(db, game, current_player, decision)
+        await execute_ai_decision(db, game, current_player, decision)
 
+        params, _ = public_action(decision.action_type, decision.params, {})
         executed_actions.append({
             "player": current_player["username"],
             "action_type": decision.action_type,
-            "params": decision.params,
+            "params": params,
         })
 
         turns_executed += 1
 
     await db.commit()
+    if game.status == GameStatus.FINISHED:
+        ai_scheduler.clear_pacing(game_id)
 
     # Check current player after all AI turns
     current_player = None
@@ -368,51 +355,44 @@ async def auto_play_ai_turns(
         "current_player_id": game.current_turn_player_id,
         "is_your_turn": current_player and not current_player.get("is_ai", False),
         "game_status": game.status.value,
-        "game_state": GameService.to_game_state_response(game),
+        "game_state": GameService.to_game_state_response(game, user.id),
     }
 
 
-async def _execute_ai_decision(
-    db: AsyncSession,
-    game: Game,
-    player: dict,
-    decision: AIDecision,
+@router.put("/{game_id}/pacing")
+async def set_ai_pacing(
+    game_id: int,
+    request: AIPacingRequest,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
 ) -> dict:
-    """Execute an AI decision and return the result."""
-    # NOTE: GameService methods check current_turn_player_id which stores user_id, not player.id
-    player_id = player["user_id"]
+    """
+    Set pacing for server-driven AI turns.
 
-    if decision.action_type == "select_blueprint":
-        result = await GameService.select_blueprint(
-            db, game, player_id, decision.params["blueprint_id"]
-        )
-        # AI should also end turn after selecting blueprint
-        # Actually, let's just return the blueprint selection result
-        return result
-
-    elif decision.action_type == "place_tile":
-        result = await GameService.place_tile(
-            db,
-            game,
-            player_id,
-            decision.params["tile_id"],
-            decision.params["position"],
+    AI turns are played by the server as soon as they come up and pushed
+    over the game WebSocket; the delays control how the moves are spaced
+    out so the client can animate them.
+    """
+    game = await GameService.get_game(db, game_id)
+    if not game:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Game not found",
         )
-        return result
-
-    elif decision.action_type == "place_worker":
-        result = await GameService.place_worker(
-            db,
-            game,
-            player_id,
-            decision.params["worker_type"],
-            decision.params["target_position"],
-            decision.params["slot_index"],
+
+    if not GameService.get_player_state(game, user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not in this game",
         )
-        return result
 
-    elif decision.action_type == "end_turn":
-        result = await GameService.end_turn(db, game, player_id)
-        return result
+    pacing = ai_scheduler.set_pacing(
+        game_id,
+        action_delay_ms=request.action_delay_ms,
+        turn_delay_ms=request.turn_delay_ms,
+    )
 
-    return {"error": f"Unknown action type: {decision.action_type}"}
+    return {
+        "action_delay_ms": pacing.action_delay_ms,
+        "turn_delay_ms": pacing.turn_delay_ms,
+    }
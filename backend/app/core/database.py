@@ -1,18 +1,23 @@
 """
 Database configuration and session management.
 """
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
+from app.core.db_metrics import TimedQueuePool, instrument_engine
 
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
+    echo=settings.DB_ECHO,
     pool_pre_ping=True,
+    # SQLite picks its own pool; elsewhere time checkouts
+    **({} if settings.DATABASE_URL.startswith("sqlite") else {"poolclass": TimedQueuePool}),
 )
+instrument_engine(engine.sync_engine)
 
 async_session_maker = async_sessionmaker(
     engine,
@@ -38,3 +43,20 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
         finally:
             await session.close()
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """
+    Short-lived session for work outside the request lifecycle.
+
+    Background tasks and WebSocket handlers use this so a pooled
+    connection is only held for the duration of the block.
+    """
+    async with async_session_maker() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
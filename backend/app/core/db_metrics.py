@@ -0,0 +1,172 @@
+"""
+Database query instrumentation.
+
+SQLAlchemy event hooks count statements and time them, and a pool
+subclass times connection checkouts. Totals are collected per unit of
+work (an HTTP request or a WebSocket message) through a context variable
+and exported as histograms on /metrics. Statements slower than
+DB_SLOW_QUERY_MS are logged.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+import logging
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger("app.db.slow")
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+queries_total = registry.counter("db_queries_total", "SQL statements executed")
+slow_queries_total = registry.counter(
+    "db_slow_queries_total", "SQL statements slower than DB_SLOW_QUERY_MS"
+)
+query_seconds = registry.histogram("db_query_duration_seconds", "Duration of single SQL statements")
+unit_queries = registry.histogram(
+    "db_queries_per_unit", "SQL statements per request or WebSocket message",
+    ("kind", "name"), buckets=QUERY_COUNT_BUCKETS,
+)
+unit_db_seconds = registry.histogram(
+    "db_time_per_unit_seconds", "Time spent in SQL per request or WebSocket message",
+    ("kind", "name"),
+)
+unit_checkout_seconds = registry.histogram(
+    "db_pool_checkout_wait_per_unit_seconds",
+    "Time spent waiting for pooled connections per request or WebSocket message",
+    ("kind", "name"),
+)
+
+
+@dataclass
+class QueryStats:
+    """Database work done by one unit of work"""
+    queries: int = 0
+    db_seconds: float = 0.0
+    checkout_wait_seconds: float = 0.0
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+
+
+@contextmanager
+def track_queries(kind: str, name: str) -> Iterator[QueryStats]:
+    """
+    Collect the database work done inside the block and record it.
+
+    Args:
+        kind: Unit of work type, e.g. "http" or "ws"
+        name: Route template or message type (keep cardinality low)
+
+    Yields:
+        The stats being collected
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        _record(stats, kind, name)
+
+
+def _record(stats: QueryStats, kind: str, name: str) -> None:
+    unit_queries.observe(stats.queries, kind, name)
+    unit_db_seconds.observe(stats.db_seconds, kind, name)
+    unit_checkout_seconds.observe(stats.checkout_wait_seconds, kind, name)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that measures how long checkouts wait."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            stats = _current.get()
+            if stats is not None:
+                stats.checkout_wait_seconds += time.perf_counter() - started
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+
+    queries_total.inc()
+    query_seconds.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+    if settings.DB_SLOW_QUERY_MS and elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        slow_queries_total.inc()
+        logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {statement[:500]}")
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    started = conn.info.get("query_started") if conn is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Install the query hooks on an engine.
+
+    Args:
+        engine: Sync engine (AsyncEngine.sync_engine for async engines)
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryMetricsMiddleware:
+    """ASGI middleware that records database work per HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            _record(stats, "http", route_template(scope))
+
+
+def route_template(scope) -> str:
+    """
+    Path template of the route that handled a request, e.g.
+    /api/v1/games/{game_id}, so metric labels stay few; "unmatched" when
+    no route matched. Read after the app has run.
+    """
+    template = getattr(scope.get("route"), "path_format", None)
+    if not isinstance(template, str):
+        return "unmatched"
+    # A route of a router included with a prefix may carry only its own
+    # part; the prefix is literal, so it is the rest of the request path
+    segments = scope["path"].split("/")
+    return "/".join(segments[:len(segments) - template.count("/")]) + template
@@ -0,0 +1,101 @@
+"""
+Request timing instrumentation.
+
+An ASGI middleware times every HTTP request and counts its response
+status by route template. Handlers can name the game action a request
+performs (see label_action), which adds per-action histograms; WebSocket
+actions are recorded the same way through record_action. Everything is
+exported on /metrics.
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+import time
+
+from app.core.db_metrics import route_template
+from app.core.metrics import registry
+
+request_seconds = registry.histogram(
+    "http_request_duration_seconds", "Duration of HTTP requests", ("method", "route"),
+)
+requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by response status", ("method", "route", "status"),
+)
+action_seconds = registry.histogram(
+    "game_action_duration_seconds", "Duration of game actions by type",
+    ("transport", "action_type"),
+)
+actions_total = registry.counter(
+    "game_actions_total", "Game actions by type and outcome (ok or error)",
+    ("transport", "action_type", "outcome"),
+)
+
+
+@dataclass
+class RequestLabels:
+    """Labels a handler attaches to the request being timed"""
+    action_type: Optional[str] = None
+
+
+_current: ContextVar[Optional[RequestLabels]] = ContextVar("request_labels", default=None)
+
+
+def label_action(action_type: str) -> None:
+    """
+    Record the current HTTP request under a game action type as well.
+
+    Args:
+        action_type: Action performed (keep cardinality low)
+    """
+    labels = _current.get()
+    if labels is not None:
+        labels.action_type = action_type
+
+
+def record_action(transport: str, action_type: str, elapsed: float, ok: bool) -> None:
+    """
+    Record a game action performed outside an HTTP request.
+
+    Args:
+        transport: How the action arrived, e.g. "ws"
+        action_type: Action performed
+        elapsed: Handling time in seconds
+        ok: Whether the action succeeded
+    """
+    action_seconds.observe(elapsed, transport, action_type)
+    actions_total.inc(transport, action_type, "ok" if ok else "error")
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware that records latency and status per HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        labels = RequestLabels()
+        token = _current.set(labels)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current.reset(token)
+            method = scope["method"]
+            route = route_template(scope)
+            request_seconds.observe(elapsed, method, route)
+            requests_total.inc(method, route, str(status_code))
+            if labels.action_type is not None:
+                record_action("http", labels.action_type, elapsed, status_code < 400)
@@ -1,15 +1,31 @@
 """
 Security utilities for authentication.
 """
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import time
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.metrics import registry
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+wait_seconds = registry.histogram(
+    "password_hash_wait_seconds", "Time password operations wait for a hashing thread",
+    ("operation",),
+)
+run_seconds = registry.histogram(
+    "password_hash_run_seconds", "Time password operations run bcrypt", ("operation",),
+)
+rejected_total = registry.counter(
+    "password_hash_rejected_total", "Password operations refused while saturated",
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
@@ -21,6 +37,110 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasherBusy(Exception):
+    """Raised when too much password work is already queued"""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a small dedicated thread pool.
+
+    bcrypt deliberately takes tens of milliseconds, so running it inline
+    would stall every request and game socket on the worker. Calls beyond
+    max_pending (queued plus running) are refused at once instead of
+    queueing without bound during a login burst.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        """
+        Args:
+            workers: Threads doing bcrypt work
+            max_pending: Calls allowed in flight before new ones are refused
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self.stats: Dict[str, float] = {
+            "completed": 0,
+            "rejected": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "run_seconds_total": 0.0,
+            "run_seconds_max": 0.0,
+        }
+
+    async def hash(self, password: str) -> str:
+        """Hash a password off the event loop."""
+        return await self._run("hash", pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash off the event loop."""
+        return await self._run("verify", pwd_context.verify, plain_password, hashed_password)
+
+    async def _run(self, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.max_pending:
+            self.stats["rejected"] += 1
+            rejected_total.inc()
+            raise PasswordHasherBusy("Too many password operations in progress")
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="password")
+
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+        timings = [0.0, 0.0]  # wait, run
+
+        def timed() -> Any:
+            started = time.perf_counter()
+            timings[0] = started - submitted
+            try:
+                return func(*args)
+            finally:
+                timings[1] = time.perf_counter() - started
+
+        # Released when the pool is done with the call, not when the caller
+        # stops waiting: a cancelled login leaves bcrypt running in its thread
+        def done(_future: Future) -> None:
+            try:
+                loop.call_soon_threadsafe(self._finish, operation, *timings)
+            except RuntimeError:
+                pass  # Loop already closed at shutdown
+
+        self._pending += 1
+        future = self._executor.submit(timed)
+        future.add_done_callback(done)
+        return await asyncio.wrap_future(future)
+
+    def _finish(self, operation: str, wait: float, run: float) -> None:
+        self._pending -= 1
+        self.stats["completed"] += 1
+        self.stats["wait_seconds_total"] += wait
+        self.stats["wait_seconds_max"] = max(self.stats["wait_seconds_max"], wait)
+        self.stats["run_seconds_total"] += run
+        self.stats["run_seconds_max"] = max(self.stats["run_seconds_max"], run)
+        wait_seconds.observe(wait, operation)
+        run_seconds.observe(run, operation)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Queue depth and timing counters for this process."""
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            **self.stats,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads (running calls finish first)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
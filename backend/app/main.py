@@ -8,15 +8,29 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import auth, game, health, lobby, solo
 from app.core.config import settings
-from app.websocket import game_ws_router
+from app.core.db_metrics import QueryMetricsMiddleware
+from app.core.request_metrics import RequestMetricsMiddleware
+from app.core.security import password_hasher
+from app.services.ai_scheduler import ai_scheduler
+from app.services.retention_service import retention_job
+from app.websocket import game_manager, game_ws_router, lobby_manager, lobby_ws_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
+    await game_manager.start()
+    await lobby_manager.start()
+    if settings.RETENTION_ENABLED:
+        retention_job.start()
     yield
     # Shutdown
+    await retention_job.shutdown()
+    await ai_scheduler.shutdown()
+    await game_manager.shutdown()
+    await lobby_manager.shutdown()
+    password_hasher.shutdown()
 
 
 app = FastAPI(
@@ -35,6 +49,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Database work per request, for /metrics
+app.add_middleware(QueryMetricsMiddleware)
+
+# Latency and status per route and game action, for /metrics (outermost)
+app.add_middleware(RequestMetricsMiddleware)
+
 # Include routers
 app.include_router(health.router, tags=["Health"])
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
@@ -44,6 +64,7 @@ app.include_router(solo.router, prefix="/api/v1/solo", tags=["Solo Play"])
 
 # WebSocket router
 app.include_router(game_ws_router, tags=["WebSocket"])
+app.include_router(lobby_ws_router, tags=["WebSocket"])
 
 
 @app.get("/")
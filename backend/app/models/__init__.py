@@ -1,10 +1,10 @@
 # Models module
 from app.models.user import User
 from app.models.lobby import Lobby, LobbyPlayer, LobbyStatus, PlayerColor
-from app.models.game import Game, GameAction, GameStatus
+from app.models.game import Game, GameAction, GameArchive, GameStatus
 
 __all__ = [
     "User",
     "Lobby", "LobbyPlayer", "LobbyStatus", "PlayerColor",
-    "Game", "GameAction", "GameStatus",
+    "Game", "GameAction", "GameArchive", "GameStatus",
 ]
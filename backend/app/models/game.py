@@ -5,7 +5,7 @@ import json
 from datetime import datetime, timezone
 from enum import Enum
 
-from sqlalchemy import DateTime, Enum as SQLEnum, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, Enum as SQLEnum, ForeignKey, Index, Integer, LargeBinary, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -22,6 +22,10 @@ class Game(Base):
     """Game model storing game state."""
 
     __tablename__ = "games"
+    __table_args__ = (
+        # Retention: finished games by age
+        Index("ix_games_status_updated_at", "status", "updated_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     lobby_id: Mapped[int | None] = mapped_column(ForeignKey("lobbies.id"), nullable=True)
@@ -40,6 +44,8 @@ class Game(Base):
     available_tiles_json: Mapped[str] = mapped_column(Text, default="[]")
     discarded_tiles_json: Mapped[str] = mapped_column(Text, default="[]")
     last_action_json: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Bumped on every recorded action; WebSocket state updates carry it
+    version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -112,6 +118,10 @@ class GameAction(Base):
     """Game action record."""
 
     __tablename__ = "game_actions"
+    __table_args__ = (
+        # A game's log in order (history, archiving)
+        Index("ix_game_actions_game_id_id", "game_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     game_id: Mapped[int] = mapped_column(ForeignKey("games.id"), nullable=False)
@@ -135,3 +145,27 @@ class GameAction(Base):
     @payload.setter
     def payload(self, value: dict):
         self.payload_json = json.dumps(value)
+
+
+class GameArchive(Base):
+    """Finished game moved out of the hot tables (see retention_service)."""
+
+    __tablename__ = "game_archives"
+
+    # Not a ForeignKey: the games row is deleted once archived
+    game_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    lobby_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    finished_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
+    action_count: Mapped[int] = mapped_column(Integer, default=0)
+    # Seats and final scores, readable without decompressing
+    players_json: Mapped[str] = mapped_column(Text, default="[]")
+    # zlib-compressed JSON of the game row and its action log
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    @property
+    def players(self) -> list:
+        return json.loads(self.players_json)
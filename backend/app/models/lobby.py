@@ -6,7 +6,7 @@ import string
 from datetime import datetime, timezone
 from enum import Enum
 
-from sqlalchemy import DateTime, Enum as SQLEnum, ForeignKey, String
+from sqlalchemy import DateTime, Enum as SQLEnum, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -38,6 +38,10 @@ class Lobby(Base):
     """Lobby model for game rooms."""
 
     __tablename__ = "lobbies"
+    __table_args__ = (
+        # Lobby browser: WAITING lobbies, newest first, keyset on (created_at, id)
+        Index("ix_lobbies_status_created_at", "status", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -217,6 +217,12 @@ class GameAction(BaseModel):
     timestamp: datetime
 
 
+class ActionHistoryResponse(BaseModel):
+    """액션 기록 페이지 (next_after가 있으면 다음 페이지가 있음)"""
+    actions: list[GameAction]
+    next_after: int | None = None
+
+
 # ============================================
 # Game State
 # ============================================
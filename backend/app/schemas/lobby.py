@@ -79,10 +79,22 @@ class LobbyResponse(BaseModel):
         from_attributes = True
 
 
+class LobbySummary(BaseModel):
+    """로비 목록 항목"""
+    id: int
+    name: str
+    host_id: int
+    host_username: str
+    status: LobbyStatus
+    max_players: int
+    player_count: int
+    created_at: datetime
+
+
 class LobbyListResponse(BaseModel):
-    """로비 목록 응답"""
-    lobbies: list[LobbyResponse]
-    total: int
+    """로비 목록 응답 (next_cursor로 다음 페이지 요청)"""
+    lobbies: list[LobbySummary]
+    next_cursor: str | None = None
 
 
 class JoinLobbyResponse(BaseModel):
@@ -0,0 +1,117 @@
+"""
+Game action service shared by the REST and WebSocket entry points.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.game import Game, GameStatus
+from app.schemas.game import ActionType, GameActionRequest
+from app.services.ai_scheduler import ai_scheduler
+from app.services.game_service import GameService
+from app.websocket.game_manager import game_manager, GameMessage, MessageType
+
+
+class GameActionService:
+    """Validate, apply and announce player actions."""
+
+    @staticmethod
+    def find_player(game: Game, user_id: int) -> dict | None:
+        """Get the acting player's state by user ID."""
+        return next((p for p in game.players if p["user_id"] == user_id), None)
+
+    @staticmethod
+    async def perform(
+        db: AsyncSession,
+        game: Game,
+        player: dict,
+        request: GameActionRequest,
+    ) -> dict:
+        """
+        Apply an action to a loaded game (the caller commits).
+
+        Raises:
+            ValueError: If the game is not in progress or the action is invalid
+        """
+        if game.status != GameStatus.IN_PROGRESS:
+            raise ValueError("Game is not in progress")
+
+        # NOTE: GameService methods check current_turn_player_id which stores user_id
+        user_id = player["user_id"]
+        payload = request.payload
+
+        if request.action_type == ActionType.PLACE_WORKER:
+            return await GameService.place_worker(
+                db,
+                game,
+                user_id,
+                payload.worker_type.value,
+                payload.target_position.model_dump(),
+                payload.slot_index,
+            )
+        elif request.action_type == ActionType.PLACE_TILE:
+            return await GameService.place_tile(
+                db,
+                game,
+                user_id,
+                payload.tile_id,
+                payload.position.model_dump(),
+            )
+        elif request.action_type == ActionType.SELECT_BLUEPRINT:
+            return await GameService.select_blueprint(
+                db,
+                game,
+                user_id,
+                payload.blueprint_id,
+            )
+        elif request.action_type == ActionType.END_TURN:
+            return await GameService.end_turn(db, game, user_id)
+
+        raise ValueError(f"Action type {request.action_type.value} not yet implemented")
+
+    @staticmethod
+    async def announce(game: Game, player: dict) -> dict:
+        """
+        Push the outcome of a committed action to the game's players.
+
+        Broadcasts the new state, hands the turn to the next player (or the
+        AI scheduler) and announces the end of the game.
+
+        Returns:
+            The new game state
+        """
+        new_state = GameService.to_game_state_response(game)
+        await game_manager.broadcast_state(game.id, new_state, game.version)
+
+        # If turn changed, notify new current player
+        # (connections are keyed by player id, current turn stores user_id)
+        next_player = GameService.get_current_player(game)
+        if next_player and game.current_turn_player_id != player["user_id"]:
+            if next_player.get("is_ai", False):
+                ai_scheduler.schedule(game.id)
+            else:
+                await game_manager.send_to_player(
+                    game.id,
+                    next_player["id"],
+                    GameMessage(
+                        type=MessageType.YOUR_TURN,
+                        data={"message": "It's your turn!", "round": game.current_round}
+                    )
+                )
+
+        # If game ended, broadcast game ended message
+        if game.status == GameStatus.FINISHED:
+            ai_scheduler.clear_pacing(game.id)
+            final_scores = GameService.calculate_final_scores(game)
+            winner = final_scores[0] if final_scores else None
+            await game_manager.broadcast_to_game(
+                game.id,
+                GameMessage(
+                    type=MessageType.GAME_ENDED,
+                    data={
+                        "winner_id": winner["player_id"] if winner else None,
+                        "winner_name": winner["username"] if winner else None,
+                        "rankings": final_scores
+                    }
+                )
+            )
+
+        return new_state
@@ -0,0 +1,397 @@
+"""
+AI turn scheduler for solo play.
+
+Runs AI seats' turns on the server as soon as they come up, commits each
+turn once and pushes the resulting actions to connected players.
+"""
+import asyncio
+import logging
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass, field
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import session_scope
+from app.models.game import Game, GameStatus
+from app.services.ai_search import SearchLimits
+from app.services.ai_service import (
+    AIService,
+    AIDifficulty,
+    AIDecision,
+    AIWeights,
+    get_player_weights,
+)
+from app.services.game_service import GameService
+from app.services.history_service import PRIVATE_ACTION_TYPES
+from app.websocket.game_manager import (
+    game_manager,
+    GameConnectionManager,
+    GameMessage,
+    MessageType,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def execute_ai_decision(
+    db: AsyncSession,
+    game: Game,
+    player: dict,
+    decision: AIDecision,
+) -> dict:
+    """Execute an AI decision and return the result."""
+    # NOTE: GameService methods check current_turn_player_id which stores user_id, not player.id
+    player_id = player["user_id"]
+
+    if decision.action_type == "select_blueprint":
+        return await GameService.select_blueprint(
+            db, game, player_id, decision.params["blueprint_id"]
+        )
+
+    elif decision.action_type == "place_tile":
+        return await GameService.place_tile(
+            db,
+            game,
+            player_id,
+            decision.params["tile_id"],
+            decision.params["position"],
+        )
+
+    elif decision.action_type == "place_worker":
+        return await GameService.place_worker(
+            db,
+            game,
+            player_id,
+            decision.params["worker_type"],
+            decision.params["target_position"],
+            decision.params["slot_index"],
+        )
+
+    elif decision.action_type == "end_turn":
+        return await GameService.end_turn(db, game, player_id)
+
+    return {"error": f"Unknown action type: {decision.action_type}"}
+
+
+def public_action(action_type: str, params: dict, result: dict) -> tuple[dict, dict]:
+    """
+    Params and result of an AI action as the other seats may see them.
+
+    Private actions (the chosen blueprint) are emptied, as in the action
+    history; the owner gets their hand through private_state instead.
+
+    Returns:
+        (params, result)
+    """
+    if action_type in PRIVATE_ACTION_TYPES:
+        return {}, {}
+    return params, result
+
+
+@dataclass
+class AIPacing:
+    """Delays applied when pushing AI actions so clients can animate them."""
+    action_delay_ms: int = settings.AI_ACTION_DELAY_MS
+    turn_delay_ms: int = settings.AI_TURN_DELAY_MS
+
+
+@dataclass
+class AITurnResult:
+    """Outcome of one AI seat's turn."""
+    player: dict
+    actions: list[dict] = field(default_factory=list)
+    game_state: dict = field(default_factory=dict)
+    version: int = 0
+    next_player: dict | None = None
+    final_scores: list[dict] | None = None
+
+
+async def run_ai_turn(
+    db: AsyncSession,
+    game: Game,
+    player: dict,
+    max_actions: int = settings.AI_MAX_ACTIONS_PER_TURN,
+    weights: AIWeights | None = None,
+    limits: SearchLimits | None = None,
+) -> list[dict]:
+    """
+    Play the current AI seat's whole turn against an already loaded game.
+
+    Nothing is committed here; the caller commits once the turn is over.
+
+    Args:
+        db: Database session
+        game: Loaded game whose current turn belongs to the AI
+        player: The AI player's state
+        max_actions: Safety limit before the turn is force-ended
+        weights: Evaluation weights (defaults to the player's personality)
+        limits: Search budget (defaults per difficulty, see AIService)
+
+    Returns:
+        Executed actions in order
+    """
+    user_id = player["user_id"]
+    difficulty = AIDifficulty(player.get("ai_difficulty", "medium"))
+    weights = weights or get_player_weights(player)
+    actions = []
+
+    while (
+        game.status == GameStatus.IN_PROGRESS
+        and game.current_turn_player_id == user_id
+    ):
+        player_state = GameService.get_player_state(game, user_id)
+
+        if len(actions) >= max_actions:
+            decision = AIDecision("end_turn", {})
+        else:
+            game_state = GameService.to_game_state_response(game)
+            decision = AIService.make_decision(
+                game_state, player_state, difficulty, weights, limits
+            )
+
+        try:
+            result = await execute_ai_decision(db, game, player_state, decision)
+        except ValueError as e:
+            if decision.action_type == "end_turn":
+                raise
+            logger.warning(f"AI {user_id} decision {decision.action_type} rejected: {e}")
+            decision = AIDecision("end_turn", {})
+            result = await execute_ai_decision(db, game, player_state, decision)
+
+        action = {
+            "action_type": decision.action_type,
+            "params": decision.params,
+            "result": result,
+        }
+        if decision.search is not None:
+            action["search"] = decision.search.to_dict()
+            logger.debug(
+                f"AI {user_id} {decision.action_type}: depth={decision.search.depth} "
+                f"nodes={decision.search.nodes} elapsed={decision.search.elapsed_ms:.1f}ms"
+            )
+        actions.append(action)
+
+    return actions
+
+
+class AITurnScheduler:
+    """
+    Drives AI seats in solo games without client polling.
+
+    One task per game plays consecutive AI turns until a human seat is up
+    or the game ends. Each turn is loaded, played and committed in a single
+    short-lived session, then pushed through the connection manager.
+    """
+
+    def __init__(
+        self,
+        manager: GameConnectionManager = game_manager,
+        session_factory: Callable[[], AbstractAsyncContextManager[AsyncSession]] = session_scope,
+    ):
+        self.manager = manager
+        self._session_factory = session_factory
+        # game_id -> running task
+        self._tasks: dict[int, asyncio.Task] = {}
+        # game_id -> pacing override, dropped when the game finishes
+        self._pacing: dict[int, AIPacing] = {}
+
+    def get_pacing(self, game_id: int) -> AIPacing:
+        """Get pacing for a game (defaults from settings)."""
+        return self._pacing.get(game_id) or AIPacing()
+
+    def set_pacing(
+        self,
+        game_id: int,
+        action_delay_ms: int | None = None,
+        turn_delay_ms: int | None = None,
+    ) -> AIPacing:
+        """
+        Override pacing for a game.
+
+        Args:
+            game_id: Game ID
+            action_delay_ms: Delay between pushed AI actions
+            turn_delay_ms: Delay between consecutive AI turns
+
+        Returns:
+            The effective pacing
+        """
+        pacing = self.get_pacing(game_id)
+        if action_delay_ms is not None:
+            pacing.action_delay_ms = action_delay_ms
+        if turn_delay_ms is not None:
+            pacing.turn_delay_ms = turn_delay_ms
+        self._pacing[game_id] = pacing
+        return pacing
+
+    def clear_pacing(self, game_id: int) -> None:
+        """Drop a game's pacing override once the game is over."""
+        self._pacing.pop(game_id, None)
+
+    def is_running(self, game_id: int) -> bool:
+        """Check if AI turns are currently being played for a game."""
+        task = self._tasks.get(game_id)
+        return task is not None and not task.done()
+
+    def schedule(self, game_id: int) -> bool:
+        """
+        Start playing AI turns for a game if none are running.
+
+        Safe to call after every action; it returns immediately and does
+        nothing when the current seat is human.
+
+        Returns:
+            True if a new task was started
+        """
+        if self.is_running(game_id):
+            return False
+
+        task = asyncio.create_task(self._run(game_id))
+        self._tasks[game_id] = task
+        task.add_done_callback(lambda t: self._forget(game_id, t))
+        return True
+
+    async def wait(self, game_id: int) -> None:
+        """Wait for the running task of a game, if any."""
+        task = self._tasks.get(game_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def shutdown(self) -> None:
+        """Cancel all running tasks."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def _forget(self, game_id: int, task: asyncio.Task) -> None:
+        if self._tasks.get(game_id) is task:
+            del self._tasks[game_id]
+        if not task.cancelled() and task.exception():
+            logger.error(
+                f"AI scheduler for game {game_id} failed",
+                exc_info=task.exception(),
+            )
+
+    async def _run(self, game_id: int) -> None:
+        while True:
+            turn = await self._play_turn(game_id)
+            if turn is None:
+                return
+
+            await self._push_turn(game_id, turn)
+
+            if turn.final_scores is not None:
+                self.clear_pacing(game_id)
+                return
+            if not turn.next_player or not turn.next_player.get("is_ai", False):
+                return
+
+            await asyncio.sleep(self.get_pacing(game_id).turn_delay_ms / 1000)
+
+    async def _play_turn(self, game_id: int) -> AITurnResult | None:
+        async with self._session_factory() as db:
+            # Locked until commit: another worker's scheduler or a REST
+            # /ai-turn may be about to play the same turn
+            game = await GameService.get_game(db, game_id, lock=True)
+            if not game or game.status != GameStatus.IN_PROGRESS:
+                self.clear_pacing(game_id)
+                return None
+
+            player = GameService.get_current_player(game)
+            if not player or not player.get("is_ai", False):
+                return None
+
+            actions = await run_ai_turn(db, game, player)
+
+            turn = AITurnResult(
+                player=player,
+                actions=actions,
+                game_state=GameService.to_game_state_response(game),
+                version=game.version,
+                next_player=GameService.get_current_player(game),
+            )
+            if game.status == GameStatus.FINISHED:
+                turn.final_scores = GameService.calculate_final_scores(game)
+
+        # Session committed on exit; only push what is durable
+        return turn
+
+    async def _push_turn(self, game_id: int, turn: AITurnResult) -> None:
+        pacing = self.get_pacing(game_id)
+
+        for index, action in enumerate(turn.actions):
+            if index > 0 and pacing.action_delay_ms > 0:
+                await asyncio.sleep(pacing.action_delay_ms / 1000)
+
+            params, result = public_action(
+                action["action_type"], action["params"], action["result"]
+            )
+            await self.manager.broadcast_to_game(
+                game_id,
+                GameMessage(
+                    type=MessageType.PLAYER_ACTION,
+                    data={
+                        "player_id": turn.player["id"],
+                        "username": turn.player["username"],
+                        "is_ai": True,
+                        "action_type": action["action_type"],
+                        "params": params,
+                        "result": result,
+                        "search": action.get("search"),
+                    },
+                ),
+            )
+
+        await self.manager.broadcast_state(game_id, turn.game_state, turn.version)
+
+        if turn.final_scores is not None:
+            winner = turn.final_scores[0] if turn.final_scores else None
+            await self.manager.broadcast_to_game(
+                game_id,
+                GameMessage(
+                    type=MessageType.GAME_ENDED,
+                    data={
+                        "winner_id": winner["player_id"] if winner else None,
+                        "winner_name": winner["username"] if winner else None,
+                        "rankings": turn.final_scores,
+                    },
+                ),
+            )
+            return
+
+        next_player = turn.next_player
+        if not next_player:
+            return
+
+        await self.manager.broadcast_to_game(
+            game_id,
+            GameMessage(
+                type=MessageType.TURN_CHANGED,
+                data={
+                    "previous_player_id": turn.player["id"],
+                    "current_player_id": next_player["id"],
+                    "current_player_name": next_player["username"],
+                },
+            ),
+        )
+
+        if not next_player.get("is_ai", False):
+            await self.manager.send_to_player(
+                game_id,
+                next_player["id"],
+                GameMessage(
+                    type=MessageType.YOUR_TURN,
+                    data={
+                        "message": "It's your turn!",
+                        "round": turn.game_state["current_round"],
+                    },
+                ),
+            )
+
+
+# Global scheduler instance
+ai_scheduler = AITurnScheduler()
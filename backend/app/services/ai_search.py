@@ -0,0 +1,163 @@
+"""
+Anytime iterative-deepening search for AI decisions.
+
+The driver is game-agnostic: a problem exposes its candidate moves with
+their immediate value and can apply and undo them. The driver deepens one
+ply at a time, keeps the best move of the deepest completed iteration and
+stops as soon as the per-move deadline expires, so a decision is always
+available on time regardless of board complexity.
+"""
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Protocol
+
+
+class SearchProblem(Protocol):
+    """State the search driver explores."""
+
+    def moves(self) -> list[tuple[Any, float]]:
+        """Candidate moves with their immediate value, best first."""
+        ...
+
+    def apply(self, move: Any) -> None:
+        """Play a move."""
+        ...
+
+    def undo(self) -> None:
+        """Take back the last applied move."""
+        ...
+
+
+@dataclass
+class SearchLimits:
+    """Budget for one decision."""
+    deadline_ms: float
+    max_depth: int
+    # Children explored per node (best by immediate value); None for all
+    branching: int | None = None
+
+
+@dataclass
+class SearchStats:
+    """What the search achieved for one decision."""
+    depth: int = 0
+    nodes: int = 0
+    elapsed_ms: float = 0.0
+    timed_out: bool = False
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class SearchResult:
+    """Best move found, its value and how it was found."""
+    move: Any | None
+    value: float
+    stats: SearchStats
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the deadline has passed."""
+
+
+class AnytimeSearch:
+    """
+    Iterative-deepening depth-first search with a hard deadline.
+
+    A move's value is its immediate value plus the best value reachable
+    after it within the remaining depth; stopping is always allowed, so
+    every node is worth at least zero. The root's moves are ordered by the
+    previous iteration's values, which puts the best-so-far move first.
+    """
+
+    def __init__(self, limits: SearchLimits, clock: Callable[[], float] = time.perf_counter):
+        self.limits = limits
+        self._clock = clock
+        self._deadline = 0.0
+        self._stats = SearchStats()
+
+    def run(self, problem: SearchProblem) -> SearchResult:
+        """
+        Search for the best first move.
+
+        Args:
+            problem: Position to search from
+
+        Returns:
+            Best move of the deepest completed iteration, or the best
+            immediate move if not even depth 1 finished; the move is None
+            when there are no moves
+        """
+        started = self._clock()
+        self._deadline = started + self.limits.deadline_ms / 1000
+        self._stats = SearchStats(nodes=1)
+
+        root = self._children(problem)
+        if not root:
+            self._stats.elapsed_ms = (self._clock() - started) * 1000
+            return SearchResult(move=None, value=0.0, stats=self._stats)
+
+        # Root moves in search order; the best of the last iteration first
+        order = list(range(len(root)))
+        best_index = 0
+        best_value = root[0][1]
+
+        for depth in range(1, self.limits.max_depth + 1):
+            try:
+                values = self._search_root(problem, root, order, depth)
+            except SearchTimeout:
+                self._stats.timed_out = True
+                break
+
+            # Stable sort keeps immediate-value order among equal values
+            order.sort(key=lambda i: values[i], reverse=True)
+            best_index = order[0]
+            best_value = values[best_index]
+            self._stats.depth = depth
+
+        self._stats.elapsed_ms = (self._clock() - started) * 1000
+        return SearchResult(move=root[best_index][0], value=best_value, stats=self._stats)
+
+    def _children(self, problem: SearchProblem) -> list[tuple[Any, float]]:
+        moves = problem.moves()
+        if self.limits.branching is not None:
+            moves = moves[:self.limits.branching]
+        return moves
+
+    def _search_root(
+        self,
+        problem: SearchProblem,
+        root: list[tuple[Any, float]],
+        order: list[int],
+        depth: int,
+    ) -> dict[int, float]:
+        values = {}
+        for index in order:
+            move, gain = root[index]
+            problem.apply(move)
+            try:
+                values[index] = gain + self._value(problem, depth - 1)
+            finally:
+                problem.undo()
+        return values
+
+    def _value(self, problem: SearchProblem, depth: int) -> float:
+        self._stats.nodes += 1
+        if self._clock() >= self._deadline:
+            raise SearchTimeout()
+
+        if depth == 0:
+            return 0.0
+
+        best = 0.0
+        for move, gain in self._children(problem):
+            problem.apply(move)
+            try:
+                value = gain + self._value(problem, depth - 1)
+            finally:
+                problem.undo()
+            if value > best:
+                best = value
+        return best
@@ -2,11 +2,17 @@
 AI Service for single player mode.
 Provides AI opponents for solo play testing.
 """
+import copy
+import json
 import random
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, fields
 from enum import Enum
+from functools import lru_cache
+from pathlib import Path
 from typing import Any
 
+from app.core.config import settings
+from app.services.ai_search import AnytimeSearch, SearchLimits, SearchStats
 from app.services.resource_service import Resources, ResourceService, ResourceType
 from app.services.worker_service import (
     WorkerService,
@@ -30,16 +36,85 @@ class AIDecision:
     """Represents an AI decision."""
     action_type: str
     params: dict
+    # Set when the decision came from AnytimeSearch
+    search: SearchStats | None = None
+
+
+@dataclass
+class AIWeights:
+    """
+    Evaluation weights for strategic AI decisions.
+
+    Defaults reproduce the original hand-picked HARD evaluation. Each
+    personality ships its own vector (see AI_WEIGHTS_DIR), tuned offline
+    by scripts/ai_tuner.py.
+    """
+    # Tile placement: score components and resource economy
+    base_points: float = 2.0
+    fengshui: float = 2.0
+    adjacency: float = 2.0
+    efficiency: float = 1.0
+    remaining_resources: float = 0.1
+
+    # Worker placement: resource stock each AI aims to keep
+    wood_target: float = 5.0
+    stone_target: float = 5.0
+    tile_target: float = 4.0
+    ink_target: float = 3.0
+    shortfall_bonus: float = 2.0
+    own_tile_bonus: float = 10.0
+
+    def to_dict(self) -> dict[str, float]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AIWeights":
+        """Create from dictionary, ignoring unknown keys."""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: float(v) for k, v in data.items() if k in names})
+
+    def to_vector(self) -> list[float]:
+        """Flatten to a vector in field order."""
+        return [getattr(self, f.name) for f in fields(self)]
+
+    @classmethod
+    def from_vector(cls, vector: list[float]) -> "AIWeights":
+        """Create from a vector in field order."""
+        return cls(*vector)
+
+    @classmethod
+    def field_names(cls) -> list[str]:
+        """Names of the weights in vector order."""
+        return [f.name for f in fields(cls)]
+
+
+DEFAULT_WEIGHTS = AIWeights()
+
+# Tuned weight vectors, one JSON file per personality
+AI_WEIGHTS_DIR = Path(__file__).resolve().parent.parent / "data" / "ai_weights"
 
 
 class AIService:
     """Service for AI opponent logic."""
 
+    # Default search budgets per difficulty. Only HARD searches by default;
+    # MEDIUM keeps its one-ply heuristics unless a caller passes limits.
+    SEARCH_LIMITS = {
+        AIDifficulty.HARD: SearchLimits(
+            deadline_ms=settings.AI_SEARCH_DEADLINE_MS,
+            max_depth=settings.AI_SEARCH_MAX_DEPTH,
+            branching=8,
+        ),
+    }
+
     @staticmethod
     def make_decision(
         game_state: dict,
         player_state: dict,
         difficulty: AIDifficulty = AIDifficulty.MEDIUM,
+        weights: AIWeights | None = None,
+        limits: SearchLimits | None = None,
     ) -> AIDecision:
         """
         Make a decision for the AI player.
@@ -48,6 +123,8 @@ class AIService:
             game_state: Current game state
             player_state: AI player's state
             difficulty: AI difficulty level
+            weights: Personality evaluation weights (ignored on EASY)
+            limits: Search budget (ignored on EASY; defaults per difficulty)
 
         Returns:
             AIDecision with action type and parameters
@@ -55,9 +132,9 @@ class AIService:
         if difficulty == AIDifficulty.EASY:
             return AIService._make_easy_decision(game_state, player_state)
         elif difficulty == AIDifficulty.MEDIUM:
-            return AIService._make_medium_decision(game_state, player_state)
+            return AIService._make_medium_decision(game_state, player_state, weights, limits)
         else:
-            return AIService._make_hard_decision(game_state, player_state)
+            return AIService._make_hard_decision(game_state, player_state, weights, limits)
 
     @staticmethod
     def _make_easy_decision(game_state: dict, player_state: dict) -> AIDecision:
@@ -75,12 +152,20 @@ class AIService:
         return action
 
     @staticmethod
-    def _make_medium_decision(game_state: dict, player_state: dict) -> AIDecision:
+    def _make_medium_decision(
+        game_state: dict,
+        player_state: dict,
+        weights: AIWeights | None = None,
+        limits: SearchLimits | None = None,
+    ) -> AIDecision:
         """
         Medium AI: Uses basic strategy.
         - Prioritizes high-point tiles if affordable
         - Places workers for resource generation
         - Considers feng shui bonuses
+        - Searches ahead within the turn when given limits, evaluating
+          with the personality weights; otherwise ignores them, so a
+          personality does not turn MEDIUM into HARD
         """
         # Check if there are dealt blueprints to select (only if no blueprint selected yet)
         dealt_blueprints = player_state.get("dealt_blueprints", [])
@@ -91,6 +176,9 @@ class AIService:
             if best_bp:
                 return AIDecision("select_blueprint", {"blueprint_id": best_bp})
 
+        if limits is not None:
+            return AIService._search_decision(game_state, player_state, weights, limits)
+
         # Try to place a tile
         tile_decision = AIService._decide_tile_placement(game_state, player_state, optimized=False)
         if tile_decision:
@@ -105,12 +193,17 @@ class AIService:
         return AIDecision("end_turn", {})
 
     @staticmethod
-    def _make_hard_decision(game_state: dict, player_state: dict) -> AIDecision:
+    def _make_hard_decision(
+        game_state: dict,
+        player_state: dict,
+        weights: AIWeights | None = None,
+        limits: SearchLimits | None = None,
+    ) -> AIDecision:
         """
         Hard AI: Uses optimized strategy.
         - Maximizes points per resource spent
         - Plans for blueprint completion
-        - Blocks opponents when possible
+        - Searches the rest of the turn within a deadline
         """
         # Check if there are dealt blueprints to select (only if no blueprint selected yet)
         dealt_blueprints = player_state.get("dealt_blueprints", [])
@@ -121,17 +214,24 @@ class AIService:
             if best_bp:
                 return AIDecision("select_blueprint", {"blueprint_id": best_bp})
 
-        # Evaluate all possible tile placements
-        tile_decision = AIService._decide_tile_placement(game_state, player_state, optimized=True)
-        if tile_decision:
-            return tile_decision
+        limits = limits or AIService.SEARCH_LIMITS[AIDifficulty.HARD]
+        return AIService._search_decision(game_state, player_state, weights, limits)
 
-        # Strategic worker placement
-        worker_decision = AIService._decide_worker_placement(game_state, player_state, optimized=True)
-        if worker_decision:
-            return worker_decision
+    @staticmethod
+    def _search_decision(
+        game_state: dict,
+        player_state: dict,
+        weights: AIWeights | None,
+        limits: SearchLimits,
+    ) -> AIDecision:
+        """Pick the next tile or worker placement by anytime search."""
+        problem = TurnSearchProblem(game_state, player_state, weights or DEFAULT_WEIGHTS)
+        result = AnytimeSearch(limits).run(problem)
 
-        return AIDecision("end_turn", {})
+        if result.move is None:
+            return AIDecision("end_turn", {}, search=result.stats)
+
+        return AIDecision(result.move.action_type, result.move.params, search=result.stats)
 
     @staticmethod
     def _get_valid_actions(game_state: dict, player_state: dict) -> list[AIDecision]:
@@ -324,6 +424,7 @@ class AIService:
         game_state: dict,
         player_state: dict,
         optimized: bool = False,
+        weights: AIWeights | None = None,
     ) -> AIDecision | None:
         """Decide which tile to place and where."""
         resources = Resources.from_dict(player_state.get("resources", {}))
@@ -350,6 +451,7 @@ class AIService:
 
         if optimized:
             # Evaluate all combinations and pick best
+            weights = weights or DEFAULT_WEIGHTS
             best_tile = None
             best_pos = None
             best_score = -float("inf")
@@ -361,24 +463,10 @@ class AIService:
 
                 for pos in valid_positions:
                     score_breakdown = TileService.calculate_placement_score(board, pos, tile_id)
-                    total_score = score_breakdown["total"]
-
-                    # Calculate efficiency (points per resource spent)
-                    cost = tile_def.cost
-                    total_cost = cost.wood + cost.stone + cost.tile + cost.ink
-                    efficiency = total_score / max(1, total_cost)
-
-                    # Factor in remaining resources after purchase
-                    remaining = (
-                        resources.wood - cost.wood +
-                        resources.stone - cost.stone +
-                        resources.tile - cost.tile +
-                        resources.ink - cost.ink
+                    weighted_score = AIService._evaluate_tile_placement(
+                        score_breakdown, tile_def, resources, weights
                     )
 
-                    # Weighted score
-                    weighted_score = total_score * 2 + efficiency + remaining * 0.1
-
                     if weighted_score > best_score:
                         best_score = weighted_score
                         best_tile = tile_id
@@ -421,6 +509,7 @@ class AIService:
         game_state: dict,
         player_state: dict,
         optimized: bool = False,
+        weights: AIWeights | None = None,
     ) -> AIDecision | None:
         """Decide where to place a worker."""
         workers = PlayerWorkers.from_dict(player_state.get("workers", {}))
@@ -455,7 +544,8 @@ class AIService:
             resources = Resources.from_dict(player_state.get("resources", {}))
 
             # Determine which resource is most needed
-            resource_priority = AIService._get_resource_priority(resources, game_state)
+            weights = weights or DEFAULT_WEIGHTS
+            resource_priority = AIService._get_resource_priority(resources, game_state, weights)
 
             best_slot = None
             best_priority = -1
@@ -474,7 +564,7 @@ class AIService:
 
                     # Prefer own tiles
                     if tile.get("owner_id") == player_id:
-                        priority += 10
+                        priority += weights.own_tile_bonus
 
                     if priority > best_priority:
                         best_priority = priority
@@ -496,16 +586,20 @@ class AIService:
         })
 
     @staticmethod
-    def _get_resource_priority(resources: Resources, game_state: dict) -> dict[str, int]:
+    def _get_resource_priority(
+        resources: Resources,
+        game_state: dict,
+        weights: AIWeights = DEFAULT_WEIGHTS,
+    ) -> dict[str, float]:
         """Calculate priority for each resource type based on current state."""
         # Lower amounts = higher priority
         priority = {}
 
         # Base priority on scarcity
-        priority["wood"] = max(0, 5 - resources.wood)
-        priority["stone"] = max(0, 5 - resources.stone)
-        priority["tile"] = max(0, 4 - resources.tile)
-        priority["ink"] = max(0, 3 - resources.ink)
+        priority["wood"] = max(0, weights.wood_target - resources.wood)
+        priority["stone"] = max(0, weights.stone_target - resources.stone)
+        priority["tile"] = max(0, weights.tile_target - resources.tile)
+        priority["ink"] = max(0, weights.ink_target - resources.ink)
 
         # Adjust based on available tiles
         available_tiles = game_state.get("available_tiles", [])[:3]
@@ -515,16 +609,45 @@ class AIService:
             if tile_def:
                 cost = tile_def.cost
                 if cost.wood > resources.wood:
-                    priority["wood"] += 2
+                    priority["wood"] += weights.shortfall_bonus
                 if cost.stone > resources.stone:
-                    priority["stone"] += 2
+                    priority["stone"] += weights.shortfall_bonus
                 if cost.tile > resources.tile:
-                    priority["tile"] += 2
+                    priority["tile"] += weights.shortfall_bonus
                 if cost.ink > resources.ink:
-                    priority["ink"] += 2
+                    priority["ink"] += weights.shortfall_bonus
 
         return priority
 
+    @staticmethod
+    def _evaluate_tile_placement(
+        score_breakdown: dict,
+        tile_def: TileDefinition,
+        resources: Resources,
+        weights: AIWeights = DEFAULT_WEIGHTS,
+    ) -> float:
+        """Weighted value of placing a tile, from its score breakdown and cost."""
+        # Calculate efficiency (points per resource spent)
+        cost = tile_def.cost
+        total_cost = cost.wood + cost.stone + cost.tile + cost.ink
+        efficiency = score_breakdown["total"] / max(1, total_cost)
+
+        # Factor in remaining resources after purchase
+        remaining = (
+            resources.wood - cost.wood +
+            resources.stone - cost.stone +
+            resources.tile - cost.tile +
+            resources.ink - cost.ink
+        )
+
+        return (
+            score_breakdown["base"] * weights.base_points
+            + score_breakdown["fengshui"] * weights.fengshui
+            + score_breakdown["adjacency"] * weights.adjacency
+            + efficiency * weights.efficiency
+            + remaining * weights.remaining_resources
+        )
+
     @staticmethod
     def _get_tile_resource_type(category: str) -> str | None:
         """Get the resource type produced by a tile category."""
@@ -537,6 +660,108 @@ class AIService:
         return resource_map.get(category)
 
 
+class TurnSearchProblem:
+    """
+    The rest of an AI's turn as a search problem for AnytimeSearch.
+
+    Tile and worker placements are simulated on a private copy of the
+    board and valued with the same weighted evaluation as one-ply play,
+    so deeper searches choose which purchases to combine in one turn.
+    """
+
+    def __init__(self, game_state: dict, player_state: dict, weights: AIWeights):
+        self.board = copy.deepcopy(game_state.get("board", []))
+        self.available_tiles = list(game_state.get("available_tiles", []))
+        self.resources = Resources.from_dict(player_state.get("resources", {}))
+        self.workers = PlayerWorkers.from_dict(player_state.get("workers", {}))
+        # Use user_id since tiles store owner_id as user_id
+        self.player_id = player_state.get("user_id")
+        self.weights = weights
+        self._undo_stack: list[Any] = []
+
+    def moves(self) -> list[tuple[AIDecision, float]]:
+        """Legal placements with their weighted value, best first."""
+        moves = []
+        positions = AIService._get_valid_tile_positions(self.board)
+
+        for tile_id in dict.fromkeys(self.available_tiles[:3]):
+            if not TileService.can_afford_tile(self.resources, tile_id):
+                continue
+            tile_def = TileService.get_tile_definition(tile_id)
+
+            for pos in positions:
+                score_breakdown = TileService.calculate_placement_score(self.board, pos, tile_id)
+                value = AIService._evaluate_tile_placement(
+                    score_breakdown, tile_def, self.resources, self.weights
+                )
+                moves.append((AIDecision("place_tile", {"tile_id": tile_id, "position": pos}), value))
+
+        priority = AIService._get_resource_priority(
+            self.resources, {"available_tiles": self.available_tiles}, self.weights
+        )
+        # Officials first so they win ties, as in one-ply play
+        for worker_type, state in (("official", self.workers.officials), ("apprentice", self.workers.apprentices)):
+            if state.available <= 0:
+                continue
+
+            for slot in AIService._get_worker_slots(self.board, worker_type):
+                pos = slot["position"]
+                tile = self.board[pos["row"]][pos["col"]]["tile"]
+                resource = AIService._get_tile_resource_type(tile["tile_id"].split("_")[0])
+
+                value = priority.get(resource, 0.0)
+                if resource and tile.get("owner_id") == self.player_id:
+                    value += self.weights.own_tile_bonus
+
+                moves.append((AIDecision("place_worker", {
+                    "worker_type": worker_type,
+                    "target_position": pos,
+                    "slot_index": slot["slot_index"],
+                }), value))
+
+        moves.sort(key=lambda move: move[1], reverse=True)
+        return moves
+
+    def apply(self, move: AIDecision) -> None:
+        """Simulate a placement."""
+        if move.action_type == "place_tile":
+            tile_id = move.params["tile_id"]
+            pos = move.params["position"]
+            cell = self.board[pos["row"]][pos["col"]]
+            tile_def = TileService.get_tile_definition(tile_id)
+            index = self.available_tiles.index(tile_id)
+
+            self._undo_stack.append(("place_tile", cell, self.resources, index, tile_id))
+            self.resources = ResourceService.pay_cost(self.resources, tile_def.cost.to_resource_dict())
+            cell["tile"] = TileService.create_placed_tile(tile_id, self.player_id)
+            del self.available_tiles[index]
+        else:
+            pos = move.params["target_position"]
+            tile = self.board[pos["row"]][pos["col"]]["tile"]
+            worker_type = WorkerType(move.params["worker_type"])
+
+            self._undo_stack.append(("place_worker", tile, self.workers))
+            self.workers = WorkerService.place_worker(self.workers, worker_type)
+            tile["placed_workers"].append(PlacedWorker(
+                player_id=self.player_id,
+                worker_type=worker_type,
+                slot_index=move.params["slot_index"],
+            ).to_dict())
+
+    def undo(self) -> None:
+        """Take back the last simulated placement."""
+        action_type, *entry = self._undo_stack.pop()
+        if action_type == "place_tile":
+            cell, resources, index, tile_id = entry
+            cell["tile"] = None
+            self.resources = resources
+            self.available_tiles.insert(index, tile_id)
+        else:
+            tile, workers = entry
+            tile["placed_workers"].pop()
+            self.workers = workers
+
+
 class AIPlayer:
     """
     Represents an AI-controlled player.
@@ -550,17 +775,21 @@ class AIPlayer:
         username: str,
         color: str,
         difficulty: AIDifficulty = AIDifficulty.MEDIUM,
+        personality: str | None = None,
+        weights: AIWeights | None = None,
     ):
         self.player_id = player_id
         self.user_id = user_id
         self.username = username
         self.color = color
         self.difficulty = difficulty
+        self.personality = personality
+        self.weights = weights
         self.is_ai = True
 
     def get_decision(self, game_state: dict, player_state: dict) -> AIDecision:
         """Get the AI's next decision."""
-        return AIService.make_decision(game_state, player_state, self.difficulty)
+        return AIService.make_decision(game_state, player_state, self.difficulty, self.weights)
 
     def to_dict(self) -> dict:
         """Convert to dictionary representation."""
@@ -570,18 +799,22 @@ class AIPlayer:
             "username": self.username,
             "color": self.color,
             "difficulty": self.difficulty.value,
+            "personality": self.personality,
             "is_ai": True,
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> "AIPlayer":
         """Create AIPlayer from dictionary."""
+        personality = data.get("personality")
         return cls(
             player_id=data["player_id"],
             user_id=data["user_id"],
             username=data["username"],
             color=data["color"],
             difficulty=AIDifficulty(data.get("difficulty", "medium")),
+            personality=personality,
+            weights=load_personality_weights(personality) if personality else None,
         )
 
 
@@ -614,6 +847,35 @@ AI_PERSONALITIES = {
 }
 
 
+@lru_cache(maxsize=None)
+def load_personality_weights(personality: str) -> AIWeights:
+    """
+    Load the evaluation weights for a personality.
+
+    Falls back to DEFAULT_WEIGHTS when no data file exists.
+
+    Args:
+        personality: Key from AI_PERSONALITIES
+
+    Returns:
+        The personality's AIWeights
+    """
+    path = AI_WEIGHTS_DIR / f"{personality}.json"
+    if not path.exists():
+        return DEFAULT_WEIGHTS
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return AIWeights.from_dict(data.get("weights", data))
+
+
+def get_player_weights(player_state: dict) -> AIWeights | None:
+    """Get the evaluation weights for an AI player's stored personality."""
+    personality = player_state.get("ai_personality")
+    if personality not in AI_PERSONALITIES:
+        return None
+    return load_personality_weights(personality)
+
+
 def create_ai_opponent(
     player_id: int,
     personality: str = "resource_hoarder",
@@ -628,7 +890,9 @@ def create_ai_opponent(
     Returns:
         Configured AIPlayer instance
     """
-    personality_data = AI_PERSONALITIES.get(personality, AI_PERSONALITIES["resource_hoarder"])
+    if personality not in AI_PERSONALITIES:
+        personality = "resource_hoarder"
+    personality_data = AI_PERSONALITIES[personality]
 
     return AIPlayer(
         player_id=player_id,
@@ -636,4 +900,6 @@ def create_ai_opponent(
         username=f"AI - {personality_data['name']}",
         color="gray",
         difficulty=personality_data["difficulty"],
+        personality=personality,
+        weights=load_personality_weights(personality),
     )
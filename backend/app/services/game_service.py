@@ -15,6 +15,7 @@ from app.services.resource_service import ResourceService, Resources, ResourceTy
 from app.services.worker_service import WorkerService, PlayerWorkers, WorkerState
 from app.services.tile_service import TileService
 from app.services.blueprint_service import BlueprintService
+from app.services.projection_service import StateProjectionService
 
 
 class GameService:
@@ -153,9 +154,27 @@ class GameService:
     async def get_game(
         db: AsyncSession,
         game_id: int,
+        lock: bool = False,
     ) -> Game | None:
-        """Get game by ID."""
-        result = await db.execute(select(Game).where(Game.id == game_id))
+        """
+        Get game by ID.
+
+        With lock, the row stays locked (SELECT ... FOR UPDATE) until the
+        session commits, so concurrent writers on any worker wait for it.
+        """
+        query = select(Game).where(Game.id == game_id)
+        if lock:
+            query = query.with_for_update()
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_game_version(
+        db: AsyncSession,
+        game_id: int,
+    ) -> int | None:
+        """Get a game's version without loading its state columns."""
+        result = await db.execute(select(Game.version).where(Game.id == game_id))
         return result.scalar_one_or_none()
 
     @staticmethod
@@ -248,7 +267,8 @@ class GameService:
         action_type: str,
         payload: dict,
     ) -> GameAction:
-        """Record a game action."""
+        """Record a game action and bump the game version."""
+        game.version = (game.version or 0) + 1
         action = GameAction(
             game_id=game.id,
             player_id=player_id,
@@ -691,15 +711,21 @@ class GameService:
         return results
 
     @staticmethod
-    def to_game_state_response(game: Game) -> dict:
-        """Convert game to API response format."""
-        return {
+    def to_game_state_response(game: Game, viewer_user_id: int | None = None) -> dict:
+        """
+        Convert game to API response format.
+
+        Without a viewer the full state is returned (for the server and AI);
+        with one, other players' private fields are hidden.
+        """
+        state = {
             "id": game.id,
             "lobby_id": game.lobby_id,
             "status": game.status.value,
             "current_round": game.current_round,
             "total_rounds": game.total_rounds,
             "current_turn_player_id": game.current_turn_player_id,
+            "version": game.version,
             "turn_order": game.turn_order,
             "board": game.board,
             "players": game.players,
@@ -708,3 +734,6 @@ class GameService:
             "created_at": game.created_at.isoformat() if game.created_at else None,
             "updated_at": game.updated_at.isoformat() if game.updated_at else None,
         }
+        if viewer_user_id is None:
+            return state
+        return StateProjectionService.for_user(state, viewer_user_id)
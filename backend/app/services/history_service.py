@@ -0,0 +1,225 @@
+"""
+Action History Service
+
+Reads recorded game actions: keyset pages of one game's log, and a
+streamed NDJSON export of many games' logs. Both walk game_actions in
+(game_id, id) order, which its composite index serves directly. Games the
+retention job has archived are read from their archive instead.
+"""
+import json
+from collections import deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import session_scope
+from app.models.game import Game, GameAction, GameArchive, GameStatus
+from app.schemas.game import ActionHistoryResponse
+from app.services.retention_service import RetentionService
+
+# Actions whose payload only the acting player may see until the game ends
+# (the chosen blueprint, see StateProjectionService)
+PRIVATE_ACTION_TYPES = ("select_blueprint",)
+
+_COLUMNS = (
+    GameAction.id,
+    GameAction.game_id,
+    GameAction.player_id,
+    GameAction.action_type,
+    GameAction.payload_json,
+    GameAction.timestamp,
+)
+
+
+class ActionHistoryService:
+    """Service for reading game action logs."""
+
+    @staticmethod
+    def to_record(
+        row: Any,
+        viewer_id: int,
+        finished: bool,
+    ) -> Dict[str, Any]:
+        """
+        Convert an action row to its API form.
+
+        Args:
+            row: GameAction, or a row of its columns
+            viewer_id: User the record is for
+            finished: Whether the game is finished
+
+        Returns:
+            Action dict; private payloads of other players are emptied
+        """
+        hidden = (
+            row.action_type in PRIVATE_ACTION_TYPES
+            and row.player_id != viewer_id
+            and not finished
+        )
+        timestamp: Optional[datetime] = row.timestamp
+        return {
+            "id": row.id,
+            "game_id": row.game_id,
+            "player_id": row.player_id,
+            "action_type": row.action_type,
+            "payload": {} if hidden else json.loads(row.payload_json),
+            "timestamp": timestamp.isoformat() if timestamp else None,
+        }
+
+    @staticmethod
+    async def get_status(db: AsyncSession, game_id: int) -> GameStatus | None:
+        """Get a game's status without loading its state columns."""
+        result = await db.execute(select(Game.status).where(Game.id == game_id))
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def list_actions(
+        db: AsyncSession,
+        game_id: int,
+        viewer_id: int,
+        finished: bool,
+        after: int = 0,
+        limit: int = settings.ACTION_HISTORY_PAGE_SIZE,
+    ) -> ActionHistoryResponse:
+        """
+        Get one page of a game's actions, oldest first.
+
+        Args:
+            db: Database session
+            game_id: The game ID
+            viewer_id: User the page is for
+            finished: Whether the game is finished
+            after: ID of the last action already seen (0 for the start)
+            limit: Page size
+
+        Returns:
+            Page of actions, with next_after set if more follow
+        """
+        result = await db.execute(
+            select(*_COLUMNS)
+            .where(GameAction.game_id == game_id, GameAction.id > after)
+            .order_by(GameAction.id)
+            .limit(limit + 1)
+        )
+        return ActionHistoryService._page(result.all(), viewer_id, finished, limit)
+
+    @staticmethod
+    def list_archived_actions(
+        archive: GameArchive,
+        viewer_id: int,
+        after: int = 0,
+        limit: int = settings.ACTION_HISTORY_PAGE_SIZE,
+    ) -> ActionHistoryResponse:
+        """
+        Get one page of an archived game's actions, oldest first.
+
+        Args:
+            archive: The game's archive
+            viewer_id: User the page is for
+            after: ID of the last action already seen (0 for the start)
+            limit: Page size
+
+        Returns:
+            Page of actions, with next_after set if more follow
+        """
+        rows = [a for a in RetentionService.archived_actions(archive) if a.id > after]
+        return ActionHistoryService._page(rows[:limit + 1], viewer_id, True, limit)
+
+    @staticmethod
+    def _page(
+        rows: Sequence[Any],
+        viewer_id: int,
+        finished: bool,
+        limit: int,
+    ) -> ActionHistoryResponse:
+        # One extra row tells whether another page follows
+        page = rows[:limit]
+        return ActionHistoryResponse(
+            actions=[ActionHistoryService.to_record(r, viewer_id, finished) for r in page],
+            next_after=page[-1].id if len(rows) > limit else None,
+        )
+
+    @staticmethod
+    async def get_statuses(db: AsyncSession, game_ids: list[int]) -> Dict[int, GameStatus]:
+        """Get the status of each existing game among game_ids, archived ones included."""
+        result = await db.execute(select(Game.id, Game.status).where(Game.id.in_(game_ids)))
+        statuses = {game_id: game_status for game_id, game_status in result.all()}
+
+        missing = [game_id for game_id in game_ids if game_id not in statuses]
+        if missing:
+            archived = await db.execute(
+                select(GameArchive.game_id).where(GameArchive.game_id.in_(missing))
+            )
+            statuses.update((game_id, GameStatus.FINISHED) for game_id in archived.scalars())
+        return statuses
+
+    @staticmethod
+    async def export_ndjson(
+        statuses: Dict[int, GameStatus],
+        viewer_id: int,
+        fetch_size: int = settings.ACTION_EXPORT_FETCH_SIZE,
+    ) -> AsyncIterator[str]:
+        """
+        Stream the actions of several games as NDJSON, one action per line.
+
+        Rows come from a server-side cursor fetch_size at a time on a
+        session of the export's own (the request's is gone once streaming
+        starts), and only plain column tuples are loaded, so memory stays
+        flat however long the logs are. Archived games are merged in from
+        their archives, which are loaded compressed up front (at most
+        ACTION_EXPORT_MAX_GAMES) and decompressed one at a time.
+
+        Args:
+            statuses: Status of every game to export, by game ID
+            viewer_id: User the export is for
+            fetch_size: Rows fetched per round trip
+
+        Yields:
+            Chunks of NDJSON lines, ordered by game, then action
+        """
+        if not statuses:
+            return
+
+        def lines(rows: Iterable[Any]) -> str:
+            return "".join(
+                json.dumps(
+                    ActionHistoryService.to_record(
+                        row, viewer_id, statuses[row.game_id] == GameStatus.FINISHED
+                    ),
+                    separators=(",", ":"),
+                ) + "\n"
+                for row in rows
+            )
+
+        async with session_scope() as db:
+            archives = deque((
+                await db.execute(
+                    select(GameArchive)
+                    .where(GameArchive.game_id.in_(list(statuses)))
+                    .order_by(GameArchive.game_id)
+                )
+            ).scalars().all())
+
+            result = await db.stream(
+                select(*_COLUMNS)
+                .where(GameAction.game_id.in_(list(statuses)))
+                .order_by(GameAction.game_id, GameAction.id)
+                .execution_options(yield_per=fetch_size)
+            )
+            async for rows in result.partitions():
+                start = 0
+                for i, row in enumerate(rows):
+                    # Archived games that sort before this row go first
+                    if archives and archives[0].game_id < row.game_id:
+                        if start < i:
+                            yield lines(rows[start:i])
+                            start = i
+                        while archives and archives[0].game_id < row.game_id:
+                            yield lines(RetentionService.archived_actions(archives.popleft()))
+                yield lines(rows[start:])
+
+        while archives:
+            yield lines(RetentionService.archived_actions(archives.popleft()))
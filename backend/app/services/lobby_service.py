@@ -0,0 +1,250 @@
+"""
+Lobby Service
+
+Builds lobby responses and lists waiting lobbies for the lobby browser
+with keyset pagination and a short-lived cache of the first pages.
+Committed lobby changes drop that cache and are pushed to the lobby
+WebSocket channels (see app/websocket/lobby_handler.py).
+"""
+import asyncio
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Set
+
+from sqlalchemy import and_, event, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.lobby import Lobby, LobbyPlayer, LobbyStatus
+from app.models.user import User
+from app.schemas.lobby import (
+    LobbyListResponse,
+    LobbyPlayerResponse,
+    LobbyResponse,
+    LobbySummary,
+)
+
+# (cursor, limit) -> page, for the first LOBBY_CACHED_PAGES pages
+list_cache: TTLCache[LobbyListResponse] = TTLCache(settings.LOBBY_LIST_CACHE_TTL_SECONDS, 256)
+
+# Session.info key: IDs of the lobbies changed in the current transaction
+_CHANGED_KEY = "changed_lobby_ids"
+_notify_tasks: Set[asyncio.Task] = set()
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+@dataclass(frozen=True)
+class LobbyCursor:
+    """Position after the last lobby of a page"""
+    created_at: datetime
+    lobby_id: int
+    page: int
+
+    def encode(self) -> str:
+        raw = json.dumps([self.created_at.isoformat(), self.lobby_id, self.page])
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "LobbyCursor":
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            created_at, lobby_id, page = json.loads(raw)
+            return cls(datetime.fromisoformat(created_at), int(lobby_id), int(page))
+        except (ValueError, TypeError) as e:
+            raise InvalidCursor("Invalid cursor") from e
+
+
+class LobbyService:
+    """Service for lobby responses and the lobby browser."""
+
+    @staticmethod
+    def to_player_response(player: LobbyPlayer) -> LobbyPlayerResponse:
+        """Convert LobbyPlayer to response model."""
+        return LobbyPlayerResponse(
+            id=player.id,
+            user_id=player.user_id,
+            username=player.user.username if player.user else "Unknown",
+            color=player.color.value,
+            turn_order=player.turn_order,
+            is_host=False,  # Will be set by to_lobby_response
+            is_ready=player.is_ready,
+        )
+
+    @staticmethod
+    def to_lobby_response(lobby: Lobby, current_user_id: int | None = None) -> LobbyResponse:
+        """Convert Lobby (with players and users loaded) to response model."""
+        players = []
+        for p in sorted(lobby.players, key=lambda x: x.turn_order):
+            player_response = LobbyService.to_player_response(p)
+            player_response.is_host = p.user_id == lobby.host_id
+            players.append(player_response)
+
+        return LobbyResponse(
+            id=lobby.id,
+            name=lobby.name,
+            host_id=lobby.host_id,
+            invite_code=lobby.invite_code,
+            status=lobby.status.value,
+            max_players=lobby.max_players,
+            game_id=lobby.game_id,
+            players=players,
+            created_at=lobby.created_at.isoformat(),
+        )
+
+    @staticmethod
+    def to_summary(lobby: Lobby) -> LobbySummary:
+        """Convert Lobby (with players and users loaded) to a list row."""
+        host = next((p for p in lobby.players if p.user_id == lobby.host_id), None)
+        return LobbySummary(
+            id=lobby.id,
+            name=lobby.name,
+            host_id=lobby.host_id,
+            host_username=host.user.username if host and host.user else "",
+            status=lobby.status.value,
+            max_players=lobby.max_players,
+            player_count=len(lobby.players),
+            created_at=lobby.created_at,
+        )
+
+    @staticmethod
+    async def list_waiting(
+        db: AsyncSession,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> LobbyListResponse:
+        """
+        One page of waiting lobbies, newest first.
+
+        Args:
+            db: Database session
+            limit: Page size
+            cursor: next_cursor of the previous page (None for the first)
+
+        Returns:
+            Lobby summaries and the cursor of the next page, if any
+
+        Raises:
+            InvalidCursor: If the cursor is malformed
+        """
+        after = LobbyCursor.decode(cursor) if cursor else None
+        page = after.page if after else 0
+        cacheable = page < settings.LOBBY_CACHED_PAGES
+        if cacheable:
+            cached = list_cache.get((cursor, limit))
+            if cached is not None:
+                return cached
+
+        player_count = (
+            select(func.count(LobbyPlayer.id))
+            .where(LobbyPlayer.lobby_id == Lobby.id)
+            .correlate(Lobby)
+            .scalar_subquery()
+        )
+        query = (
+            select(
+                Lobby.id,
+                Lobby.name,
+                Lobby.host_id,
+                User.username,
+                Lobby.status,
+                Lobby.max_players,
+                player_count,
+                Lobby.created_at,
+            )
+            .join(User, User.id == Lobby.host_id)
+            .where(Lobby.status == LobbyStatus.WAITING)
+            .order_by(Lobby.created_at.desc(), Lobby.id.desc())
+            # One extra row tells whether there is a next page
+            .limit(limit + 1)
+        )
+        if after:
+            query = query.where(
+                or_(
+                    Lobby.created_at < after.created_at,
+                    and_(Lobby.created_at == after.created_at, Lobby.id < after.lobby_id),
+                )
+            )
+
+        rows = (await db.execute(query)).all()
+        summaries = [
+            LobbySummary(
+                id=row[0],
+                name=row[1],
+                host_id=row[2],
+                host_username=row[3],
+                status=row[4].value,
+                max_players=row[5],
+                player_count=row[6],
+                created_at=row[7],
+            )
+            for row in rows[:limit]
+        ]
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = summaries[-1]
+            next_cursor = LobbyCursor(last.created_at, last.id, page + 1).encode()
+
+        response = LobbyListResponse(lobbies=summaries, next_cursor=next_cursor)
+        if cacheable:
+            list_cache.set((cursor, limit), response)
+        return response
+
+
+@event.listens_for(Session, "after_flush")
+def _on_flush(session: Session, flush_context) -> None:
+    # Any lobby or seat change (create, join, leave, ready, start) may
+    # change the listing and the lobby's channel
+    changed = session.info.setdefault(_CHANGED_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Lobby):
+            changed.add(obj.id)
+        elif isinstance(obj, LobbyPlayer):
+            changed.add(obj.lobby_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session: Session) -> None:
+    # Acted on only once the change is visible, so a concurrent listing
+    # cannot cache the pre-commit state
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if not changed:
+        return
+    list_cache.clear()
+
+    # Deferred: the lobby handler imports this module
+    from app.websocket.lobby_handler import notify_lobby_changes
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(notify_lobby_changes(sorted(changed)))
+    _notify_tasks.add(task)
+    task.add_done_callback(_notify_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _on_rollback(session: Session) -> None:
+    session.info.pop(_CHANGED_KEY, None)
+
+
+def mark_lobbies_changed(session: AsyncSession, lobby_ids) -> None:
+    """
+    Treat lobbies as changed by the session's transaction, for bulk
+    statements that bypass the flush hook.
+    """
+    session.info.setdefault(_CHANGED_KEY, set()).update(lobby_ids)
+
+
+async def wait_for_notifications() -> None:
+    """Wait until pending lobby change notifications have been sent."""
+    while _notify_tasks:
+        await asyncio.gather(*list(_notify_tasks), return_exceptions=True)
@@ -0,0 +1,102 @@
+"""
+State Projection Service
+
+Splits a full game state into what every seat may see and what only the
+owning player may see (blueprint hands).
+"""
+from typing import Any, Dict, Optional
+
+# Player state fields only their owner may see
+PRIVATE_PLAYER_FIELDS = ("dealt_blueprints", "blueprints")
+
+
+class StateProjectionService:
+    """Build per-viewer views of a game state."""
+
+    @staticmethod
+    def public_view(state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Game state as seen by any seat.
+
+        Private player fields are replaced by counts, so opponents still
+        see how many blueprints each player holds.
+
+        Args:
+            state: Full game state (to_game_state_response)
+
+        Returns:
+            New state; the input is not modified
+        """
+        if "players" not in state:
+            return state
+
+        players = []
+        for player in state["players"]:
+            public = {k: v for k, v in player.items() if k not in PRIVATE_PLAYER_FIELDS}
+            public["dealt_blueprint_count"] = len(player.get("dealt_blueprints") or [])
+            public["blueprint_count"] = len(player.get("blueprints") or [])
+            players.append(public)
+        return {**state, "players": players}
+
+    @staticmethod
+    def private_parts(state: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+        """
+        Private fields of every seat.
+
+        Args:
+            state: Full game state
+
+        Returns:
+            Mapping of player ID to that player's private fields
+        """
+        return {
+            player["id"]: {field: player.get(field, []) for field in PRIVATE_PLAYER_FIELDS}
+            for player in state.get("players", [])
+        }
+
+    @staticmethod
+    def with_private(
+        public: Dict[str, Any],
+        player_id: int,
+        private: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Combine a public view with one seat's private fields.
+
+        Args:
+            public: State from public_view
+            player_id: Seat the private fields belong to
+            private: That seat's fields from private_parts
+
+        Returns:
+            New state with the seat's player entry completed
+        """
+        if not private:
+            return public
+        players = [
+            {**player, **private} if player.get("id") == player_id else player
+            for player in public.get("players", [])
+        ]
+        return {**public, "players": players}
+
+    @staticmethod
+    def for_user(state: Dict[str, Any], user_id: Optional[int]) -> Dict[str, Any]:
+        """
+        Game state as seen by a user (a spectator if not a player).
+
+        Args:
+            state: Full game state
+            user_id: Viewing user's ID
+
+        Returns:
+            Public view plus the user's own private fields
+        """
+        public = StateProjectionService.public_view(state)
+        seat = next(
+            (p for p in state.get("players", []) if user_id is not None and p.get("user_id") == user_id),
+            None,
+        )
+        if seat is None:
+            return public
+        private = StateProjectionService.private_parts({"players": [seat]})[seat["id"]]
+        return StateProjectionService.with_private(public, seat["id"], private)
@@ -0,0 +1,373 @@
+"""
+Retention Service
+
+Keeps the hot tables small: finished games are compressed into
+game_archives together with their action logs, archives are deleted once
+past the retention period, and waiting lobbies nobody joined for a while
+are deleted.
+
+Archived games stay readable until purged: get_archived_game and
+archived_actions rebuild a game and its log from the archive.
+
+Every step works in batches, each in its own short transaction, so no
+lock on games, game_actions or lobbies is held for long. Batch rows are
+claimed with FOR UPDATE SKIP LOCKED where the database supports it, so
+several workers may run the job at once.
+"""
+import asyncio
+import json
+import logging
+import zlib
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import session_scope
+from app.core.metrics import registry
+from app.models.game import Game, GameAction, GameArchive, GameStatus
+from app.models.lobby import Lobby, LobbyPlayer, LobbyStatus
+from app.services.lobby_service import mark_lobbies_changed
+
+logger = logging.getLogger(__name__)
+
+retention_rows_total = registry.counter(
+    "retention_rows_total", "Rows handled by the retention job", ("kind",)
+)
+
+# Game columns kept in an archive, besides the JSON state columns
+_GAME_COLUMNS = (
+    "id", "lobby_id", "current_round", "total_rounds",
+    "current_turn_player_id", "version",
+)
+_STATE_COLUMNS = (
+    "turn_order_json", "board_json", "players_json",
+    "available_tiles_json", "discarded_tiles_json", "last_action_json",
+)
+
+
+@dataclass
+class RetentionPolicy:
+    """Ages and batch limits of one retention run"""
+    archive_after: timedelta = timedelta(days=settings.GAME_ARCHIVE_AFTER_DAYS)
+    retain_for: timedelta = timedelta(days=settings.GAME_RETENTION_DAYS)
+    lobby_abandoned_after: timedelta = timedelta(hours=settings.LOBBY_ABANDONED_HOURS)
+    batch_size: int = settings.RETENTION_BATCH_SIZE
+    max_batches: int = settings.RETENTION_MAX_BATCHES
+    batch_pause: float = settings.RETENTION_BATCH_PAUSE_SECONDS
+
+
+class ArchivedAction(NamedTuple):
+    """Action of an archived game, with the columns of a GameAction row"""
+    id: int
+    game_id: int
+    player_id: int
+    action_type: str
+    payload_json: str
+    timestamp: Optional[datetime]
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _from_iso(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class RetentionService:
+    """Batch steps of the retention job."""
+
+    @staticmethod
+    def build_archive(game: Game, actions: List[GameAction]) -> GameArchive:
+        """
+        Compress a finished game and its action log into an archive row.
+
+        Args:
+            game: Finished game
+            actions: The game's actions, in order
+
+        Returns:
+            Archive row (not added to a session)
+        """
+        document = {
+            "game": {
+                **{column: getattr(game, column) for column in _GAME_COLUMNS},
+                # State columns are stored as the JSON text they already are
+                **{column: getattr(game, column) for column in _STATE_COLUMNS},
+                "status": game.status.value,
+                "created_at": _iso(game.created_at),
+                "updated_at": _iso(game.updated_at),
+            },
+            "actions": [
+                {
+                    "id": action.id,
+                    "player_id": action.player_id,
+                    "action_type": action.action_type,
+                    "payload_json": action.payload_json,
+                    "timestamp": _iso(action.timestamp),
+                }
+                for action in actions
+            ],
+        }
+        players = [
+            {
+                "user_id": p.get("user_id"),
+                "username": p.get("username"),
+                "final_score": p.get("final_score", p.get("score")),
+            }
+            for p in game.players
+        ]
+        return GameArchive(
+            game_id=game.id,
+            lobby_id=game.lobby_id,
+            finished_at=game.updated_at,
+            action_count=len(actions),
+            players_json=json.dumps(players),
+            data=zlib.compress(json.dumps(document, separators=(",", ":")).encode(), 9),
+        )
+
+    @staticmethod
+    def read_archive(archive: GameArchive) -> Dict[str, Any]:
+        """
+        Decompress an archive.
+
+        Returns:
+            {"game": {...}, "actions": [...]} as stored by build_archive
+        """
+        return json.loads(zlib.decompress(archive.data))
+
+    @staticmethod
+    def restore_game(archive: GameArchive) -> Game:
+        """
+        Rebuild a game from its archive.
+
+        Returns:
+            Transient Game (never add it to a session)
+        """
+        stored = RetentionService.read_archive(archive)["game"]
+        return Game(
+            **{column: stored[column] for column in _GAME_COLUMNS + _STATE_COLUMNS},
+            status=GameStatus(stored["status"]),
+            created_at=_from_iso(stored["created_at"]),
+            updated_at=_from_iso(stored["updated_at"]),
+        )
+
+    @staticmethod
+    def archived_actions(archive: GameArchive) -> List[ArchivedAction]:
+        """An archived game's actions, in order."""
+        return [
+            ArchivedAction(
+                id=action["id"],
+                game_id=archive.game_id,
+                player_id=action["player_id"],
+                action_type=action["action_type"],
+                payload_json=action["payload_json"],
+                timestamp=_from_iso(action["timestamp"]),
+            )
+            for action in RetentionService.read_archive(archive)["actions"]
+        ]
+
+    @staticmethod
+    async def get_archive(db: AsyncSession, game_id: int) -> Optional[GameArchive]:
+        """Get a game's archive, if it has been archived and not yet purged."""
+        return await db.get(GameArchive, game_id)
+
+    @staticmethod
+    async def get_archived_game(db: AsyncSession, game_id: int) -> Optional[Game]:
+        """Get an archived game, rebuilt as a transient Game."""
+        archive = await RetentionService.get_archive(db, game_id)
+        return RetentionService.restore_game(archive) if archive else None
+
+    @staticmethod
+    async def archive_finished_games(db: AsyncSession, cutoff: datetime, limit: int) -> int:
+        """
+        Move one batch of games finished before cutoff to game_archives.
+
+        The games' started lobbies are deleted with them.
+
+        Returns:
+            Number of games archived
+        """
+        result = await db.execute(
+            select(Game.id)
+            .where(Game.status == GameStatus.FINISHED, Game.updated_at < cutoff)
+            .order_by(Game.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        game_ids = list(result.scalars().all())
+        if not game_ids:
+            return 0
+
+        games = (await db.execute(select(Game).where(Game.id.in_(game_ids)))).scalars().all()
+        actions = (
+            await db.execute(
+                select(GameAction)
+                .where(GameAction.game_id.in_(game_ids))
+                .order_by(GameAction.game_id, GameAction.id)
+            )
+        ).scalars().all()
+        by_game: Dict[int, List[GameAction]] = {}
+        for action in actions:
+            by_game.setdefault(action.game_id, []).append(action)
+
+        db.add_all(RetentionService.build_archive(g, by_game.get(g.id, [])) for g in games)
+        await db.flush()
+
+        lobby_ids = [g.lobby_id for g in games if g.lobby_id is not None]
+        # lobbies.game_id and games.lobby_id point at each other
+        await db.execute(
+            update(Lobby).where(Lobby.game_id.in_(game_ids)).values(game_id=None)
+        )
+        await db.execute(delete(GameAction).where(GameAction.game_id.in_(game_ids)))
+        await db.execute(delete(Game).where(Game.id.in_(game_ids)))
+        if lobby_ids:
+            await db.execute(delete(LobbyPlayer).where(LobbyPlayer.lobby_id.in_(lobby_ids)))
+            await db.execute(delete(Lobby).where(Lobby.id.in_(lobby_ids)))
+        db.expunge_all()
+        return len(game_ids)
+
+    @staticmethod
+    async def purge_archives(db: AsyncSession, cutoff: datetime, limit: int) -> int:
+        """
+        Delete one batch of archives of games finished before cutoff.
+
+        Returns:
+            Number of archives deleted
+        """
+        result = await db.execute(
+            select(GameArchive.game_id)
+            .where(GameArchive.finished_at < cutoff)
+            .order_by(GameArchive.game_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        game_ids = list(result.scalars().all())
+        if game_ids:
+            await db.execute(delete(GameArchive).where(GameArchive.game_id.in_(game_ids)))
+        return len(game_ids)
+
+    @staticmethod
+    async def purge_abandoned_lobbies(db: AsyncSession, cutoff: datetime, limit: int) -> int:
+        """
+        Delete one batch of waiting lobbies created before cutoff that
+        nobody has joined since.
+
+        Returns:
+            Number of lobbies deleted
+        """
+        recent_join = exists().where(
+            LobbyPlayer.lobby_id == Lobby.id,
+            LobbyPlayer.joined_at >= cutoff,
+        )
+        result = await db.execute(
+            select(Lobby.id)
+            .where(
+                Lobby.status == LobbyStatus.WAITING,
+                Lobby.game_id.is_(None),
+                Lobby.created_at < cutoff,
+                ~recent_join,
+            )
+            .order_by(Lobby.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        lobby_ids = list(result.scalars().all())
+        if not lobby_ids:
+            return 0
+
+        await db.execute(delete(LobbyPlayer).where(LobbyPlayer.lobby_id.in_(lobby_ids)))
+        await db.execute(delete(Lobby).where(Lobby.id.in_(lobby_ids)))
+        # Bulk deletes skip the flush hook; drop cached pages and unlist
+        mark_lobbies_changed(db, lobby_ids)
+        return len(lobby_ids)
+
+
+class RetentionJob:
+    """
+    Runs the retention steps every interval in the background.
+
+    Each step repeats its batch, one transaction per batch with a short
+    pause in between, until nothing is left or max_batches is reached;
+    the rest waits for the next run.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.RETENTION_INTERVAL_SECONDS,
+        policy: Optional[RetentionPolicy] = None,
+        session_factory: Callable[[], AbstractAsyncContextManager[AsyncSession]] = session_scope,
+    ):
+        self.interval = interval
+        self.policy = policy or RetentionPolicy()
+        self._session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the background loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def shutdown(self) -> None:
+        """Stop the background loop."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Retention run failed: {e!r}")
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        One pass of every retention step.
+
+        Args:
+            now: Time the ages are measured from (defaults to now)
+
+        Returns:
+            Rows handled per step
+        """
+        now = now or datetime.now(timezone.utc)
+        policy = self.policy
+        steps = (
+            ("archived_games", RetentionService.archive_finished_games, now - policy.archive_after),
+            ("purged_archives", RetentionService.purge_archives, now - policy.retain_for),
+            ("purged_lobbies", RetentionService.purge_abandoned_lobbies, now - policy.lobby_abandoned_after),
+        )
+
+        counts = {}
+        for kind, step, cutoff in steps:
+            counts[kind] = await self._run_batches(step, cutoff)
+            retention_rows_total.inc(kind, amount=counts[kind])
+
+        if any(counts.values()):
+            logger.info(f"Retention run: {counts}")
+        return counts
+
+    async def _run_batches(self, step, cutoff: datetime) -> int:
+        total = 0
+        for batch in range(self.policy.max_batches):
+            if batch and self.policy.batch_pause:
+                # Let the hot-path transactions in between batches
+                await asyncio.sleep(self.policy.batch_pause)
+            async with self._session_factory() as db:
+                done = await step(db, cutoff, self.policy.batch_size)
+            total += done
+            if done < self.policy.batch_size:
+                break
+        return total
+
+
+# Global retention job instance
+retention_job = RetentionJob()
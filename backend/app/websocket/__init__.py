@@ -1,6 +1,8 @@
 # WebSocket module
 from app.websocket.game_manager import game_manager, GameConnectionManager, GameMessage, MessageType
 from app.websocket.game_handler import router as game_ws_router
+from app.websocket.lobby_manager import lobby_manager, LobbyChannelManager
+from app.websocket.lobby_handler import router as lobby_ws_router
 
 __all__ = [
     "game_manager",
@@ -8,4 +10,7 @@ __all__ = [
     "GameMessage",
     "MessageType",
     "game_ws_router",
+    "lobby_manager",
+    "LobbyChannelManager",
+    "lobby_ws_router",
 ]
@@ -0,0 +1,258 @@
+"""
+WebSocket Backplane
+
+Pub/sub fan-out of game room events between server processes.
+
+Each process delivers to its own sockets directly and publishes the event
+on the game's channel; every other process subscribed to that game (i.e.
+with members of the room connected to it) delivers it to its sockets.
+Envelopes are JSON objects tagged with the publishing process, so a
+process ignores its own events coming back.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Called with each envelope published by another process
+EnvelopeHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class Backplane(ABC):
+    """Channel per game room, shared by all server processes."""
+
+    def __init__(self):
+        self._handler: Optional[EnvelopeHandler] = None
+        # Games with members connected to this process
+        self._wanted: Set[int] = set()
+
+    async def start(self, handler: EnvelopeHandler) -> None:
+        """
+        Start receiving events.
+
+        Args:
+            handler: Coroutine called with each received envelope
+        """
+        self._handler = handler
+
+    async def close(self) -> None:
+        """Stop receiving events and release resources."""
+        self._handler = None
+
+    def subscribe(self, game_id: int) -> None:
+        """Receive events for a game (takes effect shortly)."""
+        self._wanted.add(game_id)
+
+    def unsubscribe(self, game_id: int) -> None:
+        """Stop receiving events for a game (takes effect shortly)."""
+        self._wanted.discard(game_id)
+
+    def is_subscribed(self, game_id: int) -> bool:
+        """Check whether this process wants a game's events."""
+        return game_id in self._wanted
+
+    @property
+    def has_peers(self) -> bool:
+        """Whether other processes may receive what is published"""
+        return True
+
+    @abstractmethod
+    async def publish(self, game_id: int, envelope: Dict[str, Any]) -> None:
+        """
+        Publish an event to every process subscribed to a game.
+
+        Args:
+            game_id: The game room ID
+            envelope: JSON-serializable event
+        """
+
+    @staticmethod
+    def encode(envelope: Dict[str, Any]) -> str:
+        """Encode an envelope for the wire."""
+        return json.dumps(envelope, separators=(",", ":"), ensure_ascii=False)
+
+
+class InProcessHub:
+    """Shared medium for InProcessBackplanes, standing in for Redis."""
+
+    def __init__(self):
+        self.members: list["InProcessBackplane"] = []
+
+
+class InProcessBackplane(Backplane):
+    """
+    Backplane whose peers live in the same process.
+
+    Backplanes attached to the same hub behave like separate workers
+    sharing a Redis server. Publishing delivers synchronously, which keeps
+    tests deterministic; a lone backplane simply delivers to no one.
+    """
+
+    def __init__(self, hub: Optional[InProcessHub] = None):
+        super().__init__()
+        self.hub = hub or InProcessHub()
+        self.hub.members.append(self)
+
+    async def close(self) -> None:
+        await super().close()
+        if self in self.hub.members:
+            self.hub.members.remove(self)
+
+    @property
+    def has_peers(self) -> bool:
+        return len(self.hub.members) > 1
+
+    async def publish(self, game_id: int, envelope: Dict[str, Any]) -> None:
+        # Round-trip through JSON like the real transport would
+        payload = self.encode(envelope)
+        for member in list(self.hub.members):
+            if member is self or member._handler is None:
+                continue
+            if member.is_subscribed(game_id):
+                await member._handler(json.loads(payload))
+
+
+class RedisBackplane(Backplane):
+    """
+    Backplane over Redis pub/sub, one channel per game.
+
+    A single listener task reads every subscribed channel; subscription
+    changes are applied in the background and reconciled against the
+    wanted set, so a quick leave and rejoin cannot end up unsubscribed.
+    redis-py resubscribes by itself after a reconnect.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        channel_prefix: str = "hanyang:game:",
+        poll_timeout: float = 1.0,
+    ):
+        super().__init__()
+        self.url = url
+        self.channel_prefix = channel_prefix
+        self.poll_timeout = poll_timeout
+        self._redis = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed: Set[int] = set()
+        self._changed = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _channel(self, game_id: int) -> str:
+        return f"{self.channel_prefix}{game_id}"
+
+    async def start(self, handler: EnvelopeHandler) -> None:
+        from redis import asyncio as aioredis
+
+        await super().start(handler)
+        self._redis = aioredis.from_url(self.url)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._listener = asyncio.create_task(self._listen())
+        logger.info(f"Redis backplane listening on {self.channel_prefix}*")
+
+    async def close(self) -> None:
+        await super().close()
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        for task in list(self._tasks):
+            task.cancel()
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        if self._redis is not None:
+            await self._redis.aclose()
+        self._pubsub = self._redis = None
+
+    def subscribe(self, game_id: int) -> None:
+        super().subscribe(game_id)
+        self._spawn_sync(game_id)
+
+    def unsubscribe(self, game_id: int) -> None:
+        super().unsubscribe(game_id)
+        self._spawn_sync(game_id)
+
+    def _spawn_sync(self, game_id: int) -> None:
+        if self._pubsub is None:
+            return
+        task = asyncio.create_task(self._sync(game_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _sync(self, game_id: int) -> None:
+        """Bring one game's subscription in line with the wanted set."""
+        async with self._lock:
+            try:
+                if game_id in self._wanted and game_id not in self._subscribed:
+                    await self._pubsub.subscribe(self._channel(game_id))
+                    self._subscribed.add(game_id)
+                    self._changed.set()
+                elif game_id not in self._wanted and game_id in self._subscribed:
+                    await self._pubsub.unsubscribe(self._channel(game_id))
+                    self._subscribed.discard(game_id)
+            except Exception as e:
+                logger.warning(f"Backplane subscription change for game {game_id} failed: {e!r}")
+
+    async def publish(self, game_id: int, envelope: Dict[str, Any]) -> None:
+        if self._redis is None:
+            return
+        await self._redis.publish(self._channel(game_id), self.encode(envelope))
+
+    async def _listen(self) -> None:
+        while True:
+            if not self._subscribed:
+                # Nothing to read yet; wait for the first subscription
+                self._changed.clear()
+                await self._changed.wait()
+                continue
+
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=self.poll_timeout
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Backplane read failed: {e!r}")
+                await asyncio.sleep(self.poll_timeout)
+                continue
+
+            if message is None or message.get("type") != "message":
+                continue
+
+            try:
+                envelope = json.loads(message["data"])
+                if self._handler is not None:
+                    await self._handler(envelope)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Backplane event handling failed: {e!r}")
+
+
+def create_backplane(
+    kind: str,
+    redis_url: str,
+    channel_prefix: str = "hanyang:game:",
+) -> Backplane:
+    """
+    Create the backplane selected in settings.
+
+    Args:
+        kind: "memory" for a single process, "redis" for several workers
+        redis_url: Redis server URL (used by "redis")
+        channel_prefix: Redis channel name prefix (one backplane per prefix)
+
+    Returns:
+        Backplane instance (not started)
+    """
+    if kind == "redis":
+        return RedisBackplane(redis_url, channel_prefix=channel_prefix)
+    if kind == "memory":
+        return InProcessBackplane()
+    raise ValueError(f"Unknown WebSocket backplane: {kind}")
@@ -3,7 +3,7 @@ WebSocket Broadcast Service
 
 Service layer for broadcasting game events to connected players.
 """
-from typing import Any, Dict, Optional
+from typing import Any, Dict
 import logging
 
 from app.websocket.game_manager import game_manager, GameMessage, MessageType
@@ -20,27 +20,18 @@ class GameBroadcastService:
     """
 
     @staticmethod
-    async def broadcast_game_state(
-        game: Game,
-        exclude_player_id: Optional[int] = None
-    ) -> None:
+    async def broadcast_game_state(game: Game) -> None:
         """
-        Broadcast full game state update to all players.
+        Broadcast a game state update (as a delta) to all players.
+
+        Every player receives it so that no one's version falls behind.
 
         Args:
             game: The game object
-            exclude_player_id: Optional player to exclude
         """
         game_state = GameBroadcastService._serialize_game_state(game)
 
-        await game_manager.broadcast_to_game(
-            game.id,
-            GameMessage(
-                type=MessageType.GAME_STATE_UPDATE,
-                data={"game_state": game_state}
-            ),
-            exclude_player_id=exclude_player_id
-        )
+        await game_manager.broadcast_state(game.id, game_state, game.version)
 
     @staticmethod
     async def broadcast_action_performed(
@@ -227,6 +218,7 @@ class GameBroadcastService:
             "current_round": game.current_round,
             "total_rounds": game.total_rounds,
             "current_turn_player_id": game.current_turn_player_id,
+            "version": game.version,
             "turn_order": game.turn_order,
             "board": game.board,
             "available_tiles": game.available_tiles,
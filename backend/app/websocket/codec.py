@@ -0,0 +1,110 @@
+"""
+WebSocket Frame Codecs
+
+Server-to-client frame formats, negotiated via the WebSocket subprotocol.
+
+- hanyang.json (default, also used when no subprotocol is requested):
+  text frames holding the JSON message.
+- hanyang.msgpack: binary frames. Byte 0 is a flags byte; the rest is the
+  message object encoded as MessagePack. With flag bit 0 set the body is
+  zlib-compressed (RFC 1950, "deflate" in the browser Compression Streams
+  API) before framing. Large frames are compressed, small ones are not.
+
+Every server frame, including pong and error replies, goes through the
+connection writer in the negotiated codec, so a msgpack client gets binary
+frames only. Clients always send JSON text.
+See contracts/ws-messages.ts for the client side.
+"""
+from typing import Any, Dict, Optional, Sequence, Union
+import json
+import zlib
+
+try:
+    import msgpack
+except ImportError:  # optional; without it only JSON is offered
+    msgpack = None
+
+JSON_SUBPROTOCOL = "hanyang.json"
+MSGPACK_SUBPROTOCOL = "hanyang.msgpack"
+
+# Flags byte of a binary frame
+FLAG_COMPRESSED = 0x01
+
+Frame = Union[str, bytes]
+
+
+class JsonCodec:
+    """Text frames with compact JSON"""
+    name = "json"
+    subprotocol = JSON_SUBPROTOCOL
+
+    def encode(self, message: Dict[str, Any]) -> str:
+        return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+class MsgpackCodec:
+    """Binary frames with MessagePack, zlib-compressed above a size"""
+    name = "msgpack"
+    subprotocol = MSGPACK_SUBPROTOCOL
+
+    def __init__(self, compress_min_bytes: int = 1024, compress_level: int = 6):
+        """
+        Args:
+            compress_min_bytes: Compress bodies at least this large (0 disables)
+            compress_level: zlib level, 1 (fast) to 9 (small)
+        """
+        self.compress_min_bytes = compress_min_bytes
+        self.compress_level = compress_level
+
+    def encode(self, message: Dict[str, Any]) -> bytes:
+        body = msgpack.packb(message, use_bin_type=True)
+        if self.compress_min_bytes and len(body) >= self.compress_min_bytes:
+            return bytes([FLAG_COMPRESSED]) + zlib.compress(body, self.compress_level)
+        return b"\x00" + body
+
+    @staticmethod
+    def decode(frame: bytes) -> Dict[str, Any]:
+        """Decode a frame (for tests and tooling; clients never send these)"""
+        body = frame[1:]
+        if frame[0] & FLAG_COMPRESSED:
+            body = zlib.decompress(body)
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+
+
+JSON_CODEC = JsonCodec()
+
+
+def available_codecs(compress_min_bytes: int, compress_level: int) -> Dict[str, Any]:
+    """
+    Codecs this server can speak, by subprotocol.
+
+    Args:
+        compress_min_bytes: Binary frame compression threshold
+        compress_level: Binary frame zlib level
+
+    Returns:
+        Mapping of subprotocol to codec (msgpack only if installed)
+    """
+    codecs: Dict[str, Any] = {JSON_SUBPROTOCOL: JSON_CODEC}
+    if msgpack is not None:
+        codecs[MSGPACK_SUBPROTOCOL] = MsgpackCodec(compress_min_bytes, compress_level)
+    return codecs
+
+
+def negotiate(requested: Sequence[str], codecs: Dict[str, Any]) -> tuple[Any, Optional[str]]:
+    """
+    Pick the first requested subprotocol the server supports.
+
+    Args:
+        requested: Subprotocols offered by the client, in its preference order
+        codecs: Supported codecs by subprotocol
+
+    Returns:
+        (codec, subprotocol to accept); the subprotocol is None when the
+        client offered none we know, in which case JSON is used
+    """
+    for subprotocol in requested:
+        codec = codecs.get(subprotocol)
+        if codec is not None:
+            return codec, subprotocol
+    return JSON_CODEC, None
@@ -0,0 +1,184 @@
+"""
+WebSocket Player Connection
+
+Outbound queue and writer task for a single player's WebSocket.
+"""
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Optional, Union
+from fastapi import WebSocket
+import asyncio
+import logging
+import time
+
+from app.websocket.codec import JSON_CODEC
+
+logger = logging.getLogger(__name__)
+
+# Close code sent to clients that fell too far behind; they should
+# reconnect and will receive a fresh game state on join
+RESYNC_CLOSE_CODE = 4008
+RESYNC_CLOSE_REASON = "Client too slow; reconnect to resync"
+
+# Close code sent to connections that stopped answering heartbeats
+STALE_CLOSE_CODE = 4009
+STALE_CLOSE_REASON = "No heartbeat from client"
+
+
+@dataclass
+class OutgoingMessage:
+    """An encoded message waiting to be written"""
+    # Text frame (str) or binary frame (bytes)
+    payload: Union[str, bytes]
+    coalesce_key: Optional[str] = None
+    # Original message, kept for coalescing
+    message: Any = None
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class PlayerConnection:
+    """
+    Outbound side of one player's WebSocket.
+
+    Messages are queued and written by a dedicated task, so broadcasting
+    never waits on a client. A message with a coalesce key (such as a state
+    update) supersedes any pending message with the same key, combined with
+    it by the merge callback if one is given, so a burst of updates costs a
+    lagging client only one message. The queue is bounded: once it is full,
+    or its oldest message has waited longer than max_lag seconds, enqueue
+    reports the client as too slow.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        game_id: int,
+        player_id: int,
+        max_queue: int,
+        max_lag: float,
+        send_timeout: float,
+        on_failed: Optional[Callable[["PlayerConnection"], None]] = None,
+        merge: Optional[Callable[[OutgoingMessage, OutgoingMessage], OutgoingMessage]] = None,
+        codec: Any = None,
+    ):
+        self.websocket = websocket
+        self.game_id = game_id
+        self.player_id = player_id
+        self.max_queue = max_queue
+        self.max_lag = max_lag
+        self.send_timeout = send_timeout
+        self._on_failed = on_failed
+        self._merge = merge
+        # Frame codec negotiated for this socket (see codec.py)
+        self.codec = codec or JSON_CODEC
+        self._queue: Deque[OutgoingMessage] = deque()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._writer: Optional[asyncio.Task] = None
+        self.closed = False
+        # Last time the client sent anything (monotonic)
+        self.last_seen = time.monotonic()
+
+    @property
+    def pending(self) -> int:
+        """Number of queued messages not yet written"""
+        return len(self._queue)
+
+    def touch(self) -> None:
+        """Record that the client is alive"""
+        self.last_seen = time.monotonic()
+
+    def start(self) -> None:
+        """Start the writer task"""
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+
+    def enqueue(
+        self,
+        payload: Union[str, bytes],
+        coalesce_key: Optional[str] = None,
+        message: Any = None,
+    ) -> bool:
+        """
+        Queue an encoded message for delivery.
+
+        Args:
+            payload: Encoded frame
+            coalesce_key: Messages sharing this key supersede each other
+            message: Original message, passed to the merge callback
+
+        Returns:
+            False if the client is too far behind and should be dropped
+        """
+        if self.closed:
+            return False
+
+        outgoing = OutgoingMessage(payload, coalesce_key, message)
+
+        if coalesce_key is not None:
+            # Drop the superseded message; the new one goes to the back so
+            # it still follows any actions queued after the old one
+            for queued in self._queue:
+                if queued.coalesce_key == coalesce_key:
+                    self._queue.remove(queued)
+                    if self._merge is not None:
+                        outgoing = self._merge(queued, outgoing)
+                    break
+
+        if len(self._queue) >= self.max_queue:
+            return False
+        if self._queue and time.monotonic() - self._queue[0].queued_at > self.max_lag:
+            return False
+
+        self._queue.append(outgoing)
+        self._idle.clear()
+        self._wakeup.set()
+        return True
+
+    async def flush(self) -> None:
+        """Wait until every queued message has been written (or dropped)"""
+        await self._idle.wait()
+
+    def stop(self) -> None:
+        """Stop writing and discard pending messages"""
+        self.closed = True
+        self._queue.clear()
+        self._idle.set()
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        """Stop writing and close the socket, ignoring errors"""
+        self.stop()
+        try:
+            await asyncio.wait_for(
+                self.websocket.close(code=code, reason=reason),
+                timeout=self.send_timeout,
+            )
+        except Exception as e:
+            logger.debug(f"Close for player {self.player_id} failed: {e!r}")
+
+    async def _write_loop(self) -> None:
+        while not self.closed:
+            if not self._queue:
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            message = self._queue.popleft()
+            try:
+                if isinstance(message.payload, bytes):
+                    send = self.websocket.send_bytes(message.payload)
+                else:
+                    send = self.websocket.send_text(message.payload)
+                await asyncio.wait_for(send, timeout=self.send_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to send to player {self.player_id}: {e!r}")
+                self.stop()
+                if self._on_failed is not None:
+                    self._on_failed(self)
+                return
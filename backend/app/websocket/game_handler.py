@@ -3,23 +3,64 @@ WebSocket Game Handler
 
 Handles WebSocket connections and messages for game synchronization.
 """
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query, HTTPException
+from dataclasses import dataclass
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import Any, Dict, Optional
 import json
 import logging
+import time
 
-from app.core.database import get_db
+from pydantic import ValidationError
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import session_scope
+from app.core.db_metrics import track_queries
+from app.core.request_metrics import record_action
 from app.core.security import decode_token
 from app.models.game import Game
-from app.models.lobby import LobbyPlayer
 from app.models.user import User
+from app.schemas.game import ActionType, GameActionRequest
+from app.services.game_service import GameService
 from app.websocket.game_manager import game_manager, GameMessage, MessageType
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Game actions a client may send over the socket
+WS_ACTION_TYPES = {
+    ActionType.PLACE_WORKER.value,
+    ActionType.PLACE_TILE.value,
+    ActionType.SELECT_BLUEPRINT.value,
+    ActionType.END_TURN.value,
+}
+
+
+@dataclass(frozen=True)
+class GameMembership:
+    """A user's seat in a game, as checked at the WebSocket handshake"""
+    user_id: int
+    username: str
+    player_id: int
+
+
+class HandshakeRejected(Exception):
+    """Raised when a WebSocket connection may not join a game"""
+
+    def __init__(self, code: int, reason: str):
+        super().__init__(reason)
+        self.code = code
+        self.reason = reason
+
+
+# (game_id, user_id) -> GameMembership. A game's players are fixed once it
+# starts, so reconnects can skip the database until the entry expires.
+membership_cache: TTLCache[GameMembership] = TTLCache(
+    settings.WS_MEMBERSHIP_CACHE_TTL_SECONDS, maxsize=4096
+)
+
 
 async def get_current_user_ws(
     token: str,
@@ -55,33 +96,158 @@ async def validate_game_player(
     game_id: int,
     user_id: int,
     db: AsyncSession
-) -> Optional[LobbyPlayer]:
+) -> Optional[dict]:
     """
     Validate that user is a player in the game.
 
+    Membership is read from the game's player states so solo games
+    (which have no lobby) are covered as well.
+
     Args:
         game_id: Game ID
         user_id: User ID
         db: Database session
 
     Returns:
-        LobbyPlayer if valid, None otherwise
+        Player state if valid, None otherwise
     """
-    from sqlalchemy import select
-
-    # First get the game to find its lobby_id
     game = await db.get(Game, game_id)
     if not game:
         return None
 
-    # Find the player in the lobby
-    result = await db.execute(
-        select(LobbyPlayer).where(
-            LobbyPlayer.lobby_id == game.lobby_id,
-            LobbyPlayer.user_id == user_id
+    return GameService.get_player_state(game, user_id)
+
+
+def token_user_id(token: str) -> Optional[int]:
+    """Get the user ID from a valid access token without touching the database."""
+    try:
+        payload = decode_token(token)
+        if not payload or not payload.get("sub"):
+            return None
+        return int(payload["sub"])
+    except Exception as e:
+        logger.warning(f"WebSocket auth failed: {e}")
+        return None
+
+
+async def authorize_game_player(token: str, game_id: int) -> GameMembership:
+    """
+    Check that a token's user may join a game's socket.
+
+    The token is always verified; the user and membership lookups are
+    cached, and on a miss run on a short-lived session that is released
+    before this returns, so an open socket never pins a pooled connection.
+
+    Args:
+        token: JWT access token
+        game_id: Game ID
+
+    Returns:
+        The user's membership in the game
+
+    Raises:
+        HandshakeRejected: If the token is invalid or the user is not a player
+    """
+    user_id = token_user_id(token)
+    if user_id is None:
+        raise HandshakeRejected(4001, "Authentication failed")
+
+    key = (game_id, user_id)
+    membership = membership_cache.get(key)
+    if membership is not None:
+        return membership
+
+    async with session_scope() as db:
+        user = await get_current_user_ws(token, db)
+        if not user:
+            raise HandshakeRejected(4001, "Authentication failed")
+        game_player = await validate_game_player(game_id, user.id, db)
+        if not game_player:
+            raise HandshakeRejected(4003, "Not a player in this game")
+        membership = GameMembership(user.id, user.username, game_player["id"])
+
+    membership_cache.set(key, membership)
+    return membership
+
+
+async def send_snapshot(game_id: int, player_id: int) -> None:
+    """
+    Send the current game state to one player as a full snapshot.
+
+    A fresh session is used so the state is never older than the database,
+    even on a long-lived connection.
+
+    Args:
+        game_id: Game ID
+        player_id: Target player ID
+    """
+    async with session_scope() as db:
+        game = await GameService.get_game(db, game_id)
+        if not game:
+            return
+        game_state = GameService.to_game_state_response(game)
+        version = game.version
+
+    await game_manager.send_state_snapshot(game_id, player_id, game_state, version)
+
+
+async def handle_action(
+    game_id: int,
+    user_id: int,
+    player_id: int,
+    message: Dict[str, Any],
+) -> None:
+    """
+    Perform a game action sent over the socket and reply with ACTION_RESULT.
+
+    The identity from the handshake is reused; each action runs in its own
+    short session with the same service logic as the REST endpoint.
+
+    Args:
+        game_id: Game ID
+        user_id: Authenticated user ID
+        player_id: The user's player ID in the game
+        message: Client message ({"type", "request_id", "data"})
+    """
+    # Deferred: ai_scheduler imports the websocket package
+    from app.services.action_service import GameActionService
+
+    started = time.perf_counter()
+    action_type = message["type"]
+    reply = {"request_id": message.get("request_id"), "action_type": action_type}
+
+    try:
+        request = GameActionRequest.model_validate({
+            "action_type": action_type,
+            "payload": {**(message.get("data") or {}), "type": action_type},
+        })
+    except ValidationError as e:
+        reply.update(success=False, error=f"Invalid payload: {e.errors()[0]['msg']}")
+        record_action("ws", action_type, time.perf_counter() - started, ok=False)
+        await game_manager.send_to_player(
+            game_id, player_id, GameMessage(type=MessageType.ACTION_RESULT, data=reply)
         )
+        return
+
+    game = None
+    try:
+        async with session_scope() as db:
+            game = await GameService.get_game(db, game_id)
+            player = GameActionService.find_player(game, user_id) if game else None
+            if not player:
+                raise ValueError("You are not in this game")
+            result = await GameActionService.perform(db, game, player, request)
+    except ValueError as e:
+        reply.update(success=False, error=str(e))
+    else:
+        # Committed; announce first so the new state precedes the result
+        await GameActionService.announce(game, player)
+        reply.update(success=True, result=result, version=game.version)
+
+    record_action("ws", action_type, time.perf_counter() - started, ok=reply["success"])
+    await game_manager.send_to_player(
+        game_id, player_id, GameMessage(type=MessageType.ACTION_RESULT, data=reply)
     )
-    return result.scalar_one_or_none()
 
 
 @router.websocket("/ws/game/{game_id}")
@@ -89,99 +255,145 @@ async def game_websocket(
     websocket: WebSocket,
     game_id: int,
     token: str = Query(...),
-    db: AsyncSession = Depends(get_db)
+    last_seq: Optional[int] = Query(None),
+    stream: Optional[str] = Query(None),
 ):
     """
     WebSocket endpoint for game synchronization.
 
     Connect with: ws://host/ws/game/{game_id}?token={jwt_token}
 
+    To reconnect, add &last_seq={seq}&stream={stream} using the last seq
+    received and the stream of the last snapshot; the messages missed in
+    between are replayed, or a snapshot is sent if they are gone.
+
+    Frames are JSON text unless the client offers the "hanyang.msgpack"
+    subprotocol, in which case room messages arrive as binary MessagePack
+    frames (see app/websocket/codec.py). Clients always send JSON text.
+
     Message format:
     {
         "type": "message_type",
-        "data": { ... }
+        "data": { ... },
+        "seq": 12        (room broadcasts and snapshots only)
     }
 
     Supported client messages:
     - ping: Keep-alive ping
-    - action: Game action (handled via REST API, this is for future use)
+    - pong: Answer to a server heartbeat ping
+    - resync: Request a full state snapshot (after a version gap)
+    - place_worker, place_tile, select_blueprint, end_turn: Game action
+      with the REST payload as data and an optional request_id, answered
+      with action_result carrying the same request_id
 
     Server broadcasts:
-    - game_state_update: Full game state update
+    - game_state_update: Versioned state; a full snapshot on join and
+      resync, otherwise a JSON Patch of the public view against base_version
+    - private_state: This player's private fields (blueprint hands),
+      sent when they change
     - turn_changed: Turn has changed to another player
     - your_turn: It's now your turn
     - player_action: Another player performed an action
+    - player_joined / player_reconnected: Another player (re)connected
+    - action_result: Outcome of an action sent over this socket
     - game_ended: Game has ended
+
+    Close codes:
+    - 4001: Authentication failed
+    - 4003: Not a player in this game
+    - 4008: Client fell too far behind; reconnect to resync
+    - 4009: No heartbeat from client (server pings quiet clients)
     """
-    # Authenticate user
-    user = await get_current_user_ws(token, db)
-    if not user:
-        await websocket.close(code=4001, reason="Authentication failed")
+    # Authenticate user and validate player is in game
+    try:
+        with track_queries("ws", "connect"):
+            membership = await authorize_game_player(token, game_id)
+    except HandshakeRejected as e:
+        await websocket.close(code=e.code, reason=e.reason)
         return
+    player_id = membership.player_id
 
-    # Validate player is in game
-    game_player = await validate_game_player(game_id, user.id, db)
-    if not game_player:
-        await websocket.close(code=4003, reason="Not a player in this game")
-        return
+    # Connect to game room and bring the client up to date
+    codec, subprotocol = game_manager.negotiate(websocket.scope.get("subprotocols") or [])
+    replayed = await game_manager.connect(
+        websocket, game_id, player_id, last_seq, stream, codec=codec, subprotocol=subprotocol
+    )
+    # Replay only covers room broadcasts; private fields are resent
+    if not replayed or not game_manager.resend_private_state(game_id, player_id):
+        await send_snapshot(game_id, player_id)
 
-    # Connect to game room
-    await game_manager.connect(websocket, game_id, game_player.id)
+    # Resume server-driven AI turns (e.g. after a restart mid-turn)
+    from app.services.ai_scheduler import ai_scheduler
+    ai_scheduler.schedule(game_id)
 
     # Notify other players
     await game_manager.broadcast_to_game(
         game_id,
         GameMessage(
-            type=MessageType.PLAYER_JOINED,
+            type=MessageType.PLAYER_RECONNECTED if last_seq is not None else MessageType.PLAYER_JOINED,
             data={
-                "player_id": game_player.id,
-                "username": user.username
+                "player_id": player_id,
+                "username": membership.username
             }
         ),
-        exclude_player_id=game_player.id
+        exclude_player_id=player_id
     )
 
     try:
         while True:
-            # Receive message
+            # Receive message; anything from the client proves it is alive
             data = await websocket.receive_text()
+            game_manager.touch(websocket)
 
             try:
                 message = json.loads(data)
                 msg_type = message.get("type", "")
 
-                # Handle ping
-                if msg_type == "ping":
-                    await websocket.send_json(
-                        GameMessage(type=MessageType.PONG, data={}).to_dict()
+                # Answer to a server heartbeat; touch above is all it needs
+                if msg_type == MessageType.PONG.value:
+                    pass
+
+                # Handle ping; replies go through the connection's queue
+                # like every other frame, in its negotiated codec
+                elif msg_type == "ping":
+                    await game_manager.send_to_player(
+                        game_id, player_id, GameMessage(type=MessageType.PONG, data={})
                     )
 
-                # Other message types can be handled here
-                # For now, game actions go through REST API
+                # Client missed an update; send the full state
+                elif msg_type == MessageType.RESYNC.value:
+                    with track_queries("ws", msg_type):
+                        await send_snapshot(game_id, player_id)
+
+                elif msg_type in WS_ACTION_TYPES:
+                    with track_queries("ws", msg_type):
+                        await handle_action(game_id, membership.user_id, player_id, message)
 
             except json.JSONDecodeError:
-                await websocket.send_json(
+                await game_manager.send_to_player(
+                    game_id,
+                    player_id,
                     GameMessage(
                         type=MessageType.ERROR,
                         data={"message": "Invalid JSON"}
-                    ).to_dict()
+                    ),
                 )
 
     except WebSocketDisconnect:
-        logger.info(f"Player {game_player.id} disconnected from game {game_id}")
+        logger.info(f"Player {player_id} disconnected from game {game_id}")
     except Exception as e:
-        logger.error(f"WebSocket error for player {game_player.id}: {e}")
+        logger.error(f"WebSocket error for player {player_id}: {e}")
     finally:
         # Disconnect and notify others
-        game_manager.disconnect(game_id, game_player.id)
+        game_manager.disconnect(game_id, player_id, websocket)
 
         await game_manager.broadcast_to_game(
             game_id,
             GameMessage(
                 type=MessageType.PLAYER_LEFT,
                 data={
-                    "player_id": game_player.id,
-                    "username": user.username
+                    "player_id": player_id,
+                    "username": membership.username
                 }
             )
         )
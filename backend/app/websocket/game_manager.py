@@ -3,19 +3,62 @@ WebSocket Game Connection Manager
 
 Manages real-time WebSocket connections for game synchronization.
 """
+from contextlib import contextmanager
 from enum import Enum
-from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Any, Optional
+from dataclasses import dataclass, field, asdict, replace
+from functools import partial
+from typing import Dict, Iterator, List, Any, Optional, Sequence, Tuple
 from fastapi import WebSocket
+import asyncio
 import logging
+import time
+import uuid
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.services.projection_service import StateProjectionService
+from app.websocket.backplane import Backplane, InProcessBackplane, create_backplane
+from app.websocket.codec import JSON_CODEC, Frame, available_codecs, negotiate
+from app.websocket.connection import (
+    OutgoingMessage,
+    PlayerConnection,
+    RESYNC_CLOSE_CODE,
+    RESYNC_CLOSE_REASON,
+    STALE_CLOSE_CODE,
+    STALE_CLOSE_REASON,
+)
+from app.websocket.replay import ReplayBuffer
+from app.websocket.state_sync import (
+    GameStateTracker,
+    VersionWatch,
+    merge_state_updates,
+    snapshot_data,
+)
 
 logger = logging.getLogger(__name__)
 
+RECIPIENT_BUCKETS = (1, 2, 3, 4, 6, 8, 16)
+
+# Labelled by what was sent, not by game, so series stay few
+fanout_seconds = registry.histogram(
+    "ws_broadcast_fanout_seconds",
+    "Time to encode and queue a game broadcast for this process's sockets",
+    ("kind",),
+)
+fanout_recipients = registry.histogram(
+    "ws_broadcast_recipients", "Local sockets a game broadcast was queued for",
+    ("kind",), buckets=RECIPIENT_BUCKETS,
+)
+ws_connections = registry.gauge("ws_connections", "Open WebSocket connections", ("channel",))
+ws_rooms = registry.gauge("ws_rooms", "Games or lobby channels with local sockets", ("channel",))
+
 
 class MessageType(str, Enum):
     """WebSocket message types"""
     # Game state
     GAME_STATE_UPDATE = "game_state_update"
+    # Private fields of the receiving seat (blueprint hands)
+    PRIVATE_STATE = "private_state"
     VALID_ACTIONS_UPDATE = "valid_actions_update"
 
     # Turn management
@@ -41,6 +84,14 @@ class MessageType(str, Enum):
     PING = "ping"
     PONG = "pong"
 
+    # Client asks for a full state snapshot after a version gap
+    RESYNC = "resync"
+
+    # Lobby channels (see lobby_manager)
+    LOBBY_STATE = "lobby_state"
+    LOBBY_LISTED = "lobby_listed"
+    LOBBY_UNLISTED = "lobby_unlisted"
+
 
 @dataclass
 class GameMessage:
@@ -48,6 +99,11 @@ class GameMessage:
     type: MessageType
     data: Dict[str, Any] = field(default_factory=dict)
     timestamp: Optional[str] = None
+    # Room sequence number: set on broadcasts, and on snapshots to the
+    # sequence they bring the client up to
+    seq: Optional[int] = None
+    # Process the sequence belongs to (sent with snapshots)
+    stream: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -57,8 +113,16 @@ class GameMessage:
         }
         if self.timestamp:
             result["timestamp"] = self.timestamp
+        if self.seq is not None:
+            result["seq"] = self.seq
+        if self.stream is not None:
+            result["stream"] = self.stream
         return result
 
+    def encode(self, codec=JSON_CODEC) -> Frame:
+        """Encode to a frame (JSON text by default, as send_json would)"""
+        return codec.encode(self.to_dict())
+
 
 class GameConnectionManager:
     """
@@ -66,13 +130,194 @@ class GameConnectionManager:
 
     Each game has its own room with multiple player connections.
     Supports broadcasting to all players or specific players.
+
+    Messages are encoded once per frame codec (JSON text, or MessagePack
+    for clients that negotiated it) and handed to each player's PlayerConnection,
+    whose writer task delivers them with a send timeout, so a slow client
+    never delays the others. Game state goes out as versioned deltas
+    (see state_sync); pending updates are merged per player, and clients
+    whose queue stays behind are closed with a resync hint.
+    Removals only drop the exact socket that failed, so a player who
+    reconnects meanwhile keeps the new connection.
+
+    Every event is also published on the backplane so that other server
+    processes deliver it to the members of the room connected to them.
+    State updates travel as full states; each process diffs them against
+    its own tracker.
+
+    Room broadcasts are numbered and kept in a per-game ReplayBuffer, so a
+    client reconnecting with its last seq only receives what it missed.
+    A room is kept for a while after its last player leaves, so a network
+    blip that drops every socket at once can still be replayed.
+
+    One sweeper task pings clients that have gone quiet, closes those not
+    heard from for stale_after seconds (half-open TCP connections would
+    otherwise linger until a send failed) and expires retained rooms.
+
+    Long-poll requests (GET /games/{id}/changes) park on a VersionWatch,
+    which every state broadcast, local or from the backplane, wakes with
+    the new state. A watched game stays subscribed on the backplane even
+    without sockets.
     """
 
-    def __init__(self):
+    # Message types where only the latest pending one matters
+    COALESCED_TYPES = {
+        MessageType.GAME_STATE_UPDATE,
+        MessageType.PRIVATE_STATE,
+        MessageType.VALID_ACTIONS_UPDATE,
+    }
+
+    def __init__(
+        self,
+        send_timeout: float = settings.WS_SEND_TIMEOUT_SECONDS,
+        max_queue: int = settings.WS_SEND_QUEUE_SIZE,
+        max_lag: float = settings.WS_MAX_LAG_SECONDS,
+        backplane: Optional[Backplane] = None,
+        replay_size: int = settings.WS_REPLAY_BUFFER_SIZE,
+        replay_retention: float = settings.WS_REPLAY_RETENTION_SECONDS,
+        heartbeat_interval: float = settings.WS_HEARTBEAT_INTERVAL_SECONDS,
+        stale_after: float = settings.WS_STALE_AFTER_SECONDS,
+        compress_min_bytes: int = settings.WS_COMPRESS_MIN_BYTES,
+        compress_level: int = settings.WS_COMPRESS_LEVEL,
+    ):
         # game_id -> {player_id -> WebSocket}
         self.active_connections: Dict[int, Dict[int, WebSocket]] = {}
+        # id(websocket) -> outbound queue and writer
+        self._outboxes: Dict[int, PlayerConnection] = {}
+        self._closing: set[asyncio.Task] = set()
+        self.state_tracker = GameStateTracker()
+        # game_id -> recent broadcasts; outlives the room by replay_retention
+        self._replay: Dict[int, ReplayBuffer] = {}
+        # game_id -> monotonic time an empty room's state is dropped
+        self._expiry: Dict[int, float] = {}
+        # game_id -> parked long-poll requests
+        self._watches: Dict[int, set[VersionWatch]] = {}
+        self.replay_size = replay_size
+        self.replay_retention = replay_retention
+        self.send_timeout = send_timeout
+        self.max_queue = max_queue
+        self.max_lag = max_lag
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self._heartbeat = GameMessage(type=MessageType.PING)
+        # codec name -> encoded heartbeat
+        self._heartbeat_frames: Dict[str, Frame] = {}
+        # subprotocol -> frame codec
+        self.codecs = available_codecs(compress_min_bytes, compress_level)
+        self._sweeper: Optional[asyncio.Task] = None
+        self.stats = {"sweeps": 0, "reaped": 0, "evicted": 0, "rooms_expired": 0}
+        self.backplane = backplane or InProcessBackplane()
+        # Tags published events so our own are ignored when they come back;
+        # also names this process's sequence stream
+        self.instance_id = uuid.uuid4().hex[:12]
+
+    async def start(self) -> None:
+        """Start the sweeper and receive events from other processes."""
+        await self.backplane.start(self._on_backplane_event)
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def shutdown(self) -> None:
+        """Stop the sweeper and the backplane."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        await self.backplane.close()
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"WebSocket sweep failed: {e!r}")
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        One heartbeat pass over every connection and retained room.
 
-    async def connect(self, websocket: WebSocket, game_id: int, player_id: int) -> None:
+        Args:
+            now: Monotonic time to sweep at (defaults to now)
+
+        Returns:
+            Number of stale connections closed
+        """
+        now = time.monotonic() if now is None else now
+        reaped = 0
+
+        # Rooms emptied by this sweep start their retention afterwards
+        for game_id, deadline in list(self._expiry.items()):
+            if now >= deadline:
+                self._expire_room(game_id)
+
+        for outbox in list(self._outboxes.values()):
+            quiet = now - outbox.last_seen
+            if quiet > self.stale_after:
+                logger.info(
+                    f"Player {outbox.player_id} in game {outbox.game_id} silent "
+                    f"for {quiet:.0f}s; closing"
+                )
+                self._close_outbox(outbox, STALE_CLOSE_CODE, STALE_CLOSE_REASON)
+                reaped += 1
+            elif quiet >= self.heartbeat_interval:
+                # Any reply (normally pong) refreshes last_seen
+                self._enqueue(outbox.websocket, self._heartbeat, self._heartbeat_frames)
+
+        self.stats["sweeps"] += 1
+        self.stats["reaped"] += reaped
+        return reaped
+
+    def touch(self, websocket: WebSocket) -> None:
+        """
+        Record that a client sent something.
+
+        Args:
+            websocket: The client's WebSocket connection
+        """
+        outbox = self._outboxes.get(id(websocket))
+        if outbox is not None:
+            outbox.touch()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get live connection and sweep counts.
+
+        Returns:
+            Counts of connections, rooms, retained rooms, queued messages,
+            and totals of sweeps, reaped, evicted and expired rooms
+        """
+        return {
+            "connections": len(self._outboxes),
+            "rooms": len(self.active_connections),
+            "retained_rooms": len(self._expiry),
+            "pending_messages": sum(o.pending for o in self._outboxes.values()),
+            "long_poll_waiters": sum(len(w) for w in self._watches.values()),
+            **self.stats,
+        }
+
+    def negotiate(self, requested: Sequence[str]) -> Tuple[Any, Optional[str]]:
+        """
+        Choose the frame codec for a client's offered subprotocols.
+
+        Args:
+            requested: Subprotocols from the handshake, in client order
+
+        Returns:
+            (codec, subprotocol to accept, or None)
+        """
+        return negotiate(requested, self.codecs)
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        game_id: int,
+        player_id: int,
+        last_seq: Optional[int] = None,
+        stream: Optional[str] = None,
+        codec: Any = None,
+        subprotocol: Optional[str] = None,
+    ) -> bool:
         """
         Accept and register a new WebSocket connection.
 
@@ -80,32 +325,333 @@ class GameConnectionManager:
             websocket: The WebSocket connection
             game_id: The game room ID
             player_id: The player ID
+            last_seq: Last sequence number a reconnecting client received
+            stream: Stream that last_seq belongs to
+            codec: Frame codec from negotiate (JSON if not given)
+            subprotocol: Subprotocol to accept, from negotiate
+
+        Returns:
+            True if the messages missed since last_seq were replayed;
+            False if the client needs a snapshot
         """
-        await websocket.accept()
+        if subprotocol is not None:
+            await websocket.accept(subprotocol=subprotocol)
+        else:
+            await websocket.accept()
+
+        self._expiry.pop(game_id, None)
+        if game_id not in self._replay:
+            self.backplane.subscribe(game_id)
+            self._replay[game_id] = ReplayBuffer(self.replay_size)
+
+        # A newer connection replaces an older one for the same player
+        room = self.active_connections.setdefault(game_id, {})
+        previous = room.get(player_id)
+        if previous is not None and previous is not websocket:
+            self._drop_outbox(previous)
+
+        room[player_id] = websocket
+        outbox = PlayerConnection(
+            websocket,
+            game_id,
+            player_id,
+            max_queue=self.max_queue,
+            max_lag=self.max_lag,
+            send_timeout=self.send_timeout,
+            on_failed=self._on_send_failed,
+            merge=partial(self._merge_outgoing, codec=codec or JSON_CODEC),
+            codec=codec or JSON_CODEC,
+        )
+        self._outboxes[id(websocket)] = outbox
+        outbox.start()
+        logger.info(f"Player {player_id} connected to game {game_id}")
 
-        if game_id not in self.active_connections:
-            self.active_connections[game_id] = {}
+        # Replay before any await so no live message can slip in between
+        return self._replay_missed(game_id, player_id, last_seq, stream)
 
-        self.active_connections[game_id][player_id] = websocket
-        logger.info(f"Player {player_id} connected to game {game_id}")
+    def _replay_missed(
+        self,
+        game_id: int,
+        player_id: int,
+        last_seq: Optional[int],
+        stream: Optional[str],
+    ) -> bool:
+        if last_seq is None or stream != self.instance_id:
+            return False
+
+        entries = self._replay[game_id].since(last_seq)
+        # More than the queue holds is cheaper to send as a snapshot
+        if entries is None or len(entries) > self.max_queue:
+            return False
+
+        websocket = self.active_connections[game_id][player_id]
+        for entry in entries:
+            if entry.exclude_player_id == player_id:
+                continue
+            if not self._enqueue(websocket, entry.message):
+                return False
+
+        logger.info(f"Replayed {len(entries)} messages to player {player_id} in game {game_id}")
+        return True
 
-    def disconnect(self, game_id: int, player_id: int) -> None:
+    def disconnect(
+        self,
+        game_id: int,
+        player_id: int,
+        websocket: Optional[WebSocket] = None
+    ) -> None:
         """
         Remove a WebSocket connection.
 
         Args:
             game_id: The game room ID
             player_id: The player ID
+            websocket: Only remove if this is still the player's connection
         """
+        room = self.active_connections.get(game_id)
+        if room is None:
+            return
+
+        current = room.get(player_id)
+        if current is not None and (websocket is None or current is websocket):
+            del room[player_id]
+            self._drop_outbox(current)
+            logger.info(f"Player {player_id} disconnected from game {game_id}")
+
+        # Clean up empty game rooms, keeping replay state for a while
+        if not room and self.active_connections.get(game_id) is room:
+            del self.active_connections[game_id]
+            if self.replay_retention > 0:
+                self._expiry[game_id] = time.monotonic() + self.replay_retention
+            else:
+                self._expire_room(game_id)
+
+    def _expire_room(self, game_id: int) -> None:
+        """Drop a room's replay and delta state once nobody came back."""
+        self._expiry.pop(game_id, None)
         if game_id in self.active_connections:
-            if player_id in self.active_connections[game_id]:
-                del self.active_connections[game_id][player_id]
-                logger.info(f"Player {player_id} disconnected from game {game_id}")
+            return
+        self._replay.pop(game_id, None)
+        self.state_tracker.forget(game_id)
+        if game_id not in self._watches:
+            self.backplane.unsubscribe(game_id)
+        self.stats["rooms_expired"] += 1
+        logger.info(f"Game room {game_id} cleaned up (no connections)")
+
+    def _drop_outbox(self, websocket: WebSocket) -> None:
+        outbox = self._outboxes.pop(id(websocket), None)
+        if outbox is not None:
+            outbox.stop()
+
+    @staticmethod
+    def _merge_outgoing(
+        older: OutgoingMessage,
+        newer: OutgoingMessage,
+        codec=JSON_CODEC,
+    ) -> OutgoingMessage:
+        """Fold a superseded state update into the one replacing it."""
+        if older.message is None or newer.message is None:
+            return newer
+        if newer.message.type != MessageType.GAME_STATE_UPDATE:
+            return newer
+
+        data = merge_state_updates(older.message.data, newer.message.data)
+        merged = GameMessage(
+            type=MessageType.GAME_STATE_UPDATE,
+            data=data,
+            seq=newer.message.seq if newer.message.seq is not None else older.message.seq,
+            # A snapshot keeps naming its stream
+            stream=newer.message.stream or (older.message.stream if "game_state" in data else None),
+        )
+        return OutgoingMessage(merged.encode(codec), newer.coalesce_key, merged)
+
+    def _on_send_failed(self, outbox: PlayerConnection) -> None:
+        self.disconnect(outbox.game_id, outbox.player_id, outbox.websocket)
+
+    def _evict_slow(self, outbox: PlayerConnection) -> None:
+        """Drop a client that fell behind and ask it to reconnect."""
+        logger.warning(
+            f"Player {outbox.player_id} in game {outbox.game_id} fell behind "
+            f"({outbox.pending} pending); closing for resync"
+        )
+        self.stats["evicted"] += 1
+        self._close_outbox(outbox, RESYNC_CLOSE_CODE, RESYNC_CLOSE_REASON)
+
+    def _close_outbox(self, outbox: PlayerConnection, code: int, reason: str) -> None:
+        """Remove a connection and close its socket in the background."""
+        self.disconnect(outbox.game_id, outbox.player_id, outbox.websocket)
+        task = asyncio.create_task(outbox.close(code, reason))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _enqueue(
+        self,
+        websocket: WebSocket,
+        message: GameMessage,
+        frames: Optional[Dict[str, Frame]] = None,
+    ) -> bool:
+        """
+        Queue a message on a connection, encoded with its codec.
+
+        Args:
+            websocket: Target connection
+            message: Message to send
+            frames: Cache of encoded frames by codec, shared across the
+                recipients of one broadcast so each codec encodes once
+        """
+        outbox = self._outboxes.get(id(websocket))
+        if outbox is None:
+            return False
 
-            # Clean up empty game rooms
-            if not self.active_connections[game_id]:
-                del self.active_connections[game_id]
-                logger.info(f"Game room {game_id} cleaned up (no connections)")
+        frames = {} if frames is None else frames
+        payload = frames.get(outbox.codec.name)
+        if payload is None:
+            payload = frames[outbox.codec.name] = message.encode(outbox.codec)
+
+        coalesce_key = message.type.value if message.type in self.COALESCED_TYPES else None
+        if not outbox.enqueue(payload, coalesce_key, message):
+            self._evict_slow(outbox)
+            return False
+        return True
+
+    async def _publish(self, game_id: int, envelope: Dict[str, Any]) -> None:
+        """Publish an event to other processes; local delivery never waits on it."""
+        envelope["origin"] = self.instance_id
+        try:
+            await self.backplane.publish(game_id, envelope)
+        except Exception as e:
+            logger.warning(f"Backplane publish for game {game_id} failed: {e!r}")
+
+    async def _on_backplane_event(self, envelope: Dict[str, Any]) -> None:
+        """Deliver an event published by another process to local sockets."""
+        if envelope.get("origin") == self.instance_id:
+            return
+
+        game_id = envelope["game_id"]
+        kind = envelope.get("kind")
+        if kind == "state":
+            self._notify_watches(game_id, envelope["game_state"], envelope["version"])
+            self._deliver_state(game_id, envelope["game_state"], envelope["version"])
+            return
+
+        raw = envelope["message"]
+        message = GameMessage(
+            type=MessageType(raw["type"]),
+            data=raw.get("data", {}),
+            timestamp=raw.get("timestamp"),
+        )
+        if kind == "broadcast":
+            self._deliver(game_id, message, envelope.get("exclude_player_id"))
+        elif kind == "player":
+            self._send_local(game_id, envelope["player_id"], message)
+        else:
+            logger.warning(f"Unknown backplane event kind: {kind}")
+
+    def _deliver(
+        self,
+        game_id: int,
+        message: GameMessage,
+        exclude_player_id: Optional[int] = None
+    ) -> None:
+        """Number, record and queue a message for this process's members of a game."""
+        started = time.perf_counter()
+        recipients = self._fan_out(game_id, message, exclude_player_id)
+        if recipients:
+            fanout_seconds.observe(time.perf_counter() - started, "message")
+            fanout_recipients.observe(recipients, "message")
+
+    def _fan_out(
+        self,
+        game_id: int,
+        message: GameMessage,
+        exclude_player_id: Optional[int] = None
+    ) -> int:
+        """Untimed body of _deliver; returns the number of sockets queued for."""
+        buffer = self._replay.get(game_id)
+        if buffer is not None:
+            message = replace(message, seq=buffer.next_seq())
+            buffer.append(message, exclude_player_id)
+
+        room = self.active_connections.get(game_id)
+        if not room:
+            return 0
+
+        # Snapshot so evictions during the loop are safe
+        recipients = [
+            websocket
+            for player_id, websocket in room.items()
+            if not (exclude_player_id and player_id == exclude_player_id)
+        ]
+        frames: Dict[str, Frame] = {}
+        for websocket in recipients:
+            self._enqueue(websocket, message, frames)
+        return len(recipients)
+
+    def _send_local(
+        self,
+        game_id: int,
+        player_id: int,
+        message: GameMessage,
+        frames: Optional[Dict[str, Frame]] = None,
+    ) -> bool:
+        websocket = self.active_connections.get(game_id, {}).get(player_id)
+        if websocket is None:
+            return False
+        return self._enqueue(websocket, message, frames)
+
+    def _remember_private(
+        self,
+        game_id: int,
+        player_id: int,
+        fields: Dict[str, Any],
+        version: int,
+    ):
+        message = GameMessage(
+            type=MessageType.PRIVATE_STATE,
+            data={"version": version, "player_id": player_id, "private": fields},
+        )
+        return self.state_tracker.remember_private(game_id, player_id, fields, version, message)
+
+    def _deliver_state(self, game_id: int, game_state: Dict[str, Any], version: int) -> None:
+        # Rooms kept for replay still track state while empty
+        if game_id not in self._replay:
+            return
+
+        started = time.perf_counter()
+        # One public delta for the room, encoded once per codec
+        public = StateProjectionService.public_view(game_state)
+        data = self.state_tracker.build_update(game_id, public, version)
+        recipients = self._fan_out(
+            game_id, GameMessage(type=MessageType.GAME_STATE_UPDATE, data=data)
+        )
+
+        # Then each seat's private fields, only where they changed
+        for player_id, fields in StateProjectionService.private_parts(game_state).items():
+            entry = self._remember_private(game_id, player_id, fields, version)
+            if entry is not None:
+                self._send_local(game_id, player_id, entry.message, entry.frames)
+
+        if recipients:
+            fanout_seconds.observe(time.perf_counter() - started, "state")
+            fanout_recipients.observe(recipients, "state")
+
+    def resend_private_state(self, game_id: int, player_id: int) -> bool:
+        """
+        Send a seat the private fields last recorded for it (after a replayed
+        reconnect, which only covers room broadcasts).
+
+        Args:
+            game_id: The game room ID
+            player_id: The target player ID
+
+        Returns:
+            True if queued; False if nothing is recorded for the seat and the
+            caller should send a snapshot instead
+        """
+        entry = self.state_tracker.get_private(game_id, player_id)
+        if entry is None:
+            return False
+        return self._send_local(game_id, player_id, entry.message, entry.frames)
 
     async def broadcast_to_game(
         self,
@@ -114,32 +660,20 @@ class GameConnectionManager:
         exclude_player_id: Optional[int] = None
     ) -> None:
         """
-        Broadcast a message to all players in a game.
+        Broadcast a message to all players in a game, across processes.
 
         Args:
             game_id: The game room ID
             message: The message to broadcast
             exclude_player_id: Optional player ID to exclude from broadcast
         """
-        if game_id not in self.active_connections:
-            return
-
-        message_dict = message.to_dict()
-        failed_players = []
-
-        for player_id, websocket in self.active_connections[game_id].items():
-            if exclude_player_id and player_id == exclude_player_id:
-                continue
-
-            try:
-                await websocket.send_json(message_dict)
-            except Exception as e:
-                logger.warning(f"Failed to send to player {player_id}: {e}")
-                failed_players.append(player_id)
-
-        # Clean up failed connections
-        for player_id in failed_players:
-            self.disconnect(game_id, player_id)
+        self._deliver(game_id, message, exclude_player_id)
+        await self._publish(game_id, {
+            "kind": "broadcast",
+            "game_id": game_id,
+            "message": message.to_dict(),
+            "exclude_player_id": exclude_player_id,
+        })
 
     async def send_to_player(
         self,
@@ -156,22 +690,153 @@ class GameConnectionManager:
             message: The message to send
 
         Returns:
-            True if sent successfully, False otherwise
+            True if queued on this process; False otherwise, in which case
+            the message is forwarded to other processes
         """
-        if game_id not in self.active_connections:
-            return False
+        if self._send_local(game_id, player_id, message):
+            return True
 
-        if player_id not in self.active_connections[game_id]:
-            return False
+        await self._publish(game_id, {
+            "kind": "player",
+            "game_id": game_id,
+            "player_id": player_id,
+            "message": message.to_dict(),
+        })
+        return False
 
-        websocket = self.active_connections[game_id][player_id]
+    async def broadcast_state(
+        self,
+        game_id: int,
+        game_state: Dict[str, Any],
+        version: int,
+    ) -> None:
+        """
+        Broadcast a new game state as a delta against the last one sent.
+
+        Every seat receives the public view; private fields go only to
+        their owner (see StateProjectionService).
+
+        Args:
+            game_id: The game room ID
+            game_state: Full game state
+            version: Game version of the state
+        """
+        self._notify_watches(game_id, game_state, version)
+        self._deliver_state(game_id, game_state, version)
+        await self._publish(game_id, {
+            "kind": "state",
+            "game_id": game_id,
+            "game_state": game_state,
+            "version": version,
+        })
+
+    async def send_state_snapshot(
+        self,
+        game_id: int,
+        player_id: int,
+        game_state: Dict[str, Any],
+        version: int,
+    ) -> bool:
+        """
+        Send a full game state to one player (on join or resync).
+
+        The snapshot is the public view completed with the player's own
+        private fields. It carries the room's current seq and this
+        process's stream, which the client sends back when it reconnects.
+
+        Args:
+            game_id: The game room ID
+            player_id: The target player ID
+            game_state: Full game state
+            version: Game version of the state
+
+        Returns:
+            True if queued for delivery, False otherwise
+        """
+        public = StateProjectionService.public_view(game_state)
+        self.state_tracker.remember(game_id, public, version)
+
+        private = StateProjectionService.private_parts(game_state).get(player_id)
+        if private is not None:
+            self._remember_private(game_id, player_id, private, version)
+
+        buffer = self._replay.get(game_id)
+        return self._send_local(
+            game_id,
+            player_id,
+            GameMessage(
+                type=MessageType.GAME_STATE_UPDATE,
+                data=snapshot_data(
+                    StateProjectionService.with_private(public, player_id, private),
+                    version,
+                ),
+                seq=buffer.last_seq if buffer is not None else None,
+                stream=self.instance_id,
+            ),
+        )
+
+    @contextmanager
+    def watch_version(self, game_id: int) -> Iterator[VersionWatch]:
+        """
+        Watch a game's state broadcasts for the duration of the block.
+
+        Enter before reading the current version, so a change committed
+        in between is not missed.
+
+        Args:
+            game_id: The game ID
+
+        Yields:
+            Watch notified with every newer state of the game
+        """
+        watch = VersionWatch()
+        watches = self._watches.get(game_id)
+        if watches is None:
+            watches = self._watches[game_id] = set()
+            self.backplane.subscribe(game_id)
+        watches.add(watch)
         try:
-            await websocket.send_json(message.to_dict())
-            return True
-        except Exception as e:
-            logger.warning(f"Failed to send to player {player_id}: {e}")
-            self.disconnect(game_id, player_id)
-            return False
+            yield watch
+        finally:
+            watches.discard(watch)
+            if not watches and self._watches.get(game_id) is watches:
+                del self._watches[game_id]
+                if game_id not in self._replay:
+                    self.backplane.unsubscribe(game_id)
+
+    def _notify_watches(self, game_id: int, game_state: Dict[str, Any], version: int) -> None:
+        for watch in self._watches.get(game_id, ()):
+            watch.notify(version, game_state)
+
+    async def flush(self, game_id: Optional[int] = None) -> None:
+        """
+        Wait until queued messages have been written.
+
+        Args:
+            game_id: Only wait for this game's connections
+        """
+        outboxes = [
+            outbox for outbox in list(self._outboxes.values())
+            if game_id is None or outbox.game_id == game_id
+        ]
+        await asyncio.gather(*(outbox.flush() for outbox in outboxes))
+        if self._closing:
+            await asyncio.gather(*list(self._closing), return_exceptions=True)
+
+    def get_pending_count(self, game_id: int, player_id: int) -> int:
+        """
+        Get number of messages queued for a player.
+
+        Args:
+            game_id: The game room ID
+            player_id: The player ID
+
+        Returns:
+            Pending message count (0 if not connected)
+        """
+        websocket = self.active_connections.get(game_id, {}).get(player_id)
+        outbox = self._outboxes.get(id(websocket)) if websocket is not None else None
+        return outbox.pending if outbox is not None else 0
 
     def get_connected_players(self, game_id: int) -> List[int]:
         """
@@ -219,4 +884,10 @@ class GameConnectionManager:
 
 
 # Global connection manager instance
-game_manager = GameConnectionManager()
+game_manager = GameConnectionManager(
+    backplane=create_backplane(settings.WS_BACKPLANE, settings.REDIS_URL),
+)
+
+# Read at scrape time, so connects and disconnects pay nothing
+ws_connections.set_function(lambda: len(game_manager._outboxes), "game")
+ws_rooms.set_function(lambda: len(game_manager.active_connections), "game")
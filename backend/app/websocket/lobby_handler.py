@@ -0,0 +1,151 @@
+"""
+WebSocket Lobby Handler
+
+Lobby room and lobby browser channels, fed by committed lobby changes.
+"""
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from typing import Iterable, Optional
+import json
+import logging
+
+from app.core.database import session_scope
+from app.models.lobby import Lobby, LobbyPlayer, LobbyStatus
+from app.services.lobby_service import LobbyService
+from app.websocket.game_manager import GameMessage, MessageType
+from app.websocket.lobby_manager import LIST_CHANNEL, lobby_manager
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+async def load_lobbies(lobby_ids: Iterable[int]) -> dict[int, Lobby]:
+    """Load lobbies with their players and users on a short-lived session."""
+    async with session_scope() as db:
+        result = await db.execute(
+            select(Lobby)
+            .options(selectinload(Lobby.players).selectinload(LobbyPlayer.user))
+            .where(Lobby.id.in_(list(lobby_ids)))
+        )
+        return {lobby.id: lobby for lobby in result.scalars().all()}
+
+
+def lobby_state_message(lobby: Lobby) -> GameMessage:
+    """The lobby_state message carrying a lobby's current state."""
+    return GameMessage(
+        type=MessageType.LOBBY_STATE,
+        data={"lobby": LobbyService.to_lobby_response(lobby).model_dump(mode="json")},
+    )
+
+
+def listing_message(lobby_id: int, lobby: Optional[Lobby]) -> GameMessage:
+    """The lobby browser message for a lobby's current state."""
+    if lobby is None or lobby.status != LobbyStatus.WAITING:
+        return GameMessage(type=MessageType.LOBBY_UNLISTED, data={"lobby_id": lobby_id})
+    return GameMessage(
+        type=MessageType.LOBBY_LISTED,
+        data={"lobby": LobbyService.to_summary(lobby).model_dump(mode="json")},
+    )
+
+
+async def notify_lobby_changes(lobby_ids: Iterable[int]) -> None:
+    """
+    Push the current state of changed lobbies to their channels.
+
+    Called after a commit that touched the lobbies (see lobby_service).
+    Lobbies nobody may be watching are skipped without a query.
+
+    Args:
+        lobby_ids: IDs of the changed lobbies
+    """
+    lobby_ids = [i for i in lobby_ids if lobby_manager.has_audience(i)]
+    if not lobby_ids:
+        return
+
+    try:
+        for lobby_id in lobby_ids:
+            # Loaded under the channel lock so it cannot overtake a newer
+            # initial state being sent to a joining subscriber
+            async with lobby_manager.lock(lobby_id):
+                lobby = (await load_lobbies([lobby_id])).get(lobby_id)
+                if lobby is not None:
+                    await lobby_manager.publish(lobby_id, lobby_state_message(lobby))
+            await lobby_manager.publish(LIST_CHANNEL, listing_message(lobby_id, lobby))
+    except Exception as e:
+        logger.error(f"Lobby change notification for {lobby_ids} failed: {e!r}")
+
+
+async def _receive_loop(websocket: WebSocket, channel: int) -> None:
+    """Answer pings until the client goes away, then unsubscribe it."""
+    try:
+        while True:
+            data = await websocket.receive_text()
+            try:
+                message = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+            if message.get("type") == MessageType.PING.value:
+                # Queued, so it cannot interleave with the subscriber's writer
+                lobby_manager.send(channel, websocket, GameMessage(type=MessageType.PONG))
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Lobby WebSocket error on channel {channel}: {e}")
+    finally:
+        lobby_manager.disconnect(channel, websocket)
+
+
+@router.websocket("/ws/lobby/{lobby_id}")
+async def lobby_websocket(websocket: WebSocket, lobby_id: int):
+    """
+    WebSocket channel of one lobby, replacing GET /lobbies/{id} polling.
+
+    Connect with: ws://host/ws/lobby/{lobby_id}
+
+    Server messages:
+    - lobby_state: {"lobby": LobbyResponse}, sent on connect and after
+      every committed change (join, leave, ready, start); a started lobby
+      carries its game_id
+
+    Client messages:
+    - ping: Answered with pong
+
+    Close codes:
+    - 4004: Lobby not found
+    - 4008: Client fell too far behind; reconnect
+    """
+    await lobby_manager.connect(websocket, lobby_id)
+
+    async with lobby_manager.lock(lobby_id):
+        lobby = (await load_lobbies([lobby_id])).get(lobby_id)
+        if lobby is not None:
+            lobby_manager.send(lobby_id, websocket, lobby_state_message(lobby))
+
+    if lobby is None:
+        lobby_manager.disconnect(lobby_id, websocket)
+        await websocket.close(code=4004, reason="Lobby not found")
+        return
+
+    await _receive_loop(websocket, lobby_id)
+
+
+@router.websocket("/ws/lobbies")
+async def lobby_list_websocket(websocket: WebSocket):
+    """
+    WebSocket channel of the lobby browser, replacing GET /lobbies polling.
+
+    Connect with: ws://host/ws/lobbies, then load the first page with
+    GET /api/v1/lobbies so no change falls in between.
+
+    Server messages:
+    - lobby_listed: {"lobby": LobbySummary}, a waiting lobby was created
+      or changed
+    - lobby_unlisted: {"lobby_id"}, a lobby is no longer waiting
+
+    Client messages:
+    - ping: Answered with pong
+    """
+    await lobby_manager.connect(websocket, LIST_CHANNEL)
+    await _receive_loop(websocket, LIST_CHANNEL)
@@ -0,0 +1,261 @@
+"""
+WebSocket Lobby Channel Manager
+
+Pushes lobby changes to the lobby room and lobby browser pages.
+"""
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from fastapi import WebSocket
+import asyncio
+import logging
+import uuid
+
+from app.core.config import settings
+from app.websocket.backplane import Backplane, InProcessBackplane, create_backplane
+from app.websocket.connection import (
+    PlayerConnection,
+    RESYNC_CLOSE_CODE,
+    RESYNC_CLOSE_REASON,
+)
+from app.websocket.game_manager import GameMessage, MessageType, ws_connections, ws_rooms
+
+logger = logging.getLogger(__name__)
+
+# Channel of the lobby browser; every other channel is a lobby ID
+LIST_CHANNEL = 0
+
+
+class LobbyChannelManager:
+    """
+    Manages WebSocket subscribers of lobby channels.
+
+    Channel N carries one lobby's state (lobby_state), channel 0 carries
+    the waiting-lobby listing (lobby_listed / lobby_unlisted per lobby).
+    Anyone may subscribe, like the REST reads they replace, and several
+    sockets of one user are independent subscribers.
+
+    Each socket gets a PlayerConnection, so slow subscribers never delay
+    the others. Messages about the same lobby supersede each other while
+    queued, since each one carries that lobby's complete current state.
+    Events are also published on a backplane of their own so that
+    subscribers on other processes receive them.
+    """
+
+    def __init__(
+        self,
+        send_timeout: float = settings.WS_SEND_TIMEOUT_SECONDS,
+        max_queue: int = settings.WS_SEND_QUEUE_SIZE,
+        max_lag: float = settings.WS_MAX_LAG_SECONDS,
+        backplane: Optional[Backplane] = None,
+    ):
+        # channel -> {id(websocket) -> outbox}
+        self.channels: Dict[int, Dict[int, PlayerConnection]] = {}
+        self._closing: set[asyncio.Task] = set()
+        # channel -> lock ordering initial states against pushed changes,
+        # kept only while someone holds or waits for it
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._lock_users: Dict[int, int] = {}
+        self.send_timeout = send_timeout
+        self.max_queue = max_queue
+        self.max_lag = max_lag
+        self.backplane = backplane or InProcessBackplane()
+        self.stats = {"published": 0, "evicted": 0}
+        # Tags published events so our own are ignored when they come back
+        self.instance_id = uuid.uuid4().hex[:12]
+
+    async def start(self) -> None:
+        """Receive events from other processes."""
+        await self.backplane.start(self._on_backplane_event)
+
+    async def shutdown(self) -> None:
+        """Stop the backplane."""
+        await self.backplane.close()
+
+    @asynccontextmanager
+    async def lock(self, channel: int) -> AsyncIterator[None]:
+        """
+        Lock held while loading and sending a channel's state, so a client's
+        initial state and pushed changes reach it in commit order.
+
+        The lock is dropped once nobody holds or waits for it, so changes to
+        lobbies only the browser watches leave nothing behind.
+        """
+        lock = self._locks.setdefault(channel, asyncio.Lock())
+        self._lock_users[channel] = self._lock_users.get(channel, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[channel] -= 1
+            if not self._lock_users[channel]:
+                del self._lock_users[channel]
+                del self._locks[channel]
+
+    async def connect(self, websocket: WebSocket, channel: int) -> None:
+        """
+        Accept a WebSocket and subscribe it to a channel.
+
+        Args:
+            websocket: The WebSocket connection
+            channel: Lobby ID, or LIST_CHANNEL
+        """
+        await websocket.accept()
+
+        subscribers = self.channels.get(channel)
+        if subscribers is None:
+            subscribers = self.channels[channel] = {}
+            self.backplane.subscribe(channel)
+
+        outbox = PlayerConnection(
+            websocket,
+            channel,
+            0,
+            max_queue=self.max_queue,
+            max_lag=self.max_lag,
+            send_timeout=self.send_timeout,
+            on_failed=self._on_send_failed,
+        )
+        subscribers[id(websocket)] = outbox
+        outbox.start()
+
+    def disconnect(self, channel: int, websocket: WebSocket) -> None:
+        """
+        Unsubscribe a WebSocket from a channel.
+
+        Args:
+            channel: Lobby ID, or LIST_CHANNEL
+            websocket: The WebSocket connection
+        """
+        subscribers = self.channels.get(channel)
+        if subscribers is None:
+            return
+
+        outbox = subscribers.pop(id(websocket), None)
+        if outbox is not None:
+            outbox.stop()
+
+        if not subscribers:
+            del self.channels[channel]
+            self.backplane.unsubscribe(channel)
+
+    def has_audience(self, lobby_id: int) -> bool:
+        """
+        Check whether a lobby's changes may have subscribers anywhere.
+
+        Args:
+            lobby_id: The lobby ID
+
+        Returns:
+            True if this process has subscribers to the lobby or the
+            listing, or other processes might
+        """
+        return (
+            lobby_id in self.channels
+            or LIST_CHANNEL in self.channels
+            or self.backplane.has_peers
+        )
+
+    def send(self, channel: int, websocket: WebSocket, message: GameMessage) -> bool:
+        """
+        Queue a message for one subscriber (e.g. its initial state).
+
+        Returns:
+            False if the socket is not subscribed or was dropped as too slow
+        """
+        outbox = self.channels.get(channel, {}).get(id(websocket))
+        if outbox is None:
+            return False
+        return self._enqueue(outbox, message.encode(), message, self._coalesce_key(message))
+
+    async def publish(self, channel: int, message: GameMessage) -> None:
+        """
+        Send a message to every subscriber of a channel, across processes.
+
+        Args:
+            channel: Lobby ID, or LIST_CHANNEL
+            message: The message to send
+        """
+        self.stats["published"] += 1
+        self._deliver(channel, message)
+        try:
+            await self.backplane.publish(channel, {
+                "origin": self.instance_id,
+                "channel": channel,
+                "message": message.to_dict(),
+            })
+        except Exception as e:
+            logger.warning(f"Backplane publish for lobby channel {channel} failed: {e!r}")
+
+    async def _on_backplane_event(self, envelope: Dict[str, Any]) -> None:
+        if envelope.get("origin") == self.instance_id:
+            return
+        raw = envelope["message"]
+        message = GameMessage(type=MessageType(raw["type"]), data=raw.get("data", {}))
+        self._deliver(envelope["channel"], message)
+
+    @staticmethod
+    def _coalesce_key(message: GameMessage) -> str:
+        # Each message carries a lobby's full state, so only the newest
+        # pending one per lobby matters
+        lobby_id = message.data.get("lobby_id") or message.data.get("lobby", {}).get("id")
+        return f"lobby:{lobby_id}"
+
+    def _deliver(self, channel: int, message: GameMessage) -> None:
+        subscribers = self.channels.get(channel)
+        if not subscribers:
+            return
+
+        payload = message.encode()
+        coalesce_key = self._coalesce_key(message)
+        # Snapshot so evictions during the loop are safe
+        for outbox in list(subscribers.values()):
+            self._enqueue(outbox, payload, message, coalesce_key)
+
+    def _enqueue(
+        self,
+        outbox: PlayerConnection,
+        payload: Any,
+        message: GameMessage,
+        coalesce_key: str,
+    ) -> bool:
+        if outbox.enqueue(payload, coalesce_key, message):
+            return True
+        self.stats["evicted"] += 1
+        self.disconnect(outbox.game_id, outbox.websocket)
+        task = asyncio.create_task(outbox.close(RESYNC_CLOSE_CODE, RESYNC_CLOSE_REASON))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+        return False
+
+    def _on_send_failed(self, outbox: PlayerConnection) -> None:
+        self.disconnect(outbox.game_id, outbox.websocket)
+
+    async def flush(self) -> None:
+        """Wait until queued messages have been written."""
+        outboxes = [o for subscribers in self.channels.values() for o in subscribers.values()]
+        await asyncio.gather(*(outbox.flush() for outbox in outboxes))
+        if self._closing:
+            await asyncio.gather(*list(self._closing), return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get live subscriber counts.
+
+        Returns:
+            Counts of channels and subscribers, and totals of published
+            and evicted
+        """
+        return {
+            "channels": len(self.channels),
+            "subscribers": sum(len(s) for s in self.channels.values()),
+            **self.stats,
+        }
+
+
+# Global lobby channel manager instance
+lobby_manager = LobbyChannelManager(
+    backplane=create_backplane(settings.WS_BACKPLANE, settings.REDIS_URL, "hanyang:lobby:"),
+)
+
+ws_connections.set_function(lambda: lobby_manager.get_stats()["subscribers"], "lobby")
+ws_rooms.set_function(lambda: len(lobby_manager.channels), "lobby")
@@ -0,0 +1,75 @@
+"""
+WebSocket Replay Buffer
+
+Recent room broadcasts of a game, kept so reconnecting clients only
+receive what they missed.
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, List, Optional
+
+
+@dataclass
+class ReplayEntry:
+    """A broadcast message and the player it skipped, if any"""
+    seq: int
+    message: Any
+    exclude_player_id: Optional[int] = None
+
+
+class ReplayBuffer:
+    """
+    Bounded ring of a game's broadcasts, numbered by sequence.
+
+    Sequence numbers start at 1 and have no gaps, so a client that saw
+    everything up to last_seq can be brought up to date as long as the
+    next message is still buffered.
+    """
+
+    def __init__(self, size: int):
+        self._entries: Deque[ReplayEntry] = deque(maxlen=size)
+        self.last_seq = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def next_seq(self) -> int:
+        """Sequence number the next appended message will get"""
+        return self.last_seq + 1
+
+    def append(self, message: Any, exclude_player_id: Optional[int] = None) -> int:
+        """
+        Record a broadcast message.
+
+        Args:
+            message: Message as sent (already stamped with its seq)
+            exclude_player_id: Player the broadcast skipped
+
+        Returns:
+            The message's sequence number
+        """
+        self.last_seq += 1
+        self._entries.append(ReplayEntry(self.last_seq, message, exclude_player_id))
+        return self.last_seq
+
+    def since(self, last_seq: int) -> Optional[List[ReplayEntry]]:
+        """
+        Get the messages after last_seq.
+
+        Args:
+            last_seq: Last sequence number the client received
+
+        Returns:
+            Entries in order, or None if some were already dropped (or
+            last_seq is from another stream) and a snapshot is needed
+        """
+        if last_seq > self.last_seq or last_seq < 0:
+            return None
+        if last_seq == self.last_seq:
+            return []
+
+        oldest = self._entries[0].seq if self._entries else self.last_seq + 1
+        if last_seq + 1 < oldest:
+            return None
+
+        return [entry for entry in self._entries if entry.seq > last_seq]
@@ -0,0 +1,298 @@
+"""
+WebSocket State Sync
+
+Versioned game state updates sent as JSON Patch (RFC 6902) deltas.
+
+Every GAME_STATE_UPDATE carries the game's version. A delta names the
+version it applies to (base_version); a client whose own version differs
+has missed an update and asks for a snapshot with a resync message.
+
+Deltas describe the public view of the state, which is the same for every
+seat. Each seat's private fields travel separately in PRIVATE_STATE
+messages, sent only to that seat and only when they change.
+
+Long-poll requests wait on a VersionWatch for the next version instead.
+"""
+import asyncio
+import copy
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _escape(token: str) -> str:
+    """Escape a JSON Pointer reference token (RFC 6901)."""
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """
+    Build a JSON Patch that turns old into new.
+
+    Objects are diffed key by key and arrays index by index, with trailing
+    additions or removals, which suits game state where boards keep their
+    shape and lists mostly change at the end.
+
+    Args:
+        old: Previous document
+        new: New document
+        path: JSON Pointer of the documents (used when recursing)
+
+    Returns:
+        List of add/remove/replace operations
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(str(key))}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(str(key))}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(make_patch(old[key], value, child))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        ops = []
+        common = min(len(old), len(new))
+        for index in range(common):
+            ops.extend(make_patch(old[index], new[index], f"{path}/{index}"))
+        # Remove from the end so earlier indices stay valid
+        for index in range(len(old) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{index}"})
+        for index in range(common, len(new)):
+            ops.append({"op": "add", "path": f"{path}/{index}", "value": new[index]})
+        return ops
+
+    if old == new and type(old) is type(new):
+        return []
+
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document: Any, patch: List[Dict[str, Any]]) -> Any:
+    """
+    Apply add/remove/replace operations to a copy of a document.
+
+    Args:
+        document: Document to patch (left unchanged)
+        patch: Operations from make_patch
+
+    Returns:
+        The patched document
+    """
+    result = copy.deepcopy(document)
+
+    for op in patch:
+        if op["path"] == "":
+            if op["op"] == "remove":
+                result = None
+            else:
+                result = copy.deepcopy(op["value"])
+            continue
+
+        *parents, last = [_unescape(t) for t in op["path"].split("/")[1:]]
+        target = result
+        for token in parents:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+
+        if isinstance(target, list):
+            index = len(target) if last == "-" else int(last)
+            if op["op"] == "add":
+                target.insert(index, copy.deepcopy(op["value"]))
+            elif op["op"] == "remove":
+                del target[index]
+            else:
+                target[index] = copy.deepcopy(op["value"])
+        else:
+            if op["op"] == "remove":
+                del target[last]
+            else:
+                target[last] = copy.deepcopy(op["value"])
+
+    return result
+
+
+def merge_state_updates(older: Dict[str, Any], newer: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine two pending GAME_STATE_UPDATE payloads into one.
+
+    A snapshot supersedes anything before it. A delta that follows directly
+    on the older update is folded into it; otherwise the newer update is
+    kept as is and the client will detect the gap.
+    """
+    if "patch" not in newer:
+        return newer
+    if older.get("version") != newer.get("base_version"):
+        return newer
+
+    if "patch" in older:
+        return {
+            "version": newer["version"],
+            "base_version": older["base_version"],
+            "patch": older["patch"] + newer["patch"],
+        }
+
+    return {
+        "version": newer["version"],
+        "game_state": apply_patch(older["game_state"], newer["patch"]),
+    }
+
+
+def snapshot_data(state: dict, version: int) -> Dict[str, Any]:
+    """Message data for a full state snapshot."""
+    return {"version": version, "game_state": state}
+
+
+@dataclass
+class PrivateState:
+    """A seat's private fields and the message that carries them"""
+    version: int
+    fields: Dict[str, Any]
+    message: Any
+    # Encoded message by codec name, filled on first send and reused
+    frames: Dict[str, Any] = field(default_factory=dict)
+
+
+class GameStateTracker:
+    """
+    Last broadcast state per game, used as the base for the next delta,
+    and the last private fields sent to each seat.
+
+    Only this process's broadcasts are remembered, so when a process has
+    no base (or an outdated one) clients either get a snapshot or detect
+    a version gap and resync.
+    """
+
+    def __init__(self):
+        # game_id -> (version, state)
+        self._states: Dict[int, Tuple[int, dict]] = {}
+        # game_id -> player_id -> private fields last sent
+        self._private: Dict[int, Dict[int, PrivateState]] = {}
+
+    def build_update(self, game_id: int, state: dict, version: int) -> Dict[str, Any]:
+        """
+        Record a new state and build the message data that describes it.
+
+        Args:
+            game_id: Game ID
+            state: Full game state
+            version: Game version of the state
+
+        Returns:
+            Delta data (version, base_version, patch) when a base is known,
+            otherwise snapshot data (version, game_state)
+        """
+        previous = self._states.get(game_id)
+        self._states[game_id] = (version, state)
+
+        if previous is None or previous[0] > version:
+            return snapshot_data(state, version)
+
+        base_version, base_state = previous
+        return {
+            "version": version,
+            "base_version": base_version,
+            "patch": make_patch(base_state, state),
+        }
+
+    def remember(self, game_id: int, state: dict, version: int) -> None:
+        """Use a state as the base for the next delta if it is newer."""
+        previous = self._states.get(game_id)
+        if previous is None or previous[0] <= version:
+            self._states[game_id] = (version, state)
+
+    def get(self, game_id: int) -> Optional[Tuple[int, dict]]:
+        """Get the last (version, state) for a game."""
+        return self._states.get(game_id)
+
+    def remember_private(
+        self,
+        game_id: int,
+        player_id: int,
+        fields: Dict[str, Any],
+        version: int,
+        message: Any,
+    ) -> Optional[PrivateState]:
+        """
+        Record a seat's private fields if they are new.
+
+        Args:
+            game_id: Game ID
+            player_id: Seat the fields belong to
+            fields: Private fields
+            version: Game version of the fields
+            message: Message that carries them to the seat
+
+        Returns:
+            The new entry, or None if the fields are unchanged or older
+            than the ones already recorded
+        """
+        seats = self._private.setdefault(game_id, {})
+        previous = seats.get(player_id)
+        if previous is not None and (previous.version > version or previous.fields == fields):
+            return None
+        seats[player_id] = PrivateState(version, fields, message)
+        return seats[player_id]
+
+    def get_private(self, game_id: int, player_id: int) -> Optional[PrivateState]:
+        """Get the private fields last recorded for a seat."""
+        return self._private.get(game_id, {}).get(player_id)
+
+    def forget(self, game_id: int) -> None:
+        """Drop the stored state for a game."""
+        self._states.pop(game_id, None)
+        self._private.pop(game_id, None)
+
+
+class VersionWatch:
+    """
+    A parked long-poll request waiting for a game to move past a version.
+
+    The manager hands every state it broadcasts (or receives from another
+    process) to the watches of that game, so waiting never polls the
+    database and the new state usually arrives with the wakeup.
+    """
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        # Full state of self.version, if it came with the notification
+        self.state: Optional[Dict[str, Any]] = None
+        self._changed = asyncio.Event()
+
+    def notify(self, version: int, state: Optional[Dict[str, Any]] = None) -> None:
+        """Record a new state; older or repeated versions are ignored."""
+        if self.version is not None and version <= self.version:
+            return
+        self.version = version
+        self.state = state
+        self._changed.set()
+
+    async def wait_past(self, since: int, timeout: float) -> bool:
+        """
+        Wait until a version newer than since has been notified.
+
+        Args:
+            since: Version the client already has
+            timeout: Seconds to wait at most
+
+        Returns:
+            True if a newer version arrived, False on timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.version is None or self.version <= since:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
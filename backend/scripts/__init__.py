@@ -0,0 +1,7 @@
+"""
+Developer tools: benchmarks, load tests and AI weight tuning.
+
+Run from the backend directory, e.g. python -m scripts.benchmark. Nothing
+in the app imports this package, so it is not part of the deployed
+request path.
+"""
@@ -0,0 +1,359 @@
+"""
+Offline tuner for AI evaluation weights.
+
+Searches a personality's AIWeights with a (1+λ) hill-climb. Candidates are
+scored by in-memory self-play games (no database) run in parallel worker
+processes, and the best vector can be written back to the personality's
+data file that create_ai_opponent loads.
+
+Usage:
+    python -m scripts.ai_tuner --personality feng_shui_master \\
+        --iterations 20 --population 8 --games 24 --workers 4 --write
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from app.models.game import Game, GameStatus
+from app.services.ai_scheduler import run_ai_turn
+from app.services.ai_search import SearchLimits
+from app.services.ai_service import (
+    AI_PERSONALITIES,
+    AI_WEIGHTS_DIR,
+    AIDifficulty,
+    AIWeights,
+    DEFAULT_WEIGHTS,
+    load_personality_weights,
+)
+from app.services.blueprint_service import BlueprintService
+from app.services.game_service import GameService
+
+logger = logging.getLogger(__name__)
+
+# Fixed-depth search without a deadline: a seed replays the same game
+# whatever the machine load, which paired comparisons rely on, and games
+# stay fast
+SELF_PLAY_LIMITS = SearchLimits(deadline_ms=math.inf, max_depth=2, branching=6)
+
+
+class InMemorySession:
+    """
+    Minimal stand-in for AsyncSession used by self-play.
+
+    GameService only adds, flushes and refreshes action records; ids are
+    assigned locally so results look the same as with a database.
+    """
+
+    def __init__(self):
+        self._next_id = 1
+
+    def add(self, obj) -> None:
+        if getattr(obj, "id", None) is None:
+            obj.id = self._next_id
+            self._next_id += 1
+
+    async def flush(self) -> None:
+        return None
+
+    async def refresh(self, obj) -> None:
+        return None
+
+
+def create_self_play_game(num_players: int) -> Game:
+    """
+    Create an unsaved game where every seat is a HARD AI.
+
+    Seats use user_id -1..-num_players in turn order.
+    """
+    blueprint_hands = BlueprintService.deal_blueprints(num_players, cards_per_player=3)
+
+    players = []
+    turn_order = []
+    for i in range(num_players):
+        user_id = -(i + 1)
+        player = GameService.create_initial_player(
+            player_id=i + 1,
+            user_id=user_id,
+            username=f"AI {i + 1}",
+            color=["blue", "red", "green", "yellow"][i % 4],
+            turn_order=i,
+            is_host=i == 0,
+        )
+        player["dealt_blueprints"] = blueprint_hands[i]
+        player["blueprints"] = []
+        player["is_ai"] = True
+        player["ai_difficulty"] = AIDifficulty.HARD.value
+        players.append(player)
+        turn_order.append(user_id)
+
+    return Game(
+        id=0,
+        lobby_id=None,
+        status=GameStatus.IN_PROGRESS,
+        current_round=1,
+        total_rounds=GameService.TOTAL_ROUNDS,
+        current_turn_player_id=turn_order[0],
+        turn_order_json=json.dumps(turn_order),
+        board_json=json.dumps(GameService.create_initial_board()),
+        players_json=json.dumps(players),
+        available_tiles_json=json.dumps(GameService.generate_tile_pool()),
+        discarded_tiles_json=json.dumps([]),
+    )
+
+
+async def play_self_play_game(
+    seat_weights: list[AIWeights],
+    max_turns: int = 200,
+    limits: SearchLimits = SELF_PLAY_LIMITS,
+) -> list[dict]:
+    """
+    Play a full game between AI seats entirely in memory.
+
+    Args:
+        seat_weights: Evaluation weights for each seat, in turn order
+        max_turns: Safety limit on the number of turns
+        limits: Search budget of every seat
+
+    Returns:
+        Final scores from GameService.calculate_final_scores
+    """
+    game = create_self_play_game(len(seat_weights))
+    db = InMemorySession()
+
+    for _ in range(max_turns):
+        if game.status != GameStatus.IN_PROGRESS:
+            break
+        player = GameService.get_current_player(game)
+        seat = game.turn_order.index(player["user_id"])
+        await run_ai_turn(db, game, player, weights=seat_weights[seat], limits=limits)
+
+    return GameService.calculate_final_scores(game)
+
+
+def _score_margin(candidate: list[float], baseline: list[float], num_players: int, seed: int) -> float:
+    """
+    Play one seeded game and return the candidate's margin over the field.
+
+    Top-level so it can run in worker processes. The candidate's seat
+    rotates with the seed so no vector benefits from moving first.
+    """
+    random.seed(seed)
+    seat = seed % num_players
+    seat_weights = [AIWeights.from_vector(baseline)] * num_players
+    seat_weights[seat] = AIWeights.from_vector(candidate)
+
+    scores = asyncio.run(play_self_play_game(seat_weights))
+
+    by_user = {s["user_id"]: s["total_score"] for s in scores}
+    own = by_user[-(seat + 1)]
+    others = [v for k, v in by_user.items() if k != -(seat + 1)]
+    return own - sum(others) / len(others)
+
+
+@dataclass
+class TuningResult:
+    """Outcome of a tuning run."""
+    weights: AIWeights
+    fitness: float
+    history: list[dict] = field(default_factory=list)
+
+
+class WeightTuner:
+    """
+    (1+λ) hill-climb over AIWeights with self-adapting step size.
+
+    Every iteration the incumbent and λ mutants are evaluated on the same
+    fresh set of seeded games (common random numbers). A mutant replaces
+    the incumbent only if its paired margin over the incumbent is more
+    than `confidence` standard errors above zero, which keeps the search
+    from chasing lucky seeds.
+    """
+
+    MIN_STEP_SIZE = 0.02
+    MAX_STEP_SIZE = 1.0
+
+    def __init__(
+        self,
+        baseline: AIWeights = DEFAULT_WEIGHTS,
+        num_players: int = 2,
+        games_per_candidate: int = 16,
+        population: int = 8,
+        step_size: float = 0.25,
+        confidence: float = 2.0,
+        frozen: set[str] | None = None,
+        workers: int = 1,
+        seed: int = 0,
+    ):
+        self.baseline = baseline
+        self.num_players = num_players
+        self.games_per_candidate = games_per_candidate
+        self.population = population
+        self.step_size = step_size
+        self.confidence = confidence
+        self.frozen = frozen or set()
+        self.workers = workers
+        self._rng = random.Random(seed)
+        self._next_seed = seed * 1_000_003
+
+    def mutate(self, weights: AIWeights, step_size: float) -> AIWeights:
+        """Gaussian perturbation scaled to each weight, kept non-negative."""
+        values = {}
+        for name, value in weights.to_dict().items():
+            if name in self.frozen:
+                values[name] = value
+                continue
+            scale = max(abs(value), 1.0)
+            values[name] = max(0.0, value + self._rng.gauss(0.0, step_size) * scale)
+        return AIWeights.from_dict(values)
+
+    def evaluate(self, candidates: list[AIWeights], executor=None) -> list[list[float]]:
+        """Per-game score margins of each candidate over one shared seed set."""
+        seeds = [self._next_seed + i for i in range(self.games_per_candidate)]
+        self._next_seed += self.games_per_candidate
+
+        baseline = self.baseline.to_vector()
+        jobs = [
+            (candidate.to_vector(), baseline, self.num_players, seed)
+            for candidate in candidates
+            for seed in seeds
+        ]
+
+        if executor is None:
+            margins = [_score_margin(*job) for job in jobs]
+        else:
+            margins = list(executor.map(_score_margin, *zip(*jobs)))
+
+        n = len(seeds)
+        return [margins[i * n:(i + 1) * n] for i in range(len(candidates))]
+
+    def _paired_advantage(self, mutant: list[float], incumbent: list[float]) -> float:
+        """Mean paired difference in units of its standard error."""
+        diffs = [m - i for m, i in zip(mutant, incumbent)]
+        n = len(diffs)
+        mean = sum(diffs) / n
+        if n < 2:
+            return math.inf if mean > 0 else -math.inf
+        variance = sum((d - mean) ** 2 for d in diffs) / (n - 1)
+        if variance == 0:
+            return math.inf if mean > 0 else -math.inf
+        return mean / math.sqrt(variance / n)
+
+    def tune(self, start: AIWeights, iterations: int) -> TuningResult:
+        """
+        Run the hill-climb.
+
+        Args:
+            start: Initial weights (usually the personality's current file)
+            iterations: Number of generations
+
+        Returns:
+            Best weights found with their last measured fitness
+        """
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        best = start
+        best_fitness = -math.inf
+        step_size = self.step_size
+        history = []
+
+        try:
+            for iteration in range(iterations):
+                mutants = [self.mutate(best, step_size) for _ in range(self.population)]
+                margins = self.evaluate([best] + mutants, executor)
+
+                incumbent = margins[0]
+                best_fitness = sum(incumbent) / len(incumbent)
+                advantages = [self._paired_advantage(m, incumbent) for m in margins[1:]]
+                top = max(range(len(mutants)), key=lambda i: advantages[i])
+
+                improved = advantages[top] > self.confidence
+                if improved:
+                    best = mutants[top]
+                    best_fitness = sum(margins[top + 1]) / len(margins[top + 1])
+                    step_size = min(self.MAX_STEP_SIZE, step_size * 1.2)
+                else:
+                    step_size = max(self.MIN_STEP_SIZE, step_size * 0.85)
+
+                history.append({
+                    "iteration": iteration,
+                    "fitness": best_fitness,
+                    "step_size": step_size,
+                    "improved": improved,
+                })
+                logger.info(
+                    f"iteration {iteration}: fitness={best_fitness:.2f} "
+                    f"step={step_size:.3f} improved={improved}"
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return TuningResult(weights=best, fitness=best_fitness, history=history)
+
+
+def write_personality_weights(personality: str, result: TuningResult, games: int) -> None:
+    """Save tuned weights to the personality's data file."""
+    AI_WEIGHTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = AI_WEIGHTS_DIR / f"{personality}.json"
+    data = {
+        "personality": personality,
+        "source": "ai_tuner",
+        "tuned_at": datetime.now(timezone.utc).isoformat(),
+        "fitness": round(result.fitness, 3),
+        "games_per_candidate": games,
+        "weights": {k: round(v, 4) for k, v in result.weights.to_dict().items()},
+    }
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    load_personality_weights.cache_clear()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Tune AI evaluation weights by self-play")
+    parser.add_argument("--personality", required=True, choices=sorted(AI_PERSONALITIES))
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--population", type=int, default=8)
+    parser.add_argument("--games", type=int, default=16, help="games per candidate per iteration")
+    parser.add_argument("--players", type=int, default=2, choices=[2, 3, 4])
+    parser.add_argument("--step-size", type=float, default=0.25)
+    parser.add_argument(
+        "--confidence", type=float, default=2.0,
+        help="standard errors a mutant must win by to be accepted",
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--freeze", default="", help="comma-separated weights to keep fixed")
+    parser.add_argument("--write", action="store_true", help="save result to the data file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    frozen = {name for name in args.freeze.split(",") if name}
+    unknown = frozen - set(AIWeights.field_names())
+    if unknown:
+        parser.error(f"unknown weights: {', '.join(sorted(unknown))}")
+
+    tuner = WeightTuner(
+        num_players=args.players,
+        games_per_candidate=args.games,
+        population=args.population,
+        step_size=args.step_size,
+        confidence=args.confidence,
+        frozen=frozen,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    result = tuner.tune(load_personality_weights(args.personality), args.iterations)
+
+    print(json.dumps({"fitness": result.fitness, "weights": result.weights.to_dict()}, indent=2))
+    if args.write:
+        write_personality_weights(args.personality, result, args.games)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,279 @@
+"""
+Micro-benchmarks for the rules engine and the AI.
+
+Times the hot pure functions on generated boards at several fill levels
+and player counts, writes the results as JSON and compares them with a
+stored baseline run. Only the standard library is used, so it runs
+wherever the app does.
+
+Usage:
+    # Record a baseline (e.g. on main)
+    python -m scripts.benchmark --output bench-baseline.json
+
+    # Compare a change against it; exits 1 on regressions
+    python -m scripts.benchmark --baseline bench-baseline.json --threshold 0.15
+"""
+import argparse
+import json
+import logging
+import platform
+import random
+import statistics
+import timeit
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+
+from app.models.game import Game
+from app.services.ai_search import SearchLimits
+from app.services.ai_service import AIDifficulty, AIService
+from scripts.ai_tuner import create_self_play_game
+from app.services.blueprint_service import BLUEPRINT_CARDS, BlueprintService
+from app.services.game_service import GameService
+from app.services.tile_service import TileService
+from app.services.worker_service import PlacedWorker, WorkerType
+
+logger = logging.getLogger(__name__)
+
+PLAYER_COUNTS = (2, 3, 4)
+# Share of buildable cells holding a tile
+FILL_LEVELS = (0.25, 0.5, 0.9)
+
+# Fixed search budget so the medium AI is timed by the work it does, not
+# by its deadline
+AI_MEDIUM_LIMITS = SearchLimits(deadline_ms=1e9, max_depth=2, branching=6)
+
+
+@dataclass
+class BenchResult:
+    """Per-call timings of one benchmark case, in microseconds."""
+    min_us: float
+    median_us: float
+    loops: int
+
+    def to_dict(self) -> dict:
+        return {
+            "min_us": round(self.min_us, 3),
+            "median_us": round(self.median_us, 3),
+            "loops": self.loops,
+        }
+
+
+def generate_game(num_players: int, fill: float, seed: int) -> Game:
+    """
+    Build an unsaved in-progress game with a partly built board.
+
+    Tiles go on random buildable cells with random owners, some with
+    workers on them; every player has selected a blueprint and holds
+    enough resources to afford most tiles.
+
+    Args:
+        num_players: Number of seats
+        fill: Share of buildable cells to fill (0..1)
+        seed: Random seed; the same arguments give the same game
+    """
+    random.seed(seed)
+    game = create_self_play_game(num_players)
+    players = game.players
+    user_ids = [p["user_id"] for p in players]
+
+    board = game.board
+    pool = game.available_tiles
+    random.shuffle(pool)
+    cells = [cell for row in board for cell in row if cell["terrain"] != "mountain"]
+    for cell in random.sample(cells, round(len(cells) * fill)):
+        owner = random.choice(user_ids)
+        tile = TileService.create_placed_tile(pool.pop(), owner)
+        if random.random() < 0.4:
+            tile["placed_workers"].append(PlacedWorker(
+                player_id=random.choice(user_ids),
+                worker_type=random.choice(list(WorkerType)),
+                slot_index=0,
+            ).to_dict())
+        cell["tile"] = tile
+
+    for player in players:
+        player["blueprints"] = player["dealt_blueprints"][:1]
+        player["dealt_blueprints"] = []
+        player["resources"] = {"wood": 6, "stone": 6, "tile": 4, "ink": 3}
+        player["score"] = random.randint(0, 40)
+
+    game.board = board
+    game.players = players
+    game.available_tiles = pool
+    return game
+
+
+def build_cases(num_players: int, fill: float, seed: int) -> dict[str, Callable[[], object]]:
+    """
+    Benchmark cases for one generated game, by name.
+
+    Each case is a no-argument callable; its inputs are built up front
+    so only the function under test is timed.
+    """
+    game = generate_game(num_players, fill, seed)
+    board = game.board
+    player = game.players[0]
+    game_state = GameService.to_game_state_response(game)
+    suffix = f"p{num_players}/fill{round(fill * 100)}"
+
+    # The buildable cell with the most built neighbours, so adjacency has work
+    def built_neighbours(pos: dict) -> int:
+        return sum(
+            board[r][c]["tile"] is not None
+            for r, c in ((pos["row"] + dr, pos["col"] + dc) for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)))
+            if 0 <= r < len(board) and 0 <= c < len(board)
+        )
+
+    empty = [c["position"] for row in board for c in row if c["tile"] is None and c["terrain"] != "mountain"]
+    position = max(empty, key=built_neighbours) if empty else {"row": 1, "col": 1}
+    tile_id = game.available_tiles[0]
+    blueprint_ids = sorted(BLUEPRINT_CARDS)
+
+    def evaluate_all_blueprints():
+        # One call covers every card, since conditions differ widely in cost
+        for blueprint_id in blueprint_ids:
+            BlueprintService.evaluate_blueprint(blueprint_id, board, player)
+
+    def ai_decision(difficulty: AIDifficulty, limits: SearchLimits | None):
+        def run():
+            # Same choices on every call, whatever randomness the AI uses
+            random.seed(seed)
+            AIService.make_decision(game_state, player, difficulty, limits=limits)
+        return run
+
+    return {
+        f"tile.calculate_placement_score/{suffix}":
+            lambda: TileService.calculate_placement_score(board, position, tile_id),
+        f"blueprint.evaluate_blueprint[all]/{suffix}": evaluate_all_blueprints,
+        f"game.calculate_final_scores/{suffix}":
+            lambda: GameService.calculate_final_scores(game),
+        f"ai.make_decision[easy]/{suffix}": ai_decision(AIDifficulty.EASY, None),
+        f"ai.make_decision[medium]/{suffix}": ai_decision(AIDifficulty.MEDIUM, AI_MEDIUM_LIMITS),
+    }
+
+
+def time_case(func: Callable[[], object], repeat: int, min_time: float) -> BenchResult:
+    """
+    Time a callable with timeit.
+
+    The loop count is grown until one repeat takes at least min_time
+    seconds; the minimum over repeats is the least noisy estimate.
+    """
+    timer = timeit.Timer(func)
+    loops = 1
+    while True:
+        if timer.timeit(loops) >= min_time:
+            break
+        loops *= 2
+    per_call = [t / loops * 1e6 for t in timer.repeat(repeat=repeat, number=loops)]
+    return BenchResult(min(per_call), statistics.median(per_call), loops)
+
+
+def run_benchmarks(
+    name_filter: str = "",
+    repeat: int = 5,
+    min_time: float = 0.2,
+    seed: int = 0,
+) -> dict:
+    """
+    Run every case whose name contains name_filter.
+
+    Returns:
+        {"meta": {...}, "results": {case: BenchResult.to_dict()}}
+    """
+    results = {}
+    for num_players in PLAYER_COUNTS:
+        for fill in FILL_LEVELS:
+            cases = build_cases(num_players, fill, seed)
+            for name, func in cases.items():
+                if name_filter not in name:
+                    continue
+                result = time_case(func, repeat, min_time)
+                logger.info(f"{name:55} {result.min_us:12.1f} us")
+                results[name] = result.to_dict()
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    """
+    Find cases slower than the baseline by more than threshold.
+
+    Min times are compared; cases missing from either run are skipped.
+
+    Args:
+        current: Results of this run
+        baseline: Stored results
+        threshold: Allowed slowdown (0.1 = 10%)
+
+    Returns:
+        Regressions as {"case", "baseline_us", "current_us", "ratio"}
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base or not base["min_us"]:
+            continue
+        ratio = result["min_us"] / base["min_us"]
+        if ratio > 1 + threshold:
+            regressions.append({
+                "case": name,
+                "baseline_us": base["min_us"],
+                "current_us": result["min_us"],
+                "ratio": round(ratio, 3),
+            })
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the rules engine and AI")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare with results stored in this JSON file")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="slowdown over the baseline that counts as a regression (0.2 = 20%%)",
+    )
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat, at least")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    current = run_benchmarks(args.filter, args.repeat, args.min_time, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+            f.write("\n")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, args.threshold)
+    for r in regressions:
+        logger.error(
+            f"REGRESSION {r['case']}: {r['baseline_us']:.1f} -> {r['current_us']:.1f} us "
+            f"(x{r['ratio']})"
+        )
+    if regressions:
+        return 1
+    logger.info(f"No regressions past {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
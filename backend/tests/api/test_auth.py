@@ -4,6 +4,9 @@ Tests for /api/v1/auth/* endpoints.
 
 TDD Status: RED (tests written, implementation pending for some)
 """
+import asyncio
+import threading
+
 import pytest
 from httpx import AsyncClient
 
@@ -253,3 +256,118 @@ class TestGetCurrentUser:
             headers={"Authorization": "Bearer invalid-token"},
         )
         assert response.status_code == 401
+
+
+class TestAuthCache:
+    """Tests for the shared auth dependency's cache"""
+
+    async def register_and_login(self, client: AsyncClient) -> str:
+        """Register a user and return an access token."""
+        await client.post(
+            "/api/v1/auth/register",
+            json={"email": "cache@example.com", "username": "cacheuser", "password": "password123"},
+        )
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": "cache@example.com", "password": "password123"},
+        )
+        return response.json()["tokens"]["access_token"]
+
+    async def test_repeat_requests_skip_the_database(self, client: AsyncClient, db_session):
+        """Should serve a known token and user from the cache."""
+        from sqlalchemy import delete
+        from app.models.user import User
+
+        token = await self.register_and_login(client)
+        headers = {"Authorization": f"Bearer {token}"}
+        assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+
+        # Gone from the database, still served until the entry expires
+        await db_session.execute(delete(User))
+        await db_session.commit()
+        response = await client.get("/api/v1/auth/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["username"] == "cacheuser"
+
+    async def test_deactivation_invalidates_cached_user(self, client: AsyncClient, db_session):
+        """Should reject a user as soon as they are deactivated."""
+        from sqlalchemy import select
+        from app.models.user import User
+
+        token = await self.register_and_login(client)
+        headers = {"Authorization": f"Bearer {token}"}
+        assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+
+        user = (await db_session.execute(select(User))).scalar_one()
+        user.is_active = False
+        await db_session.commit()
+
+        response = await client.get("/api/v1/auth/me", headers=headers)
+        assert response.status_code == 403
+        assert response.json()["detail"] == "User account is disabled"
+
+        response = await client.post("/api/v1/lobbies", json={"name": "Closed"}, headers=headers)
+        assert response.status_code == 401
+
+
+class TestPasswordHasher:
+    """Tests for bcrypt offloading and admission control"""
+
+    async def test_hash_and_verify_off_loop(self):
+        """Should hash and verify on the executor and record timings."""
+        from app.core.security import PasswordHasher
+
+        hasher = PasswordHasher(workers=1, max_pending=4)
+        hashed = await hasher.hash("password123")
+
+        assert await hasher.verify("password123", hashed) is True
+        assert await hasher.verify("wrong", hashed) is False
+        assert hasher.get_stats()["completed"] == 3
+        assert hasher.get_stats()["pending"] == 0
+        hasher.shutdown()
+
+    async def test_cancelled_call_stays_pending_until_bcrypt_finishes(self):
+        """Should keep counting a call whose caller gave up while its thread runs."""
+        from app.core.security import PasswordHasher, PasswordHasherBusy
+
+        hasher = PasswordHasher(workers=1, max_pending=1)
+        started, release = threading.Event(), threading.Event()
+
+        def slow() -> None:
+            started.set()
+            release.wait(5)
+
+        task = asyncio.create_task(hasher._run("hash", slow))
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert hasher.get_stats()["pending"] == 1
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.hash("password123")
+
+        release.set()
+        for _ in range(100):
+            if hasher.get_stats()["pending"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert hasher.get_stats()["pending"] == 0
+        hasher.shutdown()
+
+    async def test_login_refused_when_saturated(self, client: AsyncClient, monkeypatch):
+        """Should answer 503 with Retry-After instead of queueing."""
+        from app.core.security import password_hasher
+
+        monkeypatch.setattr(password_hasher, "max_pending", 0)
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": "busy@example.com", "password": "password123"},
+        )
+        assert response.status_code == 401  # unknown user needs no bcrypt
+
+        response = await client.post(
+            "/api/v1/auth/register",
+            json={"email": "busy@example.com", "username": "busyuser", "password": "password123"},
+        )
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
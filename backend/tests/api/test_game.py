@@ -4,8 +4,17 @@ Tests for /api/v1/games/* endpoints.
 
 TDD Status: RED (skeleton tests, implementation pending)
 """
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import update
+
+from app.models.game import Game, GameStatus
+from app.services.retention_service import RetentionJob, RetentionPolicy
+from app.websocket.game_manager import game_manager
 
 pytestmark = pytest.mark.asyncio
 
@@ -35,6 +44,237 @@ class TestGetGameState:
         pass
 
 
+async def start_game(client: AsyncClient) -> tuple[int, dict, dict]:
+    """Start a two-player game through the lobby API; returns the host's and guest's headers."""
+    headers = []
+    for name in ("etaghost", "etagguest"):
+        await client.post(
+            "/api/v1/auth/register",
+            json={"email": f"{name}@example.com", "username": name, "password": "password123"},
+        )
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": f"{name}@example.com", "password": "password123"},
+        )
+        headers.append({"Authorization": f"Bearer {response.json()['tokens']['access_token']}"})
+    host, guest = headers
+
+    lobby_id = (await client.post("/api/v1/lobbies", json={"name": "ETag"}, headers=host)).json()["id"]
+    await client.post(f"/api/v1/lobbies/{lobby_id}/join", headers=guest)
+    await client.post(f"/api/v1/lobbies/{lobby_id}/ready", json={"is_ready": True}, headers=guest)
+    response = await client.post(f"/api/v1/lobbies/{lobby_id}/start", headers=host)
+    return response.json()["game_id"], host, guest
+
+
+class TestConditionalGet:
+    """Tests for ETag / If-None-Match on game reads"""
+
+    @pytest.mark.parametrize("suffix", ["", "/valid-actions", "/blueprints"])
+    async def test_not_modified_until_version_changes(self, client: AsyncClient, suffix: str):
+        """Should answer 304 while the game version is unchanged."""
+        game_id, host, _ = await start_game(client)
+        url = f"/api/v1/games/{game_id}{suffix}"
+
+        first = await client.get(url, headers=host)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        second = await client.get(url, headers={**host, "If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        assert second.content == b""
+
+        await client.post(
+            f"/api/v1/games/{game_id}/action",
+            json={"action_type": "end_turn", "payload": {"type": "end_turn"}},
+            headers=host,
+        )
+        third = await client.get(url, headers={**host, "If-None-Match": etag})
+        assert third.status_code == 200
+        assert third.headers["etag"] != etag
+
+    async def test_etag_is_per_viewer(self, client: AsyncClient):
+        """Should not let one player's tag match another's projection."""
+        game_id, host, guest = await start_game(client)
+        etag = (await client.get(f"/api/v1/games/{game_id}", headers=host)).headers["etag"]
+
+        response = await client.get(
+            f"/api/v1/games/{game_id}", headers={**guest, "If-None-Match": etag}
+        )
+        assert response.status_code == 200
+
+
+class TestLongPoll:
+    """Tests for GET /api/v1/games/{id}/changes"""
+
+    async def test_returns_at_once_when_behind(self, client: AsyncClient):
+        """Should return the state without waiting if the client is behind."""
+        game_id, host, _ = await start_game(client)
+        await client.post(
+            f"/api/v1/games/{game_id}/action",
+            json={"action_type": "end_turn", "payload": {"type": "end_turn"}},
+            headers=host,
+        )
+
+        response = await client.get(f"/api/v1/games/{game_id}/changes?since=0", headers=host)
+        assert response.status_code == 200
+        assert response.json()["version"] == 1
+
+    async def test_times_out_without_change(self, client: AsyncClient):
+        """Should answer 204 when nothing changes within the timeout."""
+        game_id, host, _ = await start_game(client)
+
+        response = await client.get(
+            f"/api/v1/games/{game_id}/changes?since=0&timeout=0.05", headers=host
+        )
+        assert response.status_code == 204
+        assert game_manager.get_stats()["long_poll_waiters"] == 0
+
+    async def test_wakes_on_state_broadcast(self, client: AsyncClient):
+        """Should return the new state as soon as an action is performed."""
+        game_id, host, guest = await start_game(client)
+        parked = asyncio.create_task(
+            client.get(f"/api/v1/games/{game_id}/changes?since=0&timeout=5", headers=guest)
+        )
+        while game_manager.get_stats()["long_poll_waiters"] == 0:
+            await asyncio.sleep(0.01)
+
+        await client.post(
+            f"/api/v1/games/{game_id}/action",
+            json={"action_type": "end_turn", "payload": {"type": "end_turn"}},
+            headers=host,
+        )
+        response = await asyncio.wait_for(parked, 1)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["version"] == 1
+        # Projected for the waiting player
+        players = data["game_state"]["players"]
+        assert all(("dealt_blueprints" in p) == (p["username"] == "etagguest") for p in players)
+
+
+class TestActionHistory:
+    """Tests for GET /api/v1/games/{id}/actions and /games/actions/export"""
+
+    async def play_opening(self, client: AsyncClient) -> tuple[int, dict, dict, str]:
+        """Host selects a blueprint and ends the turn; returns the blueprint."""
+        game_id, host, guest = await start_game(client)
+        dealt = (await client.get(f"/api/v1/games/{game_id}/blueprints", headers=host)).json()
+        blueprint_id = dealt["dealt_blueprints"][0]["blueprint_id"]
+        for action_type, payload in (
+            ("select_blueprint", {"blueprint_id": blueprint_id}),
+            ("end_turn", {}),
+        ):
+            response = await client.post(
+                f"/api/v1/games/{game_id}/action",
+                json={"action_type": action_type, "payload": {"type": action_type, **payload}},
+                headers=host,
+            )
+            assert response.status_code == 200, response.text
+        return game_id, host, guest, blueprint_id
+
+    async def test_pages_by_keyset(self, client: AsyncClient):
+        """Should page the log oldest first and hide others' blueprint picks."""
+        game_id, host, guest, blueprint_id = await self.play_opening(client)
+        url = f"/api/v1/games/{game_id}/actions"
+
+        first = (await client.get(f"{url}?limit=1", headers=host)).json()
+        assert [a["action_type"] for a in first["actions"]] == ["select_blueprint"]
+        assert first["actions"][0]["payload"] == {"blueprint_id": blueprint_id}
+
+        second = (await client.get(f"{url}?limit=1&after={first['next_after']}", headers=host)).json()
+        assert [a["action_type"] for a in second["actions"]] == ["end_turn"]
+        assert second["next_after"] is None
+
+        seen_by_guest = (await client.get(url, headers=guest)).json()["actions"]
+        assert seen_by_guest[0]["payload"] == {}
+
+    async def test_unknown_game(self, client: AsyncClient):
+        """Should return 404 for a missing game."""
+        _, host, _ = await start_game(client)
+
+        response = await client.get("/api/v1/games/99999/actions", headers=host)
+        assert response.status_code == 404
+
+    async def test_export_streams_ndjson(self, client: AsyncClient):
+        """Should stream one JSON line per action, skipping unknown games."""
+        game_id, _, guest, _ = await self.play_opening(client)
+
+        response = await client.get(
+            f"/api/v1/games/actions/export?game_id={game_id}&game_id=99999", headers=guest
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [(a["game_id"], a["action_type"]) for a in lines] == [
+            (game_id, "select_blueprint"),
+            (game_id, "end_turn"),
+        ]
+        assert lines[0]["payload"] == {}
+
+    async def test_reads_archived_game(self, client: AsyncClient, db_session):
+        """Should serve a finished game, its log and export after it is archived."""
+        archived_id, host, _, blueprint_id = await self.play_opening(client)
+        live_id, _, _, _ = await self.play_opening(client)
+        await db_session.execute(
+            update(Game).where(Game.id == archived_id).values(status=GameStatus.FINISHED)
+        )
+        await db_session.commit()
+        counts = await RetentionJob(policy=RetentionPolicy(batch_pause=0)).run_once(
+            now=datetime.now(timezone.utc) + timedelta(days=2)
+        )
+        assert counts["archived_games"] == 1
+
+        game = await client.get(f"/api/v1/games/{archived_id}", headers=host)
+        assert game.status_code == 200
+        assert game.json()["status"] == "finished"
+        result = await client.get(f"/api/v1/games/{archived_id}/result", headers=host)
+        assert result.status_code == 200
+
+        page = (await client.get(f"/api/v1/games/{archived_id}/actions?limit=1", headers=host)).json()
+        assert page["actions"][0]["payload"] == {"blueprint_id": blueprint_id}
+        assert page["next_after"] is not None
+
+        response = await client.get(
+            f"/api/v1/games/actions/export?game_id={live_id}&game_id={archived_id}", headers=host
+        )
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [a["game_id"] for a in lines] == [archived_id] * 2 + [live_id] * 2
+
+    async def test_export_limits_games(self, client: AsyncClient):
+        """Should reject more games than ACTION_EXPORT_MAX_GAMES."""
+        _, host, _ = await start_game(client)
+        query = "&".join(f"game_id={i}" for i in range(1, 102))
+
+        response = await client.get(f"/api/v1/games/actions/export?{query}", headers=host)
+        assert response.status_code == 400
+
+
+class TestActionMetrics:
+    """Tests for request and action timing on /metrics"""
+
+    async def test_records_route_and_action(self, client: AsyncClient):
+        """Should time the action route and count actions by type and outcome."""
+        game_id, host, _ = await start_game(client)
+        for _ in range(2):
+            # The second is out of turn
+            await client.post(
+                f"/api/v1/games/{game_id}/action",
+                json={"action_type": "end_turn", "payload": {"type": "end_turn"}},
+                headers=host,
+            )
+
+        body = (await client.get("/metrics")).text
+        route = 'method="POST",route="/api/v1/games/{game_id}/action"'
+        assert f"http_request_duration_seconds_count{{{route}}}" in body
+        assert f'http_requests_total{{{route},status="200"}}' in body
+        assert f'http_requests_total{{{route},status="400"}}' in body
+        assert 'game_action_duration_seconds_count{transport="http",action_type="end_turn"}' in body
+        assert 'game_actions_total{transport="http",action_type="end_turn",outcome="ok"}' in body
+        assert 'game_actions_total{transport="http",action_type="end_turn",outcome="error"}' in body
+
+
 class TestGameAction:
     """Tests for POST /api/v1/games/{id}/action"""
 
@@ -21,3 +21,101 @@ async def test_root_endpoint(client: AsyncClient):
     data = response.json()
     assert "message" in data
     assert "version" in data
+
+
+@pytest.mark.asyncio
+async def test_websocket_stats(client: AsyncClient):
+    """Test WebSocket stats endpoint."""
+    response = await client.get("/health/ws")
+    assert response.status_code == 200
+    data = response.json()
+    assert "connections" in data
+    assert "reaped" in data
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_stats(client: AsyncClient):
+    """Test password hasher stats endpoint."""
+    response = await client.get("/health/auth")
+    assert response.status_code == 200
+    data = response.json()
+    assert "pending" in data
+    assert "rejected" in data
+
+
+@pytest.mark.asyncio
+async def test_metrics_password_hasher_timings(client: AsyncClient):
+    """Test /metrics exposes password hashing wait and run times."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={"email": "timed@example.com", "username": "timeduser", "password": "password123"},
+    )
+
+    body = (await client.get("/metrics")).text
+    assert 'password_hash_wait_seconds_count{operation="hash"}' in body
+    assert 'password_hash_run_seconds_count{operation="hash"}' in body
+
+
+@pytest.mark.asyncio
+async def test_metrics_record_queries_per_route(client: AsyncClient):
+    """Test /metrics exposes per-route database histograms."""
+    await client.get("/api/v1/lobbies")
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# TYPE db_queries_per_unit histogram" in body
+    assert 'db_queries_per_unit_count{kind="http",name="/api/v1/lobbies"}' in body
+    assert 'db_queries_per_unit_bucket{kind="http",name="/api/v1/lobbies",le="+Inf"}' in body
+
+
+@pytest.mark.asyncio
+async def test_metrics_websocket_gauges(client: AsyncClient):
+    """Test /metrics reports WebSocket connection counts read at scrape time."""
+    body = (await client.get("/metrics")).text
+    assert "# TYPE ws_connections gauge" in body
+    assert 'ws_connections{channel="game"} 0' in body
+    assert 'ws_connections{channel="lobby"} 0' in body
+
+
+@pytest.mark.asyncio
+async def test_slow_query_log(db_session, monkeypatch, caplog):
+    """Test statements above the threshold are logged and counted."""
+    from sqlalchemy import text
+    from app.core.config import settings
+    from app.core.db_metrics import slow_queries_total, track_queries
+
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0.000001)
+    before = slow_queries_total.value()
+
+    with caplog.at_level("WARNING", logger="app.db.slow"):
+        with track_queries("test", "slow") as stats:
+            await db_session.execute(text("SELECT 1"))
+
+    assert stats.queries == 1
+    assert slow_queries_total.value() == before + 1
+    assert "SELECT 1" in caplog.text
+
+
+def test_route_template_uses_matched_route():
+    """Test metric labels use the matched route's template instead of IDs."""
+    from starlette.routing import Route
+    from app.core.db_metrics import route_template
+
+    # A parameter value equal to a literal segment must not be renamed
+    scope = {"path": "/api/v1/lobbies/join/join", "path_params": {"lobby_id": "join"}}
+    for path in ("/api/v1/lobbies/{lobby_id}/join", "/{lobby_id}/join"):
+        route = Route(path, endpoint=lambda request: None)
+        assert route_template({**scope, "route": route}) == "/api/v1/lobbies/{lobby_id}/join"
+    assert route_template({"path": "/nope"}) == "unmatched"
+
+
+@pytest.mark.asyncio
+async def test_metrics_label_unmatched_paths(client: AsyncClient):
+    """Test requests no route matched share one label."""
+    await client.get("/no/such/path/12345")
+
+    body = (await client.get("/metrics")).text
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"}' in body
+    assert "/no/such/path" not in body
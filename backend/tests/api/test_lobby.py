@@ -75,6 +75,61 @@ class TestCreateLobby:
         assert response.json()["max_players"] == 4
 
 
+class TestListLobbies:
+    """Tests for GET /api/v1/lobbies"""
+
+    async def test_list_lobbies_paginates(self, client: AsyncClient):
+        """Should page through waiting lobbies newest first."""
+        token = await create_user_and_get_token(client, "pager@example.com", "pager")
+        headers = {"Authorization": f"Bearer {token}"}
+        for i in range(5):
+            await client.post("/api/v1/lobbies", json={"name": f"Lobby {i}"}, headers=headers)
+
+        names = []
+        cursor = None
+        for _ in range(3):
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = await client.get("/api/v1/lobbies", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            names += [lobby["name"] for lobby in data["lobbies"]]
+            cursor = data["next_cursor"]
+
+        assert names == [f"Lobby {i}" for i in reversed(range(5))]
+        assert cursor is None
+        summary = data["lobbies"][0]
+        assert summary["host_username"] == "pager"
+        assert summary["player_count"] == 1
+        assert "players" not in summary
+
+    async def test_list_lobbies_invalidated_on_join(self, client: AsyncClient):
+        """Should not serve a cached page after a player joins."""
+        host_token = await create_user_and_get_token(client, "lhost@example.com", "lhost")
+        guest_token = await create_user_and_get_token(client, "lguest@example.com", "lguest")
+        create_response = await client.post(
+            "/api/v1/lobbies",
+            json={"name": "Cached Lobby"},
+            headers={"Authorization": f"Bearer {host_token}"},
+        )
+        lobby_id = create_response.json()["id"]
+
+        first = await client.get("/api/v1/lobbies")
+        assert first.json()["lobbies"][0]["player_count"] == 1
+
+        await client.post(
+            f"/api/v1/lobbies/{lobby_id}/join",
+            headers={"Authorization": f"Bearer {guest_token}"},
+        )
+
+        second = await client.get("/api/v1/lobbies")
+        assert second.json()["lobbies"][0]["player_count"] == 2
+
+    async def test_list_lobbies_invalid_cursor(self, client: AsyncClient):
+        """Should return 400 for a malformed cursor."""
+        response = await client.get("/api/v1/lobbies", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+
 class TestGetLobby:
     """Tests for GET /api/v1/lobbies/{id}"""
 
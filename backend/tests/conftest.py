@@ -8,13 +8,16 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.core import database
 from app.core.database import Base, get_db
+from app.core.db_metrics import instrument_engine
 from app.main import app
 
 # Test database URL (SQLite for testing)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+instrument_engine(engine.sync_engine)
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -48,6 +51,20 @@ async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
 
 
 app.dependency_overrides[get_db] = override_get_db
+# Sessions opened outside request dependencies (session_scope) use the test DB too
+database.async_session_maker = async_session_maker
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    """Drop cached tokens, users, memberships and lobby pages (IDs repeat across tests)."""
+    from app.api.deps import token_cache, user_cache
+    from app.services.lobby_service import list_cache
+    from app.websocket.game_handler import membership_cache
+
+    for cache in (token_cache, user_cache, membership_cache, list_cache):
+        cache.clear()
+    yield
 
 
 @pytest.fixture
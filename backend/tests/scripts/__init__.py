@@ -0,0 +1 @@
+# Developer tool tests module
@@ -0,0 +1,64 @@
+"""
+AI weight tuner tests.
+Tests for in-memory self-play and the hill-climb tuner.
+"""
+import random
+
+from app.services.ai_service import AIWeights, DEFAULT_WEIGHTS
+from scripts.ai_tuner import WeightTuner, play_self_play_game
+
+
+class TestSelfPlay:
+    """Tests for in-memory self-play."""
+
+    async def test_plays_game_to_completion(self):
+        """Should finish a game and score every seat."""
+        random.seed(7)
+
+        scores = await play_self_play_game([DEFAULT_WEIGHTS, DEFAULT_WEIGHTS, DEFAULT_WEIGHTS])
+
+        assert len(scores) == 3
+        assert {s["user_id"] for s in scores} == {-1, -2, -3}
+
+    async def test_seed_replays_same_game(self):
+        """Should replay a seeded game exactly, as paired comparisons assume."""
+        games = []
+        for _ in range(2):
+            random.seed(11)
+            games.append(await play_self_play_game([DEFAULT_WEIGHTS, DEFAULT_WEIGHTS]))
+
+        assert games[0] == games[1]
+
+
+class TestWeightTuner:
+    """Tests for the hill-climb tuner."""
+
+    def test_mutate_keeps_frozen_and_non_negative(self):
+        """Should leave frozen weights alone and never go negative."""
+        tuner = WeightTuner(frozen={"fengshui"}, seed=3)
+        start = AIWeights(remaining_resources=0.0)
+
+        for _ in range(20):
+            mutant = tuner.mutate(start, step_size=2.0)
+            assert mutant.fengshui == start.fengshui
+            assert all(v >= 0 for v in mutant.to_vector())
+
+    def test_paired_advantage_needs_consistent_wins(self):
+        """Should score consistent paired wins above a single lucky game."""
+        tuner = WeightTuner()
+        incumbent = [0.0, 0.0, 0.0, 0.0]
+
+        consistent = tuner._paired_advantage([2.0, 3.0, 2.5, 2.0], incumbent)
+        lucky = tuner._paired_advantage([20.0, -5.0, -5.0, -5.0], incumbent)
+
+        assert consistent > tuner.confidence
+        assert lucky < tuner.confidence
+
+    def test_tune_returns_history(self):
+        """Should run the requested generations serially."""
+        tuner = WeightTuner(games_per_candidate=1, population=1, workers=1, seed=5)
+
+        result = tuner.tune(DEFAULT_WEIGHTS, iterations=2)
+
+        assert len(result.history) == 2
+        assert isinstance(result.weights, AIWeights)
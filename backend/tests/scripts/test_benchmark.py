@@ -0,0 +1,53 @@
+"""
+Micro-benchmark suite tests.
+Tests for scenario generation and baseline comparison.
+"""
+import json
+
+from scripts.benchmark import compare, generate_game, main
+
+
+def results(**timings: float) -> dict:
+    return {"meta": {}, "results": {name: {"min_us": us} for name, us in timings.items()}}
+
+
+class TestGenerateGame:
+    """Tests for generated benchmark boards."""
+
+    def test_fill_level_and_determinism(self):
+        """Should fill the requested share of buildable cells, the same way per seed."""
+        game = generate_game(3, 0.5, seed=7)
+        cells = [cell for row in game.board for cell in row if cell["terrain"] != "mountain"]
+        built = [cell for cell in cells if cell["tile"]]
+
+        assert len(built) == round(len(cells) * 0.5)
+        assert len(game.players) == 3
+        assert all(len(p["blueprints"]) == 1 for p in game.players)
+        assert generate_game(3, 0.5, seed=7).board_json == game.board_json
+
+
+class TestCompare:
+    """Tests for regression detection."""
+
+    def test_flags_slowdowns_past_threshold(self):
+        """Should report only cases slower than the baseline by more than the threshold."""
+        baseline = results(a=100.0, b=100.0, gone=5.0)
+        current = results(a=125.0, b=115.0, new=1.0)
+
+        regressions = compare(current, baseline, threshold=0.2)
+
+        assert [r["case"] for r in regressions] == ["a"]
+        assert regressions[0]["ratio"] == 1.25
+
+    def test_exit_code(self, tmp_path):
+        """Should exit non-zero when a case regressed against the stored baseline."""
+        output = tmp_path / "current.json"
+        args = ["--filter", "tile.", "--repeat", "1", "--min-time", "0.001"]
+        assert main(args + ["--output", str(output)]) == 0
+
+        stored = json.loads(output.read_text())
+        fast = {name: {**r, "min_us": r["min_us"] / 100} for name, r in stored["results"].items()}
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps({**stored, "results": fast}))
+
+        assert main(args + ["--baseline", str(baseline)]) == 1
@@ -0,0 +1,70 @@
+"""
+Load harness tests.
+Tests for bot move selection and latency percentiles (no server needed).
+"""
+import random
+
+from scripts.load_harness import MAX_ACTIONS_PER_TURN, choose_action, percentiles
+
+VALID_ACTIONS = [
+    {
+        "action_type": "place_tile",
+        "available_tiles": [{"tile_id": "hanok_1"}],
+        "valid_positions": [{"row": 1, "col": 1}],
+    },
+    {
+        "action_type": "place_worker",
+        "worker_type": "apprentice",
+        "available_slots": [],
+    },
+    {"action_type": "end_turn"},
+]
+
+
+class TestChooseAction:
+    """Tests for the bots' move choice."""
+
+    def test_selects_blueprint_first(self):
+        """Should pick a dealt blueprint while one is offered."""
+        valid = [
+            {"action_type": "select_blueprint", "available_blueprints": [{"blueprint_id": "bp_1"}]},
+            *VALID_ACTIONS,
+        ]
+
+        action = choose_action(valid, random.Random(0), taken=0)
+
+        assert action == {
+            "action_type": "select_blueprint",
+            "payload": {"type": "select_blueprint", "blueprint_id": "bp_1"},
+        }
+
+    def test_only_offered_moves(self):
+        """Should build from the offered options and skip empty ones."""
+        action = choose_action(VALID_ACTIONS, random.Random(0), taken=0)
+
+        assert action["action_type"] == "place_tile"
+        assert action["payload"]["position"] == {"row": 1, "col": 1}
+
+    def test_ends_turn_after_limit(self):
+        """Should end the turn once enough actions were taken."""
+        action = choose_action(VALID_ACTIONS, random.Random(0), taken=MAX_ACTIONS_PER_TURN)
+
+        assert action["action_type"] == "end_turn"
+
+
+class TestPercentiles:
+    """Tests for latency summaries."""
+
+    def test_percentiles(self):
+        """Should report count, p50/p95/p99 and max."""
+        summary = percentiles([float(i) for i in range(1, 101)])
+
+        assert summary["count"] == 100
+        assert summary["p50"] == 50.5
+        assert 95 <= summary["p95"] <= 96
+        assert summary["max"] == 100.0
+
+    def test_small_series(self):
+        """Should cope with empty and single-sample series."""
+        assert percentiles([]) == {"count": 0}
+        assert percentiles([12.0])["p99"] == 12.0
@@ -0,0 +1,182 @@
+"""
+AI turn scheduler tests.
+Tests for server-driven AI turns in solo games.
+"""
+import json
+
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import WebSocket
+
+from app.models.game import Game, GameStatus
+from app.services.ai_scheduler import AIPacing, AITurnScheduler, run_ai_turn
+from app.services.blueprint_service import BlueprintService
+from app.services.game_service import GameService
+from app.websocket.game_manager import GameConnectionManager
+
+pytestmark = pytest.mark.asyncio
+
+HUMAN_USER_ID = 10
+AI_USER_ID = -1
+
+
+async def create_solo_game(db_session, current_turn: int = AI_USER_ID) -> Game:
+    """Create a 1 human vs 1 AI game with the given player to move."""
+    hands = BlueprintService.deal_blueprints(2, cards_per_player=3)
+
+    human = GameService.create_initial_player(1, HUMAN_USER_ID, "human", "blue", 0, True)
+    human["dealt_blueprints"] = hands[0]
+    human["is_ai"] = False
+
+    ai = GameService.create_initial_player(2, AI_USER_ID, "AI - test", "red", 1, False)
+    ai["dealt_blueprints"] = hands[1]
+    ai["is_ai"] = True
+    ai["ai_difficulty"] = "medium"
+
+    game = Game(
+        lobby_id=None,
+        status=GameStatus.IN_PROGRESS,
+        current_round=1,
+        total_rounds=GameService.TOTAL_ROUNDS,
+        current_turn_player_id=current_turn,
+        turn_order_json=json.dumps([HUMAN_USER_ID, AI_USER_ID]),
+        board_json=json.dumps(GameService.create_initial_board()),
+        players_json=json.dumps([human, ai]),
+        available_tiles_json=json.dumps(GameService.generate_tile_pool()),
+        discarded_tiles_json=json.dumps([]),
+    )
+    db_session.add(game)
+    await db_session.commit()
+    await db_session.refresh(game)
+    return game
+
+
+def sent_types(ws) -> list[str]:
+    """Message types sent to a mock websocket, in order."""
+    return [json.loads(call.args[0])["type"] for call in ws.send_text.call_args_list]
+
+
+class TestRunAITurn:
+    """Tests for playing a whole AI turn in memory."""
+
+    async def test_plays_until_turn_passes(self, db_session):
+        """Should keep acting until the AI ends its turn."""
+        game = await create_solo_game(db_session)
+        player = GameService.get_current_player(game)
+
+        actions = await run_ai_turn(db_session, game, player)
+
+        assert actions[-1]["action_type"] == "end_turn"
+        assert game.current_turn_player_id == HUMAN_USER_ID
+        assert game.version == len(actions)
+
+    async def test_force_ends_turn_at_action_limit(self, db_session):
+        """Should end the turn once the action limit is reached."""
+        game = await create_solo_game(db_session)
+        player = GameService.get_current_player(game)
+
+        actions = await run_ai_turn(db_session, game, player, max_actions=0)
+
+        assert [a["action_type"] for a in actions] == ["end_turn"]
+
+
+class TestAITurnScheduler:
+    """Tests for AITurnScheduler."""
+
+    @pytest.fixture
+    def manager(self):
+        return GameConnectionManager()
+
+    @pytest.fixture
+    def scheduler(self, manager):
+        return AITurnScheduler(manager=manager)
+
+    async def test_plays_ai_turn_and_pushes_actions(self, db_session, manager, scheduler):
+        """Should commit the AI turn and push actions to the human."""
+        game = await create_solo_game(db_session)
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws, game.id, player_id=1)
+        scheduler.set_pacing(game.id, action_delay_ms=0, turn_delay_ms=0)
+
+        assert scheduler.schedule(game.id) is True
+        await scheduler.wait(game.id)
+        await manager.flush(game.id)
+
+        await db_session.refresh(game)
+        assert game.current_turn_player_id == HUMAN_USER_ID
+
+        types = sent_types(ws)
+        assert types[0] == "player_action"
+        assert "game_state_update" in types
+        assert types[-1] == "your_turn"
+
+    async def test_does_nothing_on_human_turn(self, db_session, manager, scheduler):
+        """Should not act when a human is to move."""
+        game = await create_solo_game(db_session, current_turn=HUMAN_USER_ID)
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws, game.id, player_id=1)
+
+        scheduler.schedule(game.id)
+        await scheduler.wait(game.id)
+        await manager.flush(game.id)
+
+        ws.send_text.assert_not_called()
+        assert not scheduler.is_running(game.id)
+
+    async def test_set_pacing_overrides_defaults(self, scheduler):
+        """Should keep per-game pacing overrides."""
+        pacing = scheduler.set_pacing(1, action_delay_ms=50)
+
+        assert pacing.action_delay_ms == 50
+        assert scheduler.get_pacing(1).action_delay_ms == 50
+        assert scheduler.get_pacing(2) == AIPacing()
+
+    async def test_drops_pacing_once_game_is_over(self, db_session, scheduler):
+        """Should forget a game's pacing when it is no longer in progress."""
+        game = await create_solo_game(db_session)
+        scheduler.set_pacing(game.id, action_delay_ms=0, turn_delay_ms=0)
+        game.status = GameStatus.FINISHED
+        await db_session.commit()
+
+        scheduler.schedule(game.id)
+        await scheduler.wait(game.id)
+
+        assert game.id not in scheduler._pacing
+
+    async def test_hides_ai_blueprint_pick_from_opponents(self, db_session, manager, scheduler):
+        """Should not push the AI's chosen blueprint to other seats."""
+        game = await create_solo_game(db_session)
+        ai_hand = game.players[1]["dealt_blueprints"]
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws, game.id, player_id=1)
+        scheduler.set_pacing(game.id, action_delay_ms=0, turn_delay_ms=0)
+
+        scheduler.schedule(game.id)
+        await scheduler.wait(game.id)
+        await manager.flush(game.id)
+
+        messages = [json.loads(call.args[0]) for call in ws.send_text.call_args_list]
+        picks = [
+            m["data"] for m in messages
+            if m["type"] == "player_action" and m["data"]["action_type"] == "select_blueprint"
+        ]
+        assert picks
+        assert all(pick["params"] == {} and pick["result"] == {} for pick in picks)
+        sent = json.dumps(messages)
+        assert not any(f'"{blueprint_id}"' in sent for blueprint_id in ai_hand)
+
+    async def test_locks_game_row_for_the_turn(self, db_session, scheduler, monkeypatch):
+        """Should load the game FOR UPDATE so no other worker plays the same turn."""
+        game = await create_solo_game(db_session)
+        get_game = GameService.get_game
+        calls = []
+
+        async def spy(db, game_id, lock=False):
+            calls.append(lock)
+            return await get_game(db, game_id, lock)
+
+        monkeypatch.setattr(GameService, "get_game", spy)
+
+        await scheduler._play_turn(game.id)
+
+        assert calls == [True]
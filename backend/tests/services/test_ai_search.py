@@ -0,0 +1,173 @@
+"""
+AI search tests.
+Tests for the anytime iterative-deepening search driver.
+"""
+from app.services.ai_search import AnytimeSearch, SearchLimits
+from app.services.ai_service import AIDifficulty, AIService, TurnSearchProblem, DEFAULT_WEIGHTS
+from app.services.game_service import GameService
+
+
+class TreeProblem:
+    """Search problem over a fixed tree: path -> [(move, value)]."""
+
+    def __init__(self, tree: dict[tuple, list[tuple[str, float]]]):
+        self.tree = tree
+        self.path: list[str] = []
+
+    def moves(self):
+        return sorted(self.tree.get(tuple(self.path), []), key=lambda m: m[1], reverse=True)
+
+    def apply(self, move):
+        self.path.append(move)
+
+    def undo(self):
+        self.path.pop()
+
+
+# "greedy" pays most now; "setup" pays off one move later
+TREE = {
+    (): [("greedy", 5.0), ("setup", 3.0)],
+    ("greedy",): [("small", 1.0)],
+    ("setup",): [("big", 10.0)],
+}
+
+
+class FakeClock:
+    """Clock that advances a fixed step on every reading."""
+
+    def __init__(self, step: float):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+class TestAnytimeSearch:
+    """Tests for AnytimeSearch."""
+
+    def test_deeper_search_finds_setup_move(self):
+        """Should prefer the move that pays off later once deep enough."""
+        shallow = AnytimeSearch(SearchLimits(deadline_ms=1000, max_depth=1)).run(TreeProblem(TREE))
+        deep = AnytimeSearch(SearchLimits(deadline_ms=1000, max_depth=3)).run(TreeProblem(TREE))
+
+        assert shallow.move == "greedy"
+        assert deep.move == "setup"
+        assert deep.value == 13.0
+        assert deep.stats.depth == 3
+        assert not deep.stats.timed_out
+
+    def test_deadline_keeps_best_so_far(self):
+        """Should stop on the deadline and return the last completed depth."""
+        # Each clock reading costs 1ms; depth 1 needs 3 readings, depth 2 more
+        search = AnytimeSearch(
+            SearchLimits(deadline_ms=4, max_depth=10),
+            clock=FakeClock(step=0.001),
+        )
+
+        result = search.run(TreeProblem(TREE))
+
+        assert result.stats.timed_out
+        assert result.stats.depth == 1
+        assert result.move == "greedy"
+
+    def test_zero_deadline_still_returns_a_move(self):
+        """Should fall back to the best immediate move."""
+        result = AnytimeSearch(SearchLimits(deadline_ms=0, max_depth=3)).run(TreeProblem(TREE))
+
+        assert result.move == "greedy"
+        assert result.stats.depth == 0
+        assert result.stats.timed_out
+
+    def test_restores_problem_state(self):
+        """Should undo every applied move, even after a timeout."""
+        problem = TreeProblem(TREE)
+
+        AnytimeSearch(SearchLimits(deadline_ms=4, max_depth=10), clock=FakeClock(0.001)).run(problem)
+
+        assert problem.path == []
+
+    def test_no_moves(self):
+        """Should report no move when the problem has none."""
+        result = AnytimeSearch(SearchLimits(deadline_ms=100, max_depth=3)).run(TreeProblem({}))
+
+        assert result.move is None
+
+    def test_branching_limits_children(self):
+        """Should only explore the best children by immediate value."""
+        result = AnytimeSearch(
+            SearchLimits(deadline_ms=1000, max_depth=3, branching=1)
+        ).run(TreeProblem(TREE))
+
+        assert result.move == "greedy"
+
+
+RICH = {"wood": 10, "stone": 10, "tile": 10, "ink": 10}
+
+
+def make_states(resources: dict = RICH) -> tuple[dict, dict]:
+    """Game and player state for a fresh board with a blueprint chosen."""
+    player = GameService.create_initial_player(1, -1, "AI", "blue", 0, True)
+    player["blueprints"] = ["selected"]
+    player["resources"] = dict(resources)
+    game_state = {
+        "board": GameService.create_initial_board(),
+        "available_tiles": GameService.generate_tile_pool(),
+    }
+    return game_state, player
+
+
+class TestTurnSearch:
+    """Tests for searching an AI's turn."""
+
+    def test_hard_decision_reports_search_stats(self):
+        """Should return a legal placement with depth and node counts."""
+        game_state, player = make_states()
+
+        decision = AIService.make_decision(game_state, player, AIDifficulty.HARD, DEFAULT_WEIGHTS)
+
+        assert decision.action_type == "place_tile"
+        assert decision.params["tile_id"] in game_state["available_tiles"][:3]
+        assert decision.search.depth >= 1
+        assert decision.search.nodes > 1
+
+    def test_medium_searches_only_with_limits(self):
+        """Should keep one-ply play unless limits are given."""
+        game_state, player = make_states()
+
+        plain = AIService.make_decision(game_state, player, AIDifficulty.MEDIUM)
+        searched = AIService.make_decision(
+            game_state, player, AIDifficulty.MEDIUM,
+            limits=SearchLimits(deadline_ms=1000, max_depth=2, branching=6),
+        )
+
+        assert plain.search is None
+        assert searched.search is not None
+
+    def test_ends_turn_without_moves(self):
+        """Should end the turn when nothing is affordable or placeable."""
+        game_state, player = make_states({"wood": 0, "stone": 0, "tile": 0, "ink": 0})
+
+        decision = AIService.make_decision(game_state, player, AIDifficulty.HARD)
+
+        assert decision.action_type == "end_turn"
+        assert decision.search.nodes == 1
+
+    def test_simulation_undo_restores_state(self):
+        """Should leave board, resources and tiles unchanged after undo."""
+        game_state, player = make_states()
+        problem = TurnSearchProblem(game_state, player, DEFAULT_WEIGHTS)
+        board_before = [[dict(cell) for cell in row] for row in problem.board]
+        tiles_before = list(problem.available_tiles)
+        resources_before = problem.resources
+
+        move, _ = problem.moves()[0]
+        problem.apply(move)
+        pos = move.params["position"]
+        assert problem.board[pos["row"]][pos["col"]]["tile"]["tile_id"] == move.params["tile_id"]
+        problem.undo()
+
+        assert problem.board == board_before
+        assert problem.available_tiles == tiles_before
+        assert problem.resources == resources_before
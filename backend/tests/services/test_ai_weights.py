@@ -0,0 +1,100 @@
+"""
+AI evaluation weight tests.
+Tests for the AIWeights vector and personality weight files.
+"""
+import json
+
+import pytest
+
+from app.services import ai_service
+from app.services.ai_service import (
+    AI_PERSONALITIES,
+    AIDifficulty,
+    AIService,
+    AIWeights,
+    DEFAULT_WEIGHTS,
+    create_ai_opponent,
+    load_personality_weights,
+)
+from app.services.game_service import GameService
+from app.services.resource_service import Resources
+from app.services.tile_service import TileService
+
+
+class TestAIWeights:
+    """Tests for the AIWeights vector."""
+
+    def test_vector_round_trip(self):
+        """Should convert to a vector and back without loss."""
+        weights = AIWeights(fengshui=3.5, own_tile_bonus=7.0)
+
+        assert AIWeights.from_vector(weights.to_vector()) == weights
+        assert len(weights.to_vector()) == len(AIWeights.field_names())
+
+    def test_from_dict_ignores_unknown_keys(self):
+        """Should ignore keys that are not weights."""
+        weights = AIWeights.from_dict({"fengshui": 1, "unknown": 5})
+
+        assert weights.fengshui == 1.0
+
+    def test_default_weights_match_original_evaluation(self):
+        """Default weights should reproduce total*2 + efficiency + remaining*0.1."""
+        tile_def = TileService.get_tile_definition("residential_1")
+        breakdown = {"base": 2, "fengshui": 1, "adjacency": 1, "total": 4}
+        resources = Resources(wood=5, stone=3, tile=1, ink=1)
+        cost = tile_def.cost
+        total_cost = cost.wood + cost.stone + cost.tile + cost.ink
+        remaining = 10 - total_cost
+
+        score = AIService._evaluate_tile_placement(breakdown, tile_def, resources, DEFAULT_WEIGHTS)
+
+        assert score == pytest.approx(4 * 2 + 4 / max(1, total_cost) + remaining * 0.1)
+
+
+class TestPersonalityWeights:
+    """Tests for loading personality weight files."""
+
+    def test_create_ai_opponent_loads_weights(self):
+        """Should attach the personality's weights from its data file."""
+        ai = create_ai_opponent(1, "feng_shui_master")
+
+        assert ai.personality == "feng_shui_master"
+        assert ai.weights == load_personality_weights("feng_shui_master")
+        assert ai.weights.fengshui > DEFAULT_WEIGHTS.base_points
+
+    def test_missing_file_falls_back_to_defaults(self, tmp_path, monkeypatch):
+        """Should use default weights when no data file exists."""
+        monkeypatch.setattr(ai_service, "AI_WEIGHTS_DIR", tmp_path)
+        load_personality_weights.cache_clear()
+        try:
+            assert load_personality_weights("beginner") == DEFAULT_WEIGHTS
+        finally:
+            load_personality_weights.cache_clear()
+
+    def test_reads_weights_section(self, tmp_path, monkeypatch):
+        """Should read the weights section of a data file."""
+        (tmp_path / "beginner.json").write_text(json.dumps({"weights": {"adjacency": 9}}))
+        monkeypatch.setattr(ai_service, "AI_WEIGHTS_DIR", tmp_path)
+        load_personality_weights.cache_clear()
+        try:
+            assert load_personality_weights("beginner").adjacency == 9.0
+        finally:
+            load_personality_weights.cache_clear()
+
+    def test_medium_ignores_personality(self):
+        """Should keep MEDIUM's one-ply play whatever personality it is given."""
+        player = GameService.create_initial_player(1, -1, "AI", "blue", 0, True)
+        player["blueprints"] = ["selected"]
+        player["resources"] = {"wood": 2, "stone": 1, "tile": 0, "ink": 0}
+        # A choice the tuned evaluation would make differently
+        game_state = {
+            "board": GameService.create_initial_board(),
+            "available_tiles": ["commercial_2", "residential_4"],
+        }
+
+        plain = AIService.make_decision(game_state, player, AIDifficulty.MEDIUM)
+        for personality in AI_PERSONALITIES:
+            weights = load_personality_weights(personality)
+            decision = AIService.make_decision(game_state, player, AIDifficulty.MEDIUM, weights)
+            assert (decision.action_type, decision.params) == (plain.action_type, plain.params)
+        assert plain.params["tile_id"] == "commercial_2"
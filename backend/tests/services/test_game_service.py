@@ -324,6 +324,7 @@ class TestToGameStateResponse:
         game.current_round = 2
         game.total_rounds = 4
         game.current_turn_player_id = 1
+        game.version = 7
         game.turn_order = [1, 2]
         game.board = [[]]
         game.players = []
@@ -339,6 +340,7 @@ class TestToGameStateResponse:
         assert response["current_round"] == 2
         assert response["total_rounds"] == 4
         assert response["current_turn_player_id"] == 1
+        assert response["version"] == 7
         assert response["turn_order"] == [1, 2]
 
     def test_only_shows_top_three_tiles(self):
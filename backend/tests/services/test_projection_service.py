@@ -0,0 +1,46 @@
+"""
+State projection tests
+"""
+from app.services.projection_service import StateProjectionService
+
+STATE = {
+    "id": 1,
+    "players": [
+        {"id": 1, "user_id": 10, "score": 0, "dealt_blueprints": ["bp_1", "bp_2"], "blueprints": []},
+        {"id": 2, "user_id": 20, "score": 4, "dealt_blueprints": [], "blueprints": ["bp_9"]},
+    ],
+}
+
+
+class TestStateProjection:
+    """Test public and per-user views"""
+
+    def test_public_view_hides_hands(self):
+        """Test private fields become counts and the input is untouched"""
+        public = StateProjectionService.public_view(STATE)
+
+        assert public["players"][0] == {
+            "id": 1, "user_id": 10, "score": 0, "dealt_blueprint_count": 2, "blueprint_count": 0,
+        }
+        assert public["players"][1]["blueprint_count"] == 1
+        assert "dealt_blueprints" in STATE["players"][0]
+
+    def test_for_user_reveals_only_own_hand(self):
+        """Test a player sees their own fields and the counts of others"""
+        view = StateProjectionService.for_user(STATE, 20)
+
+        assert view["players"][1]["blueprints"] == ["bp_9"]
+        assert "dealt_blueprints" not in view["players"][0]
+
+    def test_spectator_gets_public_view(self):
+        """Test a non-player sees no private fields"""
+        view = StateProjectionService.for_user(STATE, 99)
+        assert view == StateProjectionService.public_view(STATE)
+
+    def test_private_parts(self):
+        """Test private fields are split out by seat"""
+        parts = StateProjectionService.private_parts(STATE)
+        assert parts == {
+            1: {"dealt_blueprints": ["bp_1", "bp_2"], "blueprints": []},
+            2: {"dealt_blueprints": [], "blueprints": ["bp_9"]},
+        }
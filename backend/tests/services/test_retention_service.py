@@ -0,0 +1,147 @@
+"""
+Retention job tests.
+Finished games move to game_archives, old archives and abandoned lobbies are deleted.
+"""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.game import Game, GameAction, GameArchive, GameStatus
+from app.models.lobby import Lobby, LobbyPlayer, LobbyStatus, PlayerColor
+from app.models.user import User
+from app.services.lobby_service import wait_for_notifications
+from app.services.retention_service import RetentionJob, RetentionPolicy, RetentionService
+
+pytestmark = pytest.mark.asyncio
+
+NOW = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def ago(**kwargs) -> datetime:
+    return NOW - timedelta(**kwargs)
+
+
+@pytest.fixture
+async def user(db_session) -> User:
+    user = User(email="host@example.com", username="host", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+async def create_finished_game(db_session, user: User, finished_at: datetime) -> Game:
+    """A started lobby with a finished game and two recorded actions."""
+    lobby = Lobby(name="Done", host_id=user.id, status=LobbyStatus.STARTED, created_at=finished_at)
+    lobby.players.append(LobbyPlayer(user_id=user.id, color=PlayerColor.BLUE, turn_order=0))
+    db_session.add(lobby)
+    await db_session.flush()
+
+    game = Game(
+        lobby_id=lobby.id,
+        status=GameStatus.FINISHED,
+        current_turn_player_id=user.id,
+        players_json=json.dumps([{"user_id": user.id, "username": "host", "final_score": 42}]),
+        updated_at=finished_at,
+    )
+    game.actions = [
+        GameAction(player_id=user.id, action_type="place_worker", payload_json='{"slot": 1}'),
+        GameAction(player_id=user.id, action_type="end_turn", payload_json="{}"),
+    ]
+    db_session.add(game)
+    await db_session.flush()
+    lobby.game_id = game.id
+    await db_session.commit()
+    return game
+
+
+async def count(db_session, model) -> int:
+    return (await db_session.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+def job(**policy) -> RetentionJob:
+    return RetentionJob(policy=RetentionPolicy(batch_pause=0, **policy))
+
+
+class TestArchiveFinishedGames:
+    """Tests for moving finished games to game_archives."""
+
+    async def test_archives_old_games_only(self, db_session, user):
+        """Should archive games finished before the cutoff with their logs and lobbies."""
+        old = await create_finished_game(db_session, user, ago(days=2))
+        recent = await create_finished_game(db_session, user, ago(hours=1))
+
+        counts = await job().run_once(now=NOW)
+
+        assert counts["archived_games"] == 1
+        db_session.expunge_all()
+        remaining = (await db_session.execute(select(Game.id))).scalars().all()
+        assert remaining == [recent.id]
+        assert await count(db_session, GameAction) == 2
+        assert await count(db_session, Lobby) == 1
+
+        archive = await db_session.get(GameArchive, old.id)
+        assert archive.action_count == 2
+        assert archive.players == [{"user_id": user.id, "username": "host", "final_score": 42}]
+
+    async def test_archive_round_trips(self, db_session, user):
+        """Should keep the game row and the action log in order."""
+        game = await create_finished_game(db_session, user, ago(days=2))
+
+        await job().run_once(now=NOW)
+
+        archive = await db_session.get(GameArchive, game.id)
+        document = RetentionService.read_archive(archive)
+        assert document["game"]["status"] == "finished"
+        assert json.loads(document["game"]["players_json"])[0]["final_score"] == 42
+        assert [a["action_type"] for a in document["actions"]] == ["place_worker", "end_turn"]
+
+    async def test_works_in_batches(self, db_session, user):
+        """Should stop after max_batches and leave the rest for the next run."""
+        for _ in range(3):
+            await create_finished_game(db_session, user, ago(days=2))
+
+        first = await job(batch_size=1, max_batches=2).run_once(now=NOW)
+        second = await job(batch_size=1, max_batches=2).run_once(now=NOW)
+
+        assert first["archived_games"] == 2
+        assert second["archived_games"] == 1
+        assert await count(db_session, GameArchive) == 3
+
+
+class TestPurge:
+    """Tests for deleting expired archives and abandoned lobbies."""
+
+    async def test_purges_expired_archives(self, db_session, user):
+        """Should delete archives past the retention period."""
+        expired = await create_finished_game(db_session, user, ago(days=31))
+        kept = await create_finished_game(db_session, user, ago(days=2))
+
+        # Archived and then purged in the same run
+        counts = await job().run_once(now=NOW)
+
+        assert counts == {"archived_games": 2, "purged_archives": 1, "purged_lobbies": 0}
+        db_session.expunge_all()
+        ids = (await db_session.execute(select(GameArchive.game_id))).scalars().all()
+        assert ids == [kept.id]
+        assert expired.id not in ids
+
+    async def test_purges_abandoned_lobbies(self, db_session, user):
+        """Should delete old waiting lobbies without recent joins."""
+        abandoned = Lobby(name="Old", host_id=user.id, created_at=ago(days=2))
+        abandoned.players.append(LobbyPlayer(user_id=user.id, color=PlayerColor.BLUE, turn_order=0, joined_at=ago(days=2)))
+        rejoined = Lobby(name="Rejoined", host_id=user.id, created_at=ago(days=2))
+        rejoined.players.append(LobbyPlayer(user_id=user.id, color=PlayerColor.BLUE, turn_order=0, joined_at=ago(hours=1)))
+        fresh = Lobby(name="Fresh", host_id=user.id, created_at=ago(hours=1))
+        db_session.add_all([abandoned, rejoined, fresh])
+        await db_session.commit()
+
+        counts = await job().run_once(now=NOW)
+        await wait_for_notifications()
+
+        assert counts["purged_lobbies"] == 1
+        db_session.expunge_all()
+        names = (await db_session.execute(select(Lobby.name).order_by(Lobby.id))).scalars().all()
+        assert names == ["Rejoined", "Fresh"]
+        assert await count(db_session, LobbyPlayer) == 1
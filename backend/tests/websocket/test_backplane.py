@@ -0,0 +1,128 @@
+"""
+WebSocket backplane tests
+Two managers sharing an in-process hub stand in for two server workers.
+"""
+import json
+
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import WebSocket
+
+from app.websocket.backplane import InProcessBackplane, InProcessHub, create_backplane, RedisBackplane
+from app.websocket.game_manager import GameConnectionManager, GameMessage, MessageType
+
+pytestmark = pytest.mark.asyncio
+
+
+def sent(ws) -> list[dict]:
+    """Messages sent to a mock websocket, decoded."""
+    return [json.loads(call.args[0]) for call in ws.send_text.call_args_list]
+
+
+@pytest.fixture
+async def workers():
+    """Two started managers connected through one hub."""
+    hub = InProcessHub()
+    first = GameConnectionManager(backplane=InProcessBackplane(hub), replay_retention=0)
+    second = GameConnectionManager(backplane=InProcessBackplane(hub), replay_retention=0)
+    await first.start()
+    await second.start()
+    yield first, second
+    await first.shutdown()
+    await second.shutdown()
+
+
+class TestBackplaneFanOut:
+    """Test delivery across managers"""
+
+    async def test_broadcast_reaches_other_worker(self, workers):
+        """Test a broadcast reaches players connected to another worker"""
+        first, second = workers
+        local = AsyncMock(spec=WebSocket)
+        remote = AsyncMock(spec=WebSocket)
+        await first.connect(local, 1, player_id=1)
+        await second.connect(remote, 1, player_id=2)
+
+        await first.broadcast_to_game(1, GameMessage(type=MessageType.PLAYER_ACTION, data={"n": 1}))
+        await first.flush()
+        await second.flush()
+
+        # Each worker numbers the room's messages itself
+        assert sent(local) == sent(remote) == [{"type": "player_action", "data": {"n": 1}, "seq": 1}]
+
+    async def test_exclusion_applies_on_every_worker(self, workers):
+        """Test the excluded player is skipped on the remote worker too"""
+        first, second = workers
+        remote = AsyncMock(spec=WebSocket)
+        await second.connect(remote, 1, player_id=2)
+
+        await first.broadcast_to_game(
+            1, GameMessage(type=MessageType.PLAYER_JOINED), exclude_player_id=2
+        )
+        await second.flush()
+
+        remote.send_text.assert_not_called()
+
+    async def test_send_to_player_on_other_worker(self, workers):
+        """Test a direct message is forwarded when the player is remote"""
+        first, second = workers
+        remote = AsyncMock(spec=WebSocket)
+        await second.connect(remote, 1, player_id=2)
+
+        queued_locally = await first.send_to_player(1, 2, GameMessage(type=MessageType.YOUR_TURN))
+        await second.flush()
+
+        assert queued_locally is False
+        assert [m["type"] for m in sent(remote)] == ["your_turn"]
+
+    async def test_state_deltas_use_each_workers_base(self, workers):
+        """Test remote workers diff published states against their own base"""
+        first, second = workers
+        remote = AsyncMock(spec=WebSocket)
+        await second.connect(remote, 1, player_id=2)
+        await second.send_state_snapshot(1, 2, {"n": 0}, 1)
+        await second.flush()
+
+        await first.broadcast_state(1, {"n": 1}, 2)
+        await second.flush()
+
+        update = sent(remote)[-1]["data"]
+        assert update["base_version"] == 1
+        assert update["patch"] == [{"op": "replace", "path": "/n", "value": 1}]
+        # No local room, so the publisher keeps no base
+        assert first.state_tracker.get(1) is None
+
+    async def test_unsubscribes_when_room_empties(self, workers):
+        """Test a worker stops receiving a game once its last member leaves"""
+        first, second = workers
+        remote = AsyncMock(spec=WebSocket)
+        await second.connect(remote, 1, player_id=2)
+        second.disconnect(1, 2, remote)
+
+        assert not second.backplane.is_subscribed(1)
+        await first.broadcast_to_game(1, GameMessage(type=MessageType.PING))
+        remote.send_text.assert_not_called()
+
+    async def test_publish_failure_keeps_local_delivery(self):
+        """Test local players still receive events when publishing fails"""
+        backplane = InProcessBackplane()
+        backplane.publish = AsyncMock(side_effect=ConnectionError("redis down"))
+        manager = GameConnectionManager(backplane=backplane)
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws, 1, player_id=1)
+
+        await manager.broadcast_to_game(1, GameMessage(type=MessageType.PING))
+        await manager.flush()
+
+        assert [m["type"] for m in sent(ws)] == ["ping"]
+
+
+class TestCreateBackplane:
+    """Test backplane selection"""
+
+    def test_kinds(self):
+        """Test settings values map to implementations"""
+        assert isinstance(create_backplane("memory", "redis://x"), InProcessBackplane)
+        assert isinstance(create_backplane("redis", "redis://x"), RedisBackplane)
+        with pytest.raises(ValueError):
+            create_backplane("carrier-pigeon", "")
@@ -0,0 +1,92 @@
+"""
+WebSocket frame codec tests
+"""
+import json
+
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import WebSocket
+
+from app.websocket.codec import (
+    JSON_CODEC,
+    JSON_SUBPROTOCOL,
+    MSGPACK_SUBPROTOCOL,
+    FLAG_COMPRESSED,
+    available_codecs,
+    negotiate,
+)
+from app.websocket.game_manager import GameConnectionManager, GameMessage, MessageType
+
+msgpack = pytest.importorskip("msgpack")
+
+from app.websocket.codec import MsgpackCodec  # noqa: E402
+
+
+class TestMsgpackCodec:
+    """Test binary frame encoding"""
+
+    def test_round_trip(self):
+        """Test a small message is sent uncompressed and decodes back"""
+        codec = MsgpackCodec(compress_min_bytes=1024)
+        message = {"type": "state_update", "data": {"board": [[None, 1]], "name": "한양"}}
+
+        frame = codec.encode(message)
+
+        assert frame[0] == 0
+        assert MsgpackCodec.decode(frame) == message
+
+    def test_large_frames_are_compressed(self):
+        """Test bodies over the threshold are zlib-compressed"""
+        codec = MsgpackCodec(compress_min_bytes=64)
+        message = {"type": "game_state", "data": {"log": ["placed worker"] * 100}}
+
+        frame = codec.encode(message)
+
+        assert frame[0] & FLAG_COMPRESSED
+        assert len(frame) < len(msgpack.packb(message))
+        assert MsgpackCodec.decode(frame) == message
+
+    def test_zero_threshold_disables_compression(self):
+        """Test compress_min_bytes=0 never compresses"""
+        codec = MsgpackCodec(compress_min_bytes=0)
+        frame = codec.encode({"data": "x" * 5000})
+        assert frame[0] == 0
+
+
+class TestNegotiate:
+    """Test subprotocol selection"""
+
+    def test_first_supported_wins(self):
+        """Test the client's preference order is honoured"""
+        codecs = available_codecs(1024, 6)
+        codec, subprotocol = negotiate(["v0.bogus", MSGPACK_SUBPROTOCOL, JSON_SUBPROTOCOL], codecs)
+        assert subprotocol == MSGPACK_SUBPROTOCOL
+        assert codec.name == "msgpack"
+
+    def test_defaults_to_json(self):
+        """Test clients offering nothing known get JSON and no subprotocol"""
+        assert negotiate([], available_codecs(1024, 6)) == (JSON_CODEC, None)
+        assert negotiate(["graphql-ws"], available_codecs(1024, 6)) == (JSON_CODEC, None)
+
+
+@pytest.mark.asyncio
+class TestMixedRoom:
+    """Test a room with JSON and MessagePack clients"""
+
+    async def test_each_client_gets_its_format(self):
+        """Test one broadcast goes out as text and as binary frames"""
+        manager = GameConnectionManager(replay_retention=0)
+        text_ws = AsyncMock(spec=WebSocket)
+        binary_ws = AsyncMock(spec=WebSocket)
+        codec, subprotocol = manager.negotiate([MSGPACK_SUBPROTOCOL])
+
+        await manager.connect(text_ws, 1, player_id=1)
+        await manager.connect(binary_ws, 1, player_id=2, codec=codec, subprotocol=subprotocol)
+        await manager.broadcast_to_game(1, GameMessage(type=MessageType.PLAYER_ACTION, data={"n": 1}))
+        await manager.flush()
+
+        expected = {"type": "player_action", "data": {"n": 1}, "seq": 1}
+        binary_ws.accept.assert_called_once_with(subprotocol=MSGPACK_SUBPROTOCOL)
+        assert json.loads(text_ws.send_text.call_args.args[0]) == expected
+        assert MsgpackCodec.decode(binary_ws.send_bytes.call_args.args[0]) == expected
+        binary_ws.send_text.assert_not_called()
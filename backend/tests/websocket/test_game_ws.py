@@ -1,9 +1,14 @@
 """
 WebSocket game synchronization tests
 """
+import asyncio
+import json
+import time
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi import WebSocket, WebSocketDisconnect
+from app.websocket.connection import RESYNC_CLOSE_REASON, STALE_CLOSE_CODE, STALE_CLOSE_REASON
 from app.websocket.game_manager import GameConnectionManager, GameMessage, MessageType
 
 
@@ -20,7 +25,7 @@ class TestGameConnectionManager:
         """Create a mock WebSocket"""
         ws = AsyncMock(spec=WebSocket)
         ws.accept = AsyncMock()
-        ws.send_json = AsyncMock()
+        ws.send_text = AsyncMock()
         ws.close = AsyncMock()
         return ws
 
@@ -90,9 +95,10 @@ class TestGameConnectionManager:
             data={"current_round": 1}
         )
         await manager.broadcast_to_game(game_id, message)
+        await manager.flush()
 
-        ws1.send_json.assert_called_once()
-        ws2.send_json.assert_called_once()
+        ws1.send_text.assert_called_once()
+        ws2.send_text.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_broadcast_excludes_sender(self, manager):
@@ -109,9 +115,10 @@ class TestGameConnectionManager:
             data={"action": "place_tile"}
         )
         await manager.broadcast_to_game(game_id, message, exclude_player_id=1)
+        await manager.flush()
 
-        ws1.send_json.assert_not_called()
-        ws2.send_json.assert_called_once()
+        ws1.send_text.assert_not_called()
+        ws2.send_text.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_send_to_player_sends_to_specific_player(self, manager):
@@ -128,9 +135,10 @@ class TestGameConnectionManager:
             data={"message": "It's your turn"}
         )
         await manager.send_to_player(game_id, player_id=1, message=message)
+        await manager.flush()
 
-        ws1.send_json.assert_called_once()
-        ws2.send_json.assert_not_called()
+        ws1.send_text.assert_called_once()
+        ws2.send_text.assert_not_called()
 
     # Message type tests
     def test_game_message_serialization(self):
@@ -165,7 +173,7 @@ class TestGameConnectionManager:
         game_id = 1
         ws1 = AsyncMock(spec=WebSocket)
         ws2 = AsyncMock(spec=WebSocket)
-        ws1.send_json.side_effect = Exception("Connection closed")
+        ws1.send_text.side_effect = Exception("Connection closed")
 
         await manager.connect(ws1, game_id, player_id=1)
         await manager.connect(ws2, game_id, player_id=2)
@@ -174,9 +182,93 @@ class TestGameConnectionManager:
 
         # Should not raise exception
         await manager.broadcast_to_game(game_id, message)
+        await manager.flush()
 
         # ws2 should still receive the message
-        ws2.send_json.assert_called_once()
+        ws2.send_text.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_broadcast_encodes_once(self, manager):
+        """Test broadcast sends the same encoded payload to every player"""
+        game_id = 1
+        ws1 = AsyncMock(spec=WebSocket)
+        ws2 = AsyncMock(spec=WebSocket)
+
+        await manager.connect(ws1, game_id, player_id=1)
+        await manager.connect(ws2, game_id, player_id=2)
+
+        message = GameMessage(type=MessageType.GAME_STATE_UPDATE, data={"round": 2})
+        with patch.object(GameMessage, "encode", autospec=True, side_effect=GameMessage.encode) as encode:
+            await manager.broadcast_to_game(game_id, message)
+            await manager.flush()
+
+        encode.assert_called_once()
+        payload = ws1.send_text.call_args.args[0]
+        assert ws2.send_text.call_args.args[0] is payload
+        assert json.loads(payload) == {**message.to_dict(), "seq": 1}
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_delay_others(self):
+        """Test a stalled send times out without holding up other players"""
+        manager = GameConnectionManager(send_timeout=0.05)
+        game_id = 1
+        slow = AsyncMock(spec=WebSocket)
+        fast = AsyncMock(spec=WebSocket)
+        delivered = asyncio.Event()
+
+        async def stall(_):
+            await asyncio.sleep(10)
+
+        async def record(_):
+            delivered.set()
+
+        slow.send_text.side_effect = stall
+        fast.send_text.side_effect = record
+
+        await manager.connect(slow, game_id, player_id=1)
+        await manager.connect(fast, game_id, player_id=2)
+
+        broadcast = asyncio.create_task(
+            manager.broadcast_to_game(game_id, GameMessage(type=MessageType.PING))
+        )
+        await asyncio.wait_for(delivered.wait(), timeout=0.04)
+        await asyncio.wait_for(broadcast, timeout=1)
+        await asyncio.wait_for(manager.flush(), timeout=1)
+
+        assert manager.get_connected_players(game_id) == [2]
+
+    @pytest.mark.asyncio
+    async def test_disconnect_keeps_newer_connection(self, manager):
+        """Test a stale socket's disconnect does not drop a reconnected player"""
+        game_id = 1
+        old = AsyncMock(spec=WebSocket)
+        new = AsyncMock(spec=WebSocket)
+
+        await manager.connect(old, game_id, player_id=1)
+        await manager.connect(new, game_id, player_id=1)
+        manager.disconnect(game_id, 1, old)
+
+        assert manager.active_connections[game_id][1] is new
+
+    @pytest.mark.asyncio
+    async def test_broadcast_tolerates_disconnect_during_send(self, manager):
+        """Test the room can change while a broadcast is in flight"""
+        game_id = 1
+        ws1 = AsyncMock(spec=WebSocket)
+        ws2 = AsyncMock(spec=WebSocket)
+
+        async def leave(_):
+            manager.disconnect(game_id, 2)
+
+        ws1.send_text.side_effect = leave
+
+        await manager.connect(ws1, game_id, player_id=1)
+        await manager.connect(ws2, game_id, player_id=2)
+
+        await manager.broadcast_to_game(game_id, GameMessage(type=MessageType.PING))
+        await manager.flush()
+
+        assert manager.get_connected_players(game_id) == [1]
 
     @pytest.mark.asyncio
     async def test_get_connected_players(self, manager):
@@ -211,6 +303,212 @@ class TestGameConnectionManager:
         assert manager.is_player_connected(game_id, player_id)
 
 
+class TestOutboundQueues:
+    """Test per-connection queues, coalescing and slow-client eviction"""
+
+    @staticmethod
+    def blocked_websocket() -> tuple[AsyncMock, asyncio.Event]:
+        """WebSocket whose sends wait until the returned event is set"""
+        ws = AsyncMock(spec=WebSocket)
+        gate = asyncio.Event()
+
+        async def send_text(_):
+            await gate.wait()
+
+        ws.send_text.side_effect = send_text
+        return ws, gate
+
+    @pytest.mark.asyncio
+    async def test_state_updates_coalesce_to_latest(self):
+        """Test pending state updates are superseded by the newest one"""
+        manager = GameConnectionManager()
+        ws, gate = self.blocked_websocket()
+        await manager.connect(ws, 1, player_id=1)
+
+        await manager.broadcast_to_game(1, GameMessage(type=MessageType.PING))
+        await asyncio.sleep(0)  # writer takes the ping and blocks on it
+        for version in (1, 2, 3):
+            await manager.broadcast_to_game(
+                1, GameMessage(type=MessageType.GAME_STATE_UPDATE, data={"version": version})
+            )
+            if version == 1:
+                await manager.broadcast_to_game(
+                    1, GameMessage(type=MessageType.PLAYER_ACTION, data={"action": "place_tile"})
+                )
+
+        assert manager.get_pending_count(1, 1) == 2
+        gate.set()
+        await manager.flush()
+
+        sent = [json.loads(call.args[0]) for call in ws.send_text.call_args_list]
+        assert [m["type"] for m in sent] == ["ping", "player_action", "game_state_update"]
+        assert sent[-1]["data"]["version"] == 3
+
+    @pytest.mark.asyncio
+    async def test_full_queue_closes_with_resync_hint(self):
+        """Test a client whose queue overflows is closed and removed"""
+        manager = GameConnectionManager(max_queue=2)
+        ws, _ = self.blocked_websocket()
+        await manager.connect(ws, 1, player_id=1)
+
+        for i in range(4):
+            await manager.broadcast_to_game(
+                1, GameMessage(type=MessageType.PLAYER_ACTION, data={"n": i})
+            )
+        await manager.flush()
+
+        assert not manager.is_player_connected(1, 1)
+        ws.close.assert_called_once_with(code=4008, reason=RESYNC_CLOSE_REASON)
+
+    @pytest.mark.asyncio
+    async def test_lagging_client_is_evicted(self):
+        """Test a client whose oldest queued message is too old is closed"""
+        manager = GameConnectionManager(max_lag=0.01)
+        ws, _ = self.blocked_websocket()
+        await manager.connect(ws, 1, player_id=1)
+
+        await manager.broadcast_to_game(1, GameMessage(type=MessageType.PLAYER_ACTION))
+        await asyncio.sleep(0)
+        await manager.broadcast_to_game(1, GameMessage(type=MessageType.PLAYER_ACTION))
+        await asyncio.sleep(0.02)
+        await manager.broadcast_to_game(1, GameMessage(type=MessageType.PLAYER_ACTION))
+        await manager.flush()
+
+        assert not manager.is_player_connected(1, 1)
+        ws.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_affect_others(self):
+        """Test other players keep receiving while one client is stuck"""
+        manager = GameConnectionManager(max_queue=2)
+        slow, _ = self.blocked_websocket()
+        fast = AsyncMock(spec=WebSocket)
+        await manager.connect(slow, 1, player_id=1)
+        await manager.connect(fast, 1, player_id=2)
+
+        for i in range(5):
+            await manager.broadcast_to_game(
+                1, GameMessage(type=MessageType.PLAYER_ACTION, data={"n": i})
+            )
+            await asyncio.sleep(0.005)
+        await manager.flush()
+
+        assert fast.send_text.call_count == 5
+        assert manager.get_connected_players(1) == [2]
+
+
+class TestStateUpdates:
+    """Test versioned delta state updates"""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_state_sends_delta_after_snapshot(self):
+        """Test a joining player gets a snapshot and later updates as patches"""
+        manager = GameConnectionManager()
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws, 1, player_id=1)
+
+        await manager.send_state_snapshot(1, 1, {"round": 1, "tiles": ["a", "b"]}, 4)
+        await manager.flush()
+        await manager.broadcast_state(1, {"round": 1, "tiles": ["b"]}, 5)
+        await manager.flush()
+
+        snapshot, delta = [json.loads(call.args[0])["data"] for call in ws.send_text.call_args_list]
+        assert snapshot == {"version": 4, "game_state": {"round": 1, "tiles": ["a", "b"]}}
+        assert delta["version"] == 5
+        assert delta["base_version"] == 4
+        assert "game_state" not in delta
+
+    @pytest.mark.asyncio
+    async def test_pending_deltas_are_merged(self):
+        """Test coalesced deltas reach a slow client as one chained patch"""
+        manager = GameConnectionManager()
+        ws, gate = TestOutboundQueues.blocked_websocket()
+        await manager.connect(ws, 1, player_id=1)
+        await manager.send_state_snapshot(1, 1, {"n": 0}, 1)
+        await asyncio.sleep(0)  # writer takes the snapshot and blocks on it
+
+        for n in (1, 2, 3):
+            await manager.broadcast_state(1, {"n": n}, 1 + n)
+        gate.set()
+        await manager.flush()
+
+        sent = [json.loads(call.args[0])["data"] for call in ws.send_text.call_args_list]
+        assert len(sent) == 2
+        assert sent[1]["base_version"] == 1
+        assert sent[1]["version"] == 4
+        assert sent[1]["patch"][-1] == {"op": "replace", "path": "/n", "value": 3}
+
+    @pytest.mark.asyncio
+    async def test_empty_room_forgets_state(self):
+        """Test the delta base is dropped once the last player leaves"""
+        manager = GameConnectionManager(replay_retention=0)
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws, 1, player_id=1)
+        await manager.broadcast_state(1, {"n": 1}, 1)
+
+        manager.disconnect(1, 1, ws)
+
+        assert manager.state_tracker.get(1) is None
+
+
+class TestHeartbeats:
+    """Test server heartbeats and the sweeper"""
+
+    @pytest.fixture
+    def manager(self):
+        return GameConnectionManager(heartbeat_interval=10, stale_after=30, replay_retention=20)
+
+    @pytest.mark.asyncio
+    async def test_quiet_client_is_pinged(self, manager):
+        """Test a client silent for a heartbeat interval gets a ping"""
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws, 1, player_id=1)
+
+        manager.sweep(now=time.monotonic() + 5)
+        await manager.flush()
+        ws.send_text.assert_not_called()
+
+        manager.sweep(now=time.monotonic() + 15)
+        await manager.flush()
+        assert json.loads(ws.send_text.call_args.args[0])["type"] == "ping"
+
+    @pytest.mark.asyncio
+    async def test_stale_client_is_reaped(self, manager):
+        """Test a client silent past stale_after is closed and removed"""
+        stale = AsyncMock(spec=WebSocket)
+        live = AsyncMock(spec=WebSocket)
+        await manager.connect(stale, 1, player_id=1)
+        await manager.connect(live, 1, player_id=2)
+
+        manager.touch(live)
+        manager._outboxes[id(live)].last_seen += 40
+        reaped = manager.sweep(now=time.monotonic() + 35)
+        await manager.flush()
+
+        assert reaped == 1
+        assert manager.get_connected_players(1) == [2]
+        stale.close.assert_called_once_with(code=STALE_CLOSE_CODE, reason=STALE_CLOSE_REASON)
+
+    @pytest.mark.asyncio
+    async def test_stats_and_room_expiry(self, manager):
+        """Test counts reflect reaping and retained rooms expire on sweep"""
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws, 1, player_id=1)
+        assert manager.get_stats()["connections"] == 1
+
+        manager.sweep(now=time.monotonic() + 35)
+        await manager.flush()
+        stats = manager.get_stats()
+        assert (stats["connections"], stats["rooms"], stats["retained_rooms"]) == (0, 0, 1)
+
+        manager.sweep(now=time.monotonic() + 60)
+        stats = manager.get_stats()
+        assert stats["retained_rooms"] == 0
+        assert stats["sweeps"] == 2
+        assert stats["reaped"] == 1
+        assert stats["rooms_expired"] == 1
+
+
 class TestGameWebSocketEndpoint:
     """Test WebSocket endpoint integration"""
 
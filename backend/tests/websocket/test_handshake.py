@@ -0,0 +1,120 @@
+"""
+WebSocket handshake tests
+Membership is checked on a short-lived session and cached for reconnects.
+"""
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import WebSocket, WebSocketDisconnect
+
+from app.core.cache import TTLCache
+from app.core.security import create_access_token
+from app.models.user import User
+from app.websocket.codec import MSGPACK_SUBPROTOCOL, MsgpackCodec
+from app.websocket.game_handler import (
+    HandshakeRejected,
+    authorize_game_player,
+    game_websocket,
+    membership_cache,
+)
+from app.websocket.game_manager import game_manager
+from tests.websocket.test_ws_actions import ALICE, create_game
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def clear_membership_cache():
+    """Start every test with an empty membership cache."""
+    membership_cache.clear()
+    yield
+    membership_cache.clear()
+
+
+async def create_user(db_session, user_id: int, username: str) -> User:
+    """Insert a user with a fixed ID."""
+    user = User(id=user_id, email=f"{username}@test.com", username=username, hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+class TestAuthorizeGamePlayer:
+    """Test handshake authorization"""
+
+    async def test_member_is_cached(self, db_session):
+        """Test a reconnect is served from the cache without the database"""
+        game = await create_game(db_session)
+        await create_user(db_session, ALICE, "alice")
+        token = create_access_token({"sub": str(ALICE)})
+
+        membership = await authorize_game_player(token, game.id)
+        assert (membership.user_id, membership.username, membership.player_id) == (ALICE, "alice", 1)
+
+        # Gone from the database, still admitted until the entry expires
+        await db_session.delete(game)
+        await db_session.commit()
+        assert await authorize_game_player(token, game.id) == membership
+
+    async def test_invalid_token(self):
+        """Test a bad token is rejected without a lookup"""
+        with pytest.raises(HandshakeRejected) as exc_info:
+            await authorize_game_player("not-a-token", 1)
+        assert exc_info.value.code == 4001
+
+    async def test_non_member_is_not_cached(self, db_session):
+        """Test outsiders are rejected and nothing is cached for them"""
+        game = await create_game(db_session)
+        await create_user(db_session, 99, "mallory")
+
+        with pytest.raises(HandshakeRejected) as exc_info:
+            await authorize_game_player(create_access_token({"sub": "99"}), game.id)
+
+        assert exc_info.value.code == 4003
+        assert len(membership_cache) == 0
+
+
+class TestTTLCache:
+    """Test the expiring cache"""
+
+    def test_expiry_and_eviction(self):
+        """Test entries expire after ttl and the oldest is evicted at maxsize"""
+        now = [0.0]
+        cache = TTLCache(ttl=10, maxsize=2, clock=lambda: now[0])
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+        now[0] = 10
+        assert cache.get("a") is None
+        assert len(cache) == 1
+
+
+class TestGameWebSocketReplies:
+    """Test replies to client frames on an open game socket"""
+
+    async def test_replies_use_queue_and_codec(self, db_session):
+        """Test pong and error replies are queued in the negotiated codec"""
+        game = await create_game(db_session)
+        await create_user(db_session, ALICE, "alice")
+        ws = AsyncMock(spec=WebSocket)
+        ws.scope = {"subprotocols": [MSGPACK_SUBPROTOCOL]}
+        incoming = iter(['{"type": "ping"}', "not json"])
+
+        async def receive_text():
+            for data in incoming:
+                return data
+            await game_manager.flush(game.id)
+            raise WebSocketDisconnect()
+
+        ws.receive_text.side_effect = receive_text
+
+        await game_websocket(ws, game.id, create_access_token({"sub": str(ALICE)}), None, None)
+
+        ws.send_text.assert_not_called()
+        types = [MsgpackCodec.decode(call.args[0])["type"] for call in ws.send_bytes.call_args_list]
+        assert "pong" in types
+        assert "error" in types
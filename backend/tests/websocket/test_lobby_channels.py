@@ -0,0 +1,155 @@
+"""
+Lobby channel tests
+Committed lobby changes are pushed to the lobby and lobby browser channels.
+"""
+import json
+
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import WebSocket, WebSocketDisconnect
+from httpx import AsyncClient
+
+from app.core.db_metrics import track_queries
+from app.services.lobby_service import wait_for_notifications
+from app.websocket.lobby_handler import lobby_websocket, notify_lobby_changes
+from app.websocket.lobby_manager import LIST_CHANNEL, lobby_manager
+
+pytestmark = pytest.mark.asyncio
+
+
+async def token_for(client: AsyncClient, name: str) -> str:
+    """Register a user and get an access token."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={"email": f"{name}@example.com", "username": name, "password": "password123"},
+    )
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": f"{name}@example.com", "password": "password123"},
+    )
+    return response.json()["tokens"]["access_token"]
+
+
+def sent(ws) -> list[dict]:
+    """Messages sent to a mock websocket, decoded."""
+    return [json.loads(call.args[0]) for call in ws.send_text.call_args_list]
+
+
+async def settle() -> None:
+    await wait_for_notifications()
+    await lobby_manager.flush()
+
+
+@pytest.fixture
+async def lobby(client: AsyncClient):
+    """A lobby hosted by alice, and a token for bob."""
+    host = await token_for(client, "alice")
+    guest = await token_for(client, "bob")
+    response = await client.post(
+        "/api/v1/lobbies",
+        json={"name": "Pushed Lobby"},
+        headers={"Authorization": f"Bearer {host}"},
+    )
+    await wait_for_notifications()
+    return response.json()["id"], host, guest
+
+
+@pytest.fixture
+async def subscribed(lobby):
+    """Mock sockets subscribed to the lobby's channel and the listing."""
+    lobby_id, host, guest = lobby
+    room_ws = AsyncMock(spec=WebSocket)
+    list_ws = AsyncMock(spec=WebSocket)
+    await lobby_manager.connect(room_ws, lobby_id)
+    await lobby_manager.connect(list_ws, LIST_CHANNEL)
+    yield lobby_id, host, guest, room_ws, list_ws
+    lobby_manager.disconnect(lobby_id, room_ws)
+    lobby_manager.disconnect(LIST_CHANNEL, list_ws)
+
+
+class TestLobbyChannels:
+    """Tests for lobby change notifications."""
+
+    async def test_join_and_ready_are_pushed(self, client: AsyncClient, subscribed):
+        """Should push the lobby state and listing row after each commit."""
+        lobby_id, _, guest, room_ws, list_ws = subscribed
+        headers = {"Authorization": f"Bearer {guest}"}
+
+        await client.post(f"/api/v1/lobbies/{lobby_id}/join", headers=headers)
+        await settle()
+        await client.post(f"/api/v1/lobbies/{lobby_id}/ready", json={"is_ready": True}, headers=headers)
+        await settle()
+
+        room = sent(room_ws)
+        assert [m["type"] for m in room] == ["lobby_state", "lobby_state"]
+        assert [p["username"] for p in room[0]["data"]["lobby"]["players"]] == ["alice", "bob"]
+        assert room[1]["data"]["lobby"]["players"][1]["is_ready"] is True
+
+        # All guests ready: the lobby leaves the waiting listing
+        listing = sent(list_ws)
+        assert listing[0]["type"] == "lobby_listed"
+        assert listing[0]["data"]["lobby"]["player_count"] == 2
+        assert listing[-1] == {"type": "lobby_unlisted", "data": {"lobby_id": lobby_id}}
+
+    async def test_start_carries_game_id(self, client: AsyncClient, subscribed):
+        """Should push the started lobby with its game ID."""
+        lobby_id, host, guest, room_ws, _ = subscribed
+        guest_headers = {"Authorization": f"Bearer {guest}"}
+        await client.post(f"/api/v1/lobbies/{lobby_id}/join", headers=guest_headers)
+        await client.post(f"/api/v1/lobbies/{lobby_id}/ready", json={"is_ready": True}, headers=guest_headers)
+
+        response = await client.post(
+            f"/api/v1/lobbies/{lobby_id}/start",
+            headers={"Authorization": f"Bearer {host}"},
+        )
+        await settle()
+
+        last = sent(room_ws)[-1]["data"]["lobby"]
+        assert last["status"] == "started"
+        assert last["game_id"] == response.json()["game_id"]
+
+    async def test_no_subscribers_no_query(self, lobby):
+        """Should skip loading lobbies nobody watches."""
+        lobby_id, _, _ = lobby
+
+        with track_queries("test", "notify") as stats:
+            await notify_lobby_changes([lobby_id])
+
+        assert stats.queries == 0
+
+    async def test_browser_only_changes_keep_no_lock(self, lobby):
+        """Should not keep a lock for a lobby only the browser watches."""
+        lobby_id, _, _ = lobby
+        list_ws = AsyncMock(spec=WebSocket)
+        await lobby_manager.connect(list_ws, LIST_CHANNEL)
+        try:
+            await notify_lobby_changes([lobby_id])
+            await lobby_manager.flush()
+
+            assert sent(list_ws)[-1]["type"] == "lobby_listed"
+            assert lobby_id not in lobby_manager._locks
+        finally:
+            lobby_manager.disconnect(LIST_CHANNEL, list_ws)
+
+
+class TestLobbyWebSocket:
+    """Tests for the /ws/lobby/{id} endpoint."""
+
+    async def test_unknown_lobby_closes(self):
+        """Should close with 4004 for a missing lobby."""
+        ws = AsyncMock(spec=WebSocket)
+
+        await lobby_websocket(ws, 99999)
+
+        ws.close.assert_awaited_once_with(code=4004, reason="Lobby not found")
+        assert 99999 not in lobby_manager.channels
+
+    async def test_disconnect_unsubscribes(self, lobby):
+        """Should drop the subscriber when the client goes away."""
+        lobby_id, _, _ = lobby
+        ws = AsyncMock(spec=WebSocket)
+        ws.receive_text.side_effect = WebSocketDisconnect()
+
+        await lobby_websocket(ws, lobby_id)
+
+        assert lobby_id not in lobby_manager.channels
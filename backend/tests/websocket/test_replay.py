@@ -0,0 +1,136 @@
+"""
+WebSocket replay tests
+Reconnecting clients receive only the broadcasts they missed.
+"""
+import json
+import time
+
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import WebSocket
+
+from app.websocket.game_manager import GameConnectionManager, GameMessage, MessageType
+from app.websocket.replay import ReplayBuffer
+
+
+def sent(ws) -> list[dict]:
+    """Messages sent to a mock websocket, decoded."""
+    return [json.loads(call.args[0]) for call in ws.send_text.call_args_list]
+
+
+class TestReplayBuffer:
+    """Test ReplayBuffer"""
+
+    def test_since_returns_missed_entries(self):
+        """Test entries after last_seq are returned in order"""
+        buffer = ReplayBuffer(size=5)
+        for n in range(3):
+            buffer.append(n)
+
+        assert [e.message for e in buffer.since(1)] == [1, 2]
+        assert buffer.since(3) == []
+
+    def test_rolled_over(self):
+        """Test a gap older than the buffer needs a snapshot"""
+        buffer = ReplayBuffer(size=2)
+        for n in range(5):
+            buffer.append(n)
+
+        assert buffer.since(2) is None
+        assert [e.seq for e in buffer.since(3)] == [4, 5]
+
+    def test_seq_from_the_future(self):
+        """Test a last_seq the buffer never issued needs a snapshot"""
+        buffer = ReplayBuffer(size=2)
+        buffer.append("a")
+
+        assert buffer.since(7) is None
+
+
+class TestReconnect:
+    """Test replay through GameConnectionManager.connect"""
+
+    @pytest.fixture
+    def manager(self):
+        return GameConnectionManager(replay_size=4)
+
+    @staticmethod
+    async def disconnect_and_miss(manager, ws, count: int) -> None:
+        """Drop player 1 and broadcast messages while it is away"""
+        manager.disconnect(1, 1, ws)
+        for n in range(count):
+            await manager.broadcast_to_game(1, GameMessage(type=MessageType.PLAYER_ACTION, data={"n": n}))
+
+    @pytest.mark.asyncio
+    async def test_replays_missed_messages(self, manager):
+        """Test a reconnecting client gets only what it missed, with seqs"""
+        first = AsyncMock(spec=WebSocket)
+        await manager.connect(first, 1, player_id=1)
+        await manager.connect(AsyncMock(spec=WebSocket), 1, player_id=2)
+        await manager.broadcast_to_game(1, GameMessage(type=MessageType.PING))
+        await manager.flush()
+        last_seq = sent(first)[-1]["seq"]
+
+        await self.disconnect_and_miss(manager, first, 2)
+        await manager.broadcast_to_game(1, GameMessage(type=MessageType.PLAYER_LEFT), exclude_player_id=1)
+        second = AsyncMock(spec=WebSocket)
+        replayed = await manager.connect(second, 1, 1, last_seq=last_seq, stream=manager.instance_id)
+        await manager.flush()
+
+        assert replayed is True
+        assert [(m["seq"], m["data"]["n"]) for m in sent(second)] == [(2, 0), (3, 1)]
+
+    @pytest.mark.asyncio
+    async def test_needs_snapshot_when_rolled_over(self, manager):
+        """Test a client that missed more than the buffer holds is not replayed"""
+        first = AsyncMock(spec=WebSocket)
+        await manager.connect(first, 1, player_id=1)
+        await manager.connect(AsyncMock(spec=WebSocket), 1, player_id=2)
+        await self.disconnect_and_miss(manager, first, 6)
+
+        replayed = await manager.connect(
+            AsyncMock(spec=WebSocket), 1, 1, last_seq=0, stream=manager.instance_id
+        )
+
+        assert replayed is False
+
+    @pytest.mark.asyncio
+    async def test_needs_snapshot_for_other_stream(self, manager):
+        """Test sequence numbers from another process are not trusted"""
+        await manager.connect(AsyncMock(spec=WebSocket), 1, player_id=2)
+
+        assert await manager.connect(AsyncMock(spec=WebSocket), 1, 1, last_seq=0, stream="other") is False
+
+    @pytest.mark.asyncio
+    async def test_snapshot_carries_seq_and_stream(self, manager):
+        """Test snapshots tell the client where its sequence starts"""
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws, 1, player_id=1)
+        await manager.broadcast_to_game(1, GameMessage(type=MessageType.PING))
+        await manager.send_state_snapshot(1, 1, {"n": 1}, 3)
+        await manager.flush()
+
+        snapshot = sent(ws)[-1]
+        assert snapshot["seq"] == 1
+        assert snapshot["stream"] == manager.instance_id
+
+    @pytest.mark.asyncio
+    async def test_empty_room_keeps_recording_until_expiry(self):
+        """Test everyone dropping at once can still be replayed, for a while"""
+        manager = GameConnectionManager(replay_retention=30)
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws, 1, player_id=1)
+
+        await self.disconnect_and_miss(manager, ws, 1)
+        await manager.broadcast_state(1, {"n": 1}, 1)
+        back = AsyncMock(spec=WebSocket)
+        assert await manager.connect(back, 1, 1, last_seq=0, stream=manager.instance_id)
+        await manager.flush()
+        assert [m["seq"] for m in sent(back)] == [1, 2]
+
+        manager.disconnect(1, 1, back)
+        manager.sweep(now=time.monotonic() + 10)
+        assert manager.state_tracker.get(1) is not None
+        manager.sweep(now=time.monotonic() + 31)
+        assert manager.state_tracker.get(1) is None
+        assert not manager.backplane.is_subscribed(1)
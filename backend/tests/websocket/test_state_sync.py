@@ -0,0 +1,185 @@
+"""
+WebSocket state sync tests
+"""
+import json
+
+from unittest.mock import AsyncMock
+from fastapi import WebSocket
+
+from app.websocket.game_manager import GameConnectionManager
+from app.websocket.state_sync import (
+    GameStateTracker,
+    apply_patch,
+    make_patch,
+    merge_state_updates,
+)
+
+
+OLD_STATE = {
+    "current_round": 1,
+    "board": [[{"tile": None}, {"tile": None}]],
+    "available_tiles": ["a", "b", "c"],
+    "players": [{"id": 1, "score": 0, "placed_tiles": []}],
+    "last/action": None,
+}
+
+NEW_STATE = {
+    "current_round": 2,
+    "board": [[{"tile": {"tile_id": "a"}}, {"tile": None}]],
+    "available_tiles": ["b", "c"],
+    "players": [{"id": 1, "score": 3, "placed_tiles": ["a"]}],
+    "last/action": "place_tile",
+}
+
+
+class TestJsonPatch:
+    """Test make_patch and apply_patch"""
+
+    def test_round_trip(self):
+        """Test applying the diff turns the old state into the new one"""
+        patch = make_patch(OLD_STATE, NEW_STATE)
+
+        assert apply_patch(OLD_STATE, patch) == NEW_STATE
+        assert OLD_STATE["current_round"] == 1  # input left unchanged
+
+    def test_only_changed_paths(self):
+        """Test unchanged parts of the state are not in the patch"""
+        patch = make_patch(OLD_STATE, NEW_STATE)
+        paths = {op["path"] for op in patch}
+
+        assert "/board/0/1/tile" not in paths
+        assert "/board/0/0/tile" in paths
+        assert "/last~1action" in paths
+
+    def test_identical_documents(self):
+        """Test no operations for equal documents"""
+        assert make_patch(NEW_STATE, dict(NEW_STATE)) == []
+
+    def test_list_shrink_and_grow(self):
+        """Test trailing removals and additions round trip"""
+        assert apply_patch([1, 2, 3, 4], make_patch([1, 2, 3, 4], [1, 5])) == [1, 5]
+        assert apply_patch([1], make_patch([1], [1, 2, 3])) == [1, 2, 3]
+
+    def test_type_change_is_replaced(self):
+        """Test values that change type are replaced, not diffed"""
+        patch = make_patch({"a": 1}, {"a": [1]})
+
+        assert patch == [{"op": "replace", "path": "/a", "value": [1]}]
+
+
+class TestMergeStateUpdates:
+    """Test folding pending state updates together"""
+
+    def test_consecutive_deltas_are_combined(self):
+        """Test two chained deltas become one from the first base"""
+        middle = dict(OLD_STATE, current_round=5)
+        first = {"version": 2, "base_version": 1, "patch": make_patch(OLD_STATE, middle)}
+        second = {"version": 3, "base_version": 2, "patch": make_patch(middle, NEW_STATE)}
+
+        merged = merge_state_updates(first, second)
+
+        assert merged["base_version"] == 1
+        assert merged["version"] == 3
+        assert apply_patch(OLD_STATE, merged["patch"]) == NEW_STATE
+
+    def test_delta_after_snapshot_becomes_snapshot(self):
+        """Test a delta on a pending snapshot is applied to it"""
+        snapshot = {"version": 1, "game_state": OLD_STATE}
+        delta = {"version": 2, "base_version": 1, "patch": make_patch(OLD_STATE, NEW_STATE)}
+
+        assert merge_state_updates(snapshot, delta) == {"version": 2, "game_state": NEW_STATE}
+
+    def test_unrelated_delta_is_kept(self):
+        """Test a delta that does not follow on is left for the client to detect"""
+        first = {"version": 2, "base_version": 1, "patch": []}
+        second = {"version": 5, "base_version": 4, "patch": []}
+
+        assert merge_state_updates(first, second) is second
+
+
+class TestGameStateTracker:
+    """Test GameStateTracker"""
+
+    def test_first_update_is_snapshot_then_delta(self):
+        """Test a delta is built once a base is known"""
+        tracker = GameStateTracker()
+
+        first = tracker.build_update(1, OLD_STATE, 1)
+        second = tracker.build_update(1, NEW_STATE, 2)
+
+        assert first == {"version": 1, "game_state": OLD_STATE}
+        assert second["base_version"] == 1
+        assert apply_patch(OLD_STATE, second["patch"]) == NEW_STATE
+
+    def test_older_version_sends_snapshot(self):
+        """Test an out-of-order state is sent in full"""
+        tracker = GameStateTracker()
+        tracker.build_update(1, NEW_STATE, 5)
+
+        assert "game_state" in tracker.build_update(1, OLD_STATE, 4)
+
+    def test_remember_keeps_newest(self):
+        """Test remember ignores states older than the base"""
+        tracker = GameStateTracker()
+        tracker.remember(1, NEW_STATE, 3)
+        tracker.remember(1, OLD_STATE, 2)
+
+        assert tracker.get(1) == (3, NEW_STATE)
+        tracker.forget(1)
+        assert tracker.get(1) is None
+
+
+def sent(ws) -> list[dict]:
+    """Messages sent to a mock websocket, decoded."""
+    return [json.loads(call.args[0]) for call in ws.send_text.call_args_list]
+
+
+def seat_state(hand_1: list, hand_2: list, score: int = 0) -> dict:
+    """Two-seat game state with the given blueprint hands."""
+    return {
+        "players": [
+            {"id": 1, "score": score, "dealt_blueprints": [], "blueprints": hand_1},
+            {"id": 2, "score": 0, "dealt_blueprints": [], "blueprints": hand_2},
+        ],
+    }
+
+
+class TestPrivateState:
+    """Test per-seat private fields next to the shared public delta"""
+
+    async def test_private_fields_go_only_to_their_seat(self):
+        """Test each seat gets its own fields, and only when they change"""
+        manager = GameConnectionManager(replay_retention=0)
+        first, second = AsyncMock(spec=WebSocket), AsyncMock(spec=WebSocket)
+        await manager.connect(first, 1, player_id=1)
+        await manager.connect(second, 1, player_id=2)
+        await manager.send_state_snapshot(1, 1, seat_state(["a"], ["b"]), 1)
+        await manager.send_state_snapshot(1, 2, seat_state(["a"], ["b"]), 1)
+        await manager.flush()
+
+        await manager.broadcast_state(1, seat_state(["a", "bp_secret"], ["b"], score=2), 2)
+        await manager.flush()
+
+        first_messages, second_messages = sent(first), sent(second)
+        assert first_messages[0]["data"]["game_state"]["players"][0]["blueprints"] == ["a"]
+        assert "blueprints" not in first_messages[0]["data"]["game_state"]["players"][1]
+        assert [m["type"] for m in first_messages] == ["game_state_update", "game_state_update", "private_state"]
+        assert first_messages[-1]["data"]["private"]["blueprints"] == ["a", "bp_secret"]
+        # Seat 2's fields did not change, so it only gets the public delta
+        assert [m["type"] for m in second_messages] == ["game_state_update", "game_state_update"]
+        assert "bp_secret" not in json.dumps(second_messages)
+
+    async def test_resend_reuses_cached_frame(self):
+        """Test a reconnecting seat gets its last private fields again"""
+        manager = GameConnectionManager(replay_retention=0)
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws, 1, player_id=1)
+        await manager.broadcast_state(1, seat_state(["a"], ["b"]), 1)
+        await manager.flush()
+
+        assert manager.resend_private_state(1, 1) is True
+        await manager.flush()
+
+        frames = [call.args[0] for call in ws.send_text.call_args_list]
+        assert frames[-1] is frames[-2]
+        assert manager.resend_private_state(1, 2) is False
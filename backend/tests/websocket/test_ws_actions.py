@@ -0,0 +1,120 @@
+"""
+WebSocket game action tests
+Actions sent over the socket are applied and answered with ACTION_RESULT.
+"""
+import json
+
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import WebSocket
+
+from app.models.game import Game, GameStatus
+from app.services.blueprint_service import BlueprintService
+from app.services.game_service import GameService
+from app.websocket.game_handler import handle_action
+from app.websocket.game_manager import game_manager
+
+pytestmark = pytest.mark.asyncio
+
+ALICE, BOB = 10, 20
+
+
+async def create_game(db_session) -> Game:
+    """Two-player game with Alice to move."""
+    hands = BlueprintService.deal_blueprints(2, cards_per_player=3)
+    alice = GameService.create_initial_player(1, ALICE, "alice", "blue", 0, True)
+    alice["dealt_blueprints"] = hands[0]
+    bob = GameService.create_initial_player(2, BOB, "bob", "red", 1, False)
+    bob["dealt_blueprints"] = hands[1]
+
+    game = Game(
+        lobby_id=None,
+        status=GameStatus.IN_PROGRESS,
+        current_round=1,
+        total_rounds=GameService.TOTAL_ROUNDS,
+        current_turn_player_id=ALICE,
+        turn_order_json=json.dumps([ALICE, BOB]),
+        board_json=json.dumps(GameService.create_initial_board()),
+        players_json=json.dumps([alice, bob]),
+        available_tiles_json=json.dumps(GameService.generate_tile_pool()),
+        discarded_tiles_json=json.dumps([]),
+    )
+    db_session.add(game)
+    await db_session.commit()
+    await db_session.refresh(game)
+    return game
+
+
+@pytest.fixture
+async def sockets(db_session):
+    """Game with both players connected to the global manager."""
+    game = await create_game(db_session)
+    alice_ws = AsyncMock(spec=WebSocket)
+    bob_ws = AsyncMock(spec=WebSocket)
+    await game_manager.connect(alice_ws, game.id, player_id=1)
+    await game_manager.connect(bob_ws, game.id, player_id=2)
+    yield game, alice_ws, bob_ws
+    game_manager.disconnect(game.id, 1)
+    game_manager.disconnect(game.id, 2)
+
+
+def sent(ws) -> list[dict]:
+    """Messages sent to a mock websocket, decoded."""
+    return [json.loads(call.args[0]) for call in ws.send_text.call_args_list]
+
+
+class TestWebSocketActions:
+    """Tests for handle_action."""
+
+    async def test_action_result_follows_state_update(self, sockets):
+        """Should apply the action, broadcast state, then answer the sender."""
+        game, alice_ws, bob_ws = sockets
+        blueprint_id = game.players[0]["dealt_blueprints"][0]
+
+        await handle_action(game.id, ALICE, 1, {
+            "type": "select_blueprint",
+            "request_id": "req-1",
+            "data": {"blueprint_id": blueprint_id},
+        })
+        await game_manager.flush(game.id)
+
+        alice_messages = sent(alice_ws)
+        assert [m["type"] for m in alice_messages] == ["game_state_update", "private_state", "action_result"]
+        assert alice_messages[1]["data"]["private"]["blueprints"] == [blueprint_id]
+        result = alice_messages[-1]["data"]
+        assert result["request_id"] == "req-1"
+        assert result["success"] is True
+        assert result["version"] == 1
+
+        # Bob sees how many blueprints Alice holds, never which
+        bob_messages = sent(bob_ws)
+        assert [m["type"] for m in bob_messages] == ["game_state_update", "private_state"]
+        assert bob_messages[1]["data"]["player_id"] == 2
+        assert blueprint_id not in json.dumps(bob_messages)
+
+    async def test_rejected_action_reports_error(self, sockets):
+        """Should answer with the service's error and change nothing."""
+        game, _, bob_ws = sockets
+
+        await handle_action(game.id, BOB, 2, {"type": "end_turn", "request_id": 7})
+        await game_manager.flush(game.id)
+
+        messages = sent(bob_ws)
+        assert [m["type"] for m in messages] == ["action_result"]
+        assert messages[0]["data"] == {
+            "request_id": 7,
+            "action_type": "end_turn",
+            "success": False,
+            "error": "Not your turn",
+        }
+
+    async def test_invalid_payload(self, sockets):
+        """Should reject payloads that do not match the action schema."""
+        game, alice_ws, _ = sockets
+
+        await handle_action(game.id, ALICE, 1, {"type": "place_tile", "data": {"tile_id": "x"}})
+        await game_manager.flush(game.id)
+
+        result = sent(alice_ws)[0]["data"]
+        assert result["success"] is False
+        assert result["error"].startswith("Invalid payload")
@@ -116,6 +116,12 @@ export interface PlayerRanking {
   score_breakdown: ScoreBreakdown;
 }
 
+/** 롱 폴링 응답 */
+export interface GameChangesResponse {
+  version: number;
+  game_state: GameState;
+}
+
 // ============================================
 // API Endpoints
 // ============================================
@@ -126,6 +132,15 @@ export interface PlayerRanking {
  * - Errors: 404 (not found), 403 (not in game)
  */
 
+/**
+ * GET /api/v1/games/{id}/changes
+ * - Query: since (가진 버전), timeout? (초, 기본 30, 최대 60)
+ * - Response: GameChangesResponse — 버전이 since보다 커지는 즉시 응답
+ * - 204: timeout 동안 변경 없음 (같은 since로 다시 요청)
+ * - Errors: 404
+ * - WebSocket을 쓸 수 없는 클라이언트용 롱 폴링
+ */
+
 /**
  * POST /api/v1/games/{id}/action
  * - Request: GameActionRequest
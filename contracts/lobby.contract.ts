@@ -32,10 +32,22 @@ export interface ReadyRequest {
 /** 로비 응답 */
 export interface LobbyResponse extends Lobby {}
 
-/** 로비 목록 응답 */
+/** 로비 목록 항목 */
+export interface LobbySummary {
+  id: number;
+  name: string;
+  host_id: number;
+  host_username: string;
+  status: LobbyStatus;
+  max_players: number;
+  player_count: number;
+  created_at: string;
+}
+
+/** 로비 목록 응답 (next_cursor가 있으면 다음 페이지 존재) */
 export interface LobbyListResponse {
-  lobbies: LobbyResponse[];
-  total: number;
+  lobbies: LobbySummary[];
+  next_cursor: string | null;
 }
 
 /** 로비 참가 응답 */
@@ -58,7 +70,7 @@ export interface JoinLobbyResponse {
 /**
  * GET /api/v1/lobbies
  * - Response: LobbyListResponse
- * - Query: status?, page?, limit?
+ * - Query: cursor?, limit? (기본 20, 최대 50)
  */
 
 /**
@@ -3,7 +3,8 @@
  * 실시간 통신 메시지 계약 정의
  */
 
-import type { GameState, GameAction, Player, LobbyStatus } from './types';
+import type { GameState, GameAction, Player } from './types';
+import type { LobbyResponse, LobbySummary } from './lobby.contract';
 
 // ============================================
 // 클라이언트 → 서버 메시지
@@ -14,7 +15,9 @@ export type ClientMessage =
   | JoinGameMessage
   | LeaveGameMessage
   | GameActionMessage
-  | PingMessage;
+  | PingMessage
+  | ResyncMessage
+  | SocketActionMessage;
 
 export interface JoinGameMessage {
   type: 'join_game';
@@ -39,6 +42,13 @@ export interface GameActionMessage {
   };
 }
 
+/** 소켓으로 보내는 게임 액션 (REST 페이로드와 동일, 결과는 action_result) */
+export interface SocketActionMessage {
+  type: 'place_worker' | 'place_tile' | 'select_blueprint' | 'end_turn';
+  request_id?: string;  // action_result에 그대로 반환
+  data: Record<string, unknown>;
+}
+
 export interface PingMessage {
   type: 'ping';
   payload: {
@@ -46,13 +56,43 @@ export interface PingMessage {
   };
 }
 
+/** 버전 불일치 시 전체 상태 스냅샷 요청 */
+export interface ResyncMessage {
+  type: 'resync';
+}
+
 // ============================================
 // 서버 → 클라이언트 메시지
 // ============================================
 
+/**
+ * 방 전체 브로드캐스트와 스냅샷에는 seq(방 메시지 순번)가 붙고, 스냅샷에는
+ * stream(서버 프로세스)도 붙는다. 재접속 시 ?last_seq=&stream= 으로 보내면
+ * 놓친 메시지만 재전송되고, 버퍼가 넘쳤으면 스냅샷이 온다.
+ */
+export interface SequencedMessage {
+  seq?: number;
+  stream?: string;
+}
+
+/**
+ * 프레임 형식 (WebSocket 서브프로토콜로 협상)
+ * - hanyang.json (기본값, 서브프로토콜 미지정 시): JSON 텍스트 프레임
+ * - hanyang.msgpack: 바이너리 프레임. 0번 바이트는 플래그, 나머지는 메시지
+ *   객체의 MessagePack 인코딩. 플래그 bit 0 이 켜져 있으면 본문이 zlib
+ *   (브라우저 DecompressionStream 'deflate') 압축되어 있다.
+ * pong, 오류를 포함한 모든 서버 프레임은 협상된 형식을 따른다 (msgpack
+ * 클라이언트는 바이너리 프레임만 받는다).
+ * 클라이언트 → 서버 메시지는 항상 JSON 텍스트.
+ */
+export const WS_SUBPROTOCOLS = ['hanyang.msgpack', 'hanyang.json'] as const;
+export const WS_FRAME_FLAG_COMPRESSED = 0x01;
+
 /** 서버 메시지 유니온 */
 export type ServerMessage =
   | GameStateMessage
+  | GameStatePatchMessage
+  | PrivateStateMessage
   | GameActionResultMessage
   | PlayerJoinedMessage
   | PlayerLeftMessage
@@ -61,16 +101,50 @@ export type ServerMessage =
   | ErrorMessage
   | PongMessage;
 
+/** 전체 상태 스냅샷 (입장 및 resync 시) */
 export interface GameStateMessage {
   type: 'game_state';
   payload: {
     state: GameState;
+    version: number;
+  };
+}
+
+/**
+ * 본인 좌석의 비공개 필드 (청사진 패). 변경 시에만 본인에게 전송된다.
+ * 공개 상태와 변경분에는 다른 플레이어의 dealt_blueprints/blueprints 대신
+ * dealt_blueprint_count/blueprint_count 만 포함된다.
+ */
+export interface PrivateStateMessage {
+  type: 'private_state';
+  payload: {
+    version: number;
+    player_id: number;
+    private: {
+      dealt_blueprints: string[];
+      blueprints: string[];
+    };
+  };
+}
+
+/** 상태 변경분 (JSON Patch, RFC 6902) */
+export interface GameStatePatchMessage {
+  type: 'game_state';
+  payload: {
+    version: number;
+    base_version: number;  // 클라이언트 버전과 다르면 resync 요청
+    patch: Array<{
+      op: 'add' | 'remove' | 'replace';
+      path: string;
+      value?: unknown;
+    }>;
   };
 }
 
 export interface GameActionResultMessage {
   type: 'action_result';
   payload: {
+    request_id?: string;  // 소켓 액션의 요청 ID
     action: GameAction;
     new_state: GameState;
     success: boolean;
@@ -180,52 +254,33 @@ export interface StartGameMessage {
   };
 }
 
-/** 로비 서버 메시지 */
+/** 로비 서버 메시지 (커밋된 로비 변경마다 전송) */
 export type LobbyServerMessage =
   | LobbyStateMessage
-  | LobbyPlayerJoinedMessage
-  | LobbyPlayerLeftMessage
-  | LobbyPlayerReadyMessage
-  | LobbyGameStartingMessage;
+  | LobbyListedMessage
+  | LobbyUnlistedMessage;
 
+/** 로비 전체 상태 (/ws/lobby/{id}: 연결 시 및 변경 시) */
 export interface LobbyStateMessage {
   type: 'lobby_state';
   payload: {
-    lobby_id: number;
-    status: LobbyStatus;
-    players: Player[];
-    host_id: number;
-  };
-}
-
-export interface LobbyPlayerJoinedMessage {
-  type: 'lobby_player_joined';
-  payload: {
-    player: Player;
-  };
-}
-
-export interface LobbyPlayerLeftMessage {
-  type: 'lobby_player_left';
-  payload: {
-    player_id: number;
-    new_host_id?: number;  // 호스트 변경 시
+    lobby: LobbyResponse;  // 시작된 로비는 game_id 포함
   };
 }
 
-export interface LobbyPlayerReadyMessage {
-  type: 'lobby_player_ready';
+/** 대기 중인 로비 추가/변경 (/ws/lobbies) */
+export interface LobbyListedMessage {
+  type: 'lobby_listed';
   payload: {
-    player_id: number;
-    is_ready: boolean;
+    lobby: LobbySummary;
   };
 }
 
-export interface LobbyGameStartingMessage {
-  type: 'lobby_game_starting';
+/** 더 이상 대기 중이 아닌 로비 (/ws/lobbies) */
+export interface LobbyUnlistedMessage {
+  type: 'lobby_unlisted';
   payload: {
-    game_id: number;
-    countdown: number;  // 시작까지 남은 초
+    lobby_id: number;
   };
 }
 
@@ -236,7 +291,8 @@ export interface LobbyGameStartingMessage {
 /**
  * 게임 WebSocket: ws://localhost:8000/ws/game/{game_id}
  * 로비 WebSocket: ws://localhost:8000/ws/lobby/{lobby_id}
+ * 로비 목록 WebSocket: ws://localhost:8000/ws/lobbies (연결 후 GET /api/v1/lobbies)
  *
- * 연결 시 token을 쿼리 파라미터로 전달:
+ * 게임 WebSocket은 연결 시 token을 쿼리 파라미터로 전달 (로비 채널은 인증 불필요):
  * ws://localhost:8000/ws/game/{game_id}?token={access_token}
  */
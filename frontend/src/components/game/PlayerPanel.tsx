@@ -24,6 +24,8 @@ export function PlayerPanel({
     green: 'border-l-green-500',
     yellow: 'border-l-yellow-500',
   }
+  // Other players' hands are hidden; only their size is shared
+  const blueprintCount = player.blueprints?.length ?? player.blueprint_count ?? 0
 
   return (
     <motion.div
@@ -97,9 +99,9 @@ export function PlayerPanel({
       />
 
       {/* Blueprints count */}
-      {player.blueprints.length > 0 && (
+      {blueprintCount > 0 && (
         <div className="mt-3 text-sm text-hanyang-brown/70">
-          청사진: {player.blueprints.length}장
+          청사진: {blueprintCount}장
         </div>
       )}
     </motion.div>
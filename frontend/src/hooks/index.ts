@@ -1,3 +1,5 @@
 export { useGameWebSocket } from './useGameWebSocket'
 export type { UseGameWebSocketOptions, UseGameWebSocketReturn, MessageType, WebSocketMessage } from './useGameWebSocket'
 export { useToast } from './useToast'
+export { useLobbyChannel } from './useLobbyChannel'
+export type { LobbyChannelMessage } from './useLobbyChannel'
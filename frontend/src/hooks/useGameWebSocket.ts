@@ -5,10 +5,13 @@ import { useEffect, useRef, useCallback, useState } from 'react'
 import { useAuthStore } from '../stores/authStore'
 import { useGameStore } from '../stores/gameStore'
 import type { GameState } from '../types/game'
+import { applyJsonPatch, type JsonPatchOperation } from '../utils/jsonPatch'
+import { decodeFrame, preferredSubprotocols } from '../utils/wsCodec'
 
 // WebSocket message types (must match backend)
 export type MessageType =
   | 'game_state_update'
+  | 'private_state'
   | 'valid_actions_update'
   | 'your_turn'
   | 'turn_changed'
@@ -23,11 +26,27 @@ export type MessageType =
   | 'error'
   | 'ping'
   | 'pong'
+  | 'resync'
 
 export interface WebSocketMessage {
   type: MessageType
   data: Record<string, unknown>
   timestamp?: string
+  // Room sequence number (broadcasts and snapshots) and its stream
+  seq?: number
+  stream?: string
+}
+
+// Game actions that can be sent over the socket
+export type WebSocketActionType = 'place_worker' | 'place_tile' | 'select_blueprint' | 'end_turn'
+
+export interface ActionResult {
+  request_id: string
+  action_type: WebSocketActionType
+  success: boolean
+  result?: Record<string, unknown>
+  error?: string
+  version?: number
 }
 
 export interface UseGameWebSocketOptions {
@@ -47,12 +66,15 @@ export interface UseGameWebSocketReturn {
   error: string | null
   reconnect: () => void
   disconnect: () => void
+  sendAction: (actionType: WebSocketActionType, data?: Record<string, unknown>) => Promise<ActionResult>
 }
 
 const WS_BASE_URL = import.meta.env.VITE_WS_URL || 'ws://localhost:8000'
+const WS_BINARY = import.meta.env.VITE_WS_BINARY === 'true'
 const RECONNECT_DELAY = 3000
 const MAX_RECONNECT_ATTEMPTS = 5
 const PING_INTERVAL = 30000
+const ACTION_TIMEOUT = 10000
 
 export function useGameWebSocket(options: UseGameWebSocketOptions): UseGameWebSocketReturn {
   const { gameId, onGameStateUpdate, onYourTurn, onTurnChanged, onPlayerJoined, onPlayerLeft, onGameEnded, onError } = options
@@ -61,6 +83,15 @@ export function useGameWebSocket(options: UseGameWebSocketOptions): UseGameWebSo
   const reconnectTimeoutRef = useRef<NodeJS.Timeout | null>(null)
   const pingIntervalRef = useRef<NodeJS.Timeout | null>(null)
   const reconnectAttemptsRef = useRef(0)
+  // Last state received from the server and its version (base for patches)
+  const serverStateRef = useRef<GameState | null>(null)
+  const versionRef = useRef<number | null>(null)
+  // Position in the room's message sequence, sent back on reconnect
+  const lastSeqRef = useRef<number | null>(null)
+  const streamRef = useRef<string | null>(null)
+  // Actions awaiting their action_result, by request id
+  const pendingActionsRef = useRef(new Map<string, (result: ActionResult) => void>())
+  const nextRequestIdRef = useRef(0)
 
   const [isConnected, setIsConnected] = useState(false)
   const [connectionState, setConnectionState] = useState<'connecting' | 'connected' | 'disconnected' | 'error'>('disconnected')
@@ -70,18 +101,72 @@ export function useGameWebSocket(options: UseGameWebSocketOptions): UseGameWebSo
   const { fetchGameState, fetchValidActions } = useGameStore()
 
   // Handle incoming messages
-  const handleMessage = useCallback((event: MessageEvent) => {
+  const handleMessage = useCallback((message: WebSocketMessage) => {
     try {
-      const message: WebSocketMessage = JSON.parse(event.data)
+
+      if (message.stream !== undefined) {
+        streamRef.current = message.stream
+      }
+      if (message.seq !== undefined) {
+        lastSeqRef.current = message.seq
+      }
 
       switch (message.type) {
-        case 'game_state_update':
+        case 'game_state_update': {
+          let nextState: GameState | null = null
+
           if (message.data.game_state) {
-            onGameStateUpdate?.(message.data.game_state as GameState)
+            // Full snapshot (on join or resync)
+            nextState = message.data.game_state as GameState
+          } else if (message.data.patch) {
+            // Delta against base_version; on a gap ask for a snapshot
+            if (!serverStateRef.current || versionRef.current !== message.data.base_version) {
+              wsRef.current?.send(JSON.stringify({ type: 'resync' }))
+              break
+            }
+            nextState = applyJsonPatch(
+              serverStateRef.current,
+              message.data.patch as JsonPatchOperation[]
+            )
+          }
+
+          if (nextState) {
+            serverStateRef.current = nextState
+            versionRef.current = message.data.version as number
+            onGameStateUpdate?.(nextState)
             // Also update store directly
-            useGameStore.setState({ gameState: message.data.game_state as GameState })
+            useGameStore.setState({ gameState: nextState })
+          }
+          break
+        }
+
+        case 'private_state': {
+          // Our own blueprint hands; public deltas never touch these fields
+          const current = serverStateRef.current
+          if (!current) break
+          const playerId = message.data.player_id as number
+          const privateFields = message.data.private as Partial<GameState['players'][number]>
+          const nextState: GameState = {
+            ...current,
+            players: current.players.map((p) =>
+              p.id === playerId ? { ...p, ...privateFields } : p
+            ),
           }
+          serverStateRef.current = nextState
+          onGameStateUpdate?.(nextState)
+          useGameStore.setState({ gameState: nextState })
           break
+        }
+
+        case 'action_result': {
+          const result = message.data as unknown as ActionResult
+          const resolve = pendingActionsRef.current.get(result.request_id)
+          if (resolve) {
+            pendingActionsRef.current.delete(result.request_id)
+            resolve(result)
+          }
+          break
+        }
 
         case 'your_turn':
           onYourTurn?.()
@@ -97,6 +182,7 @@ export function useGameWebSocket(options: UseGameWebSocketOptions): UseGameWebSo
           break
 
         case 'player_joined':
+        case 'player_reconnected':
           onPlayerJoined?.(
             message.data.player_id as number,
             message.data.username as string
@@ -127,14 +213,44 @@ export function useGameWebSocket(options: UseGameWebSocketOptions): UseGameWebSo
           // Keep-alive response received
           break
 
+        case 'ping':
+          // Server heartbeat; answer so the connection is not reaped
+          wsRef.current?.send(JSON.stringify({ type: 'pong' }))
+          break
+
         default:
           console.log('Unhandled WebSocket message:', message.type)
       }
     } catch (err) {
-      console.error('Failed to parse WebSocket message:', err)
+      console.error('Failed to handle WebSocket message:', err)
     }
   }, [gameId, onGameStateUpdate, onYourTurn, onTurnChanged, onPlayerJoined, onPlayerLeft, onGameEnded, onError, fetchValidActions])
 
+  // Send a game action; resolves with the matching action_result
+  const sendAction = useCallback(
+    (actionType: WebSocketActionType, data: Record<string, unknown> = {}): Promise<ActionResult> => {
+      const ws = wsRef.current
+      if (!ws || ws.readyState !== WebSocket.OPEN) {
+        return Promise.reject(new Error('WebSocket is not connected'))
+      }
+
+      const requestId = `${++nextRequestIdRef.current}`
+      return new Promise<ActionResult>((resolve, reject) => {
+        const timeout = setTimeout(() => {
+          pendingActionsRef.current.delete(requestId)
+          reject(new Error(`Action ${actionType} timed out`))
+        }, ACTION_TIMEOUT)
+
+        pendingActionsRef.current.set(requestId, (result) => {
+          clearTimeout(timeout)
+          resolve(result)
+        })
+        ws.send(JSON.stringify({ type: actionType, request_id: requestId, data }))
+      })
+    },
+    []
+  )
+
   // Start ping interval
   const startPingInterval = useCallback(() => {
     if (pingIntervalRef.current) {
@@ -162,8 +278,13 @@ export function useGameWebSocket(options: UseGameWebSocketOptions): UseGameWebSo
     setConnectionState('connecting')
     setError(null)
 
-    const wsUrl = `${WS_BASE_URL}/ws/game/${gameId}?token=${accessToken}`
-    const ws = new WebSocket(wsUrl)
+    // On reconnect the server replays what we missed, or sends a snapshot
+    let wsUrl = `${WS_BASE_URL}/ws/game/${gameId}?token=${accessToken}`
+    if (lastSeqRef.current !== null && streamRef.current !== null) {
+      wsUrl += `&last_seq=${lastSeqRef.current}&stream=${streamRef.current}`
+    }
+    const ws = new WebSocket(wsUrl, preferredSubprotocols(WS_BINARY))
+    ws.binaryType = 'arraybuffer'
 
     ws.onopen = () => {
       console.log(`WebSocket connected to game ${gameId}`)
@@ -174,7 +295,14 @@ export function useGameWebSocket(options: UseGameWebSocketOptions): UseGameWebSo
       startPingInterval()
     }
 
-    ws.onmessage = handleMessage
+    // Binary frames may need async inflating; chain decoding to keep order
+    let decoding: Promise<void> = Promise.resolve()
+    ws.onmessage = (event: MessageEvent) => {
+      decoding = decoding
+        .then(() => decodeFrame<WebSocketMessage>(event.data))
+        .then(handleMessage)
+        .catch((err) => console.error('Failed to parse WebSocket message:', err))
+    }
 
     ws.onerror = (event) => {
       console.error('WebSocket error:', event)
@@ -234,6 +362,12 @@ export function useGameWebSocket(options: UseGameWebSocketOptions): UseGameWebSo
 
   // Connect on mount, disconnect on unmount
   useEffect(() => {
+    // A new game starts from its snapshot
+    serverStateRef.current = null
+    versionRef.current = null
+    lastSeqRef.current = null
+    streamRef.current = null
+
     if (accessToken && gameId) {
       connect()
     }
@@ -249,6 +383,7 @@ export function useGameWebSocket(options: UseGameWebSocketOptions): UseGameWebSo
     error,
     reconnect,
     disconnect,
+    sendAction,
   }
 }
 
@@ -0,0 +1,79 @@
+import { useEffect, useRef, useState } from 'react'
+
+/**
+ * 로비 채널 구독 (/ws/lobby/{id}, /ws/lobbies)
+ *
+ * 서버가 커밋된 로비 변경을 푸시하므로 연결된 동안에는 폴링이 필요 없다.
+ * 끊기면 자동으로 재연결하고, 재연결되면 onOpen에서 최신 상태를 다시 불러온다.
+ */
+
+export interface LobbyChannelMessage {
+  type: 'lobby_state' | 'lobby_listed' | 'lobby_unlisted' | 'pong'
+  data: Record<string, unknown>
+}
+
+const WS_BASE_URL = import.meta.env.VITE_WS_URL || 'ws://localhost:8000'
+const RECONNECT_DELAY = 3000
+const PING_INTERVAL = 30000
+
+export function useLobbyChannel(
+  path: string | null,
+  onMessage: (message: LobbyChannelMessage) => void,
+  onOpen?: () => void,
+): boolean {
+  const [isConnected, setIsConnected] = useState(false)
+  // Latest callbacks without reconnecting when they change
+  const onMessageRef = useRef(onMessage)
+  const onOpenRef = useRef(onOpen)
+  onMessageRef.current = onMessage
+  onOpenRef.current = onOpen
+
+  useEffect(() => {
+    if (!path) return
+
+    let ws: WebSocket | null = null
+    let pingInterval: ReturnType<typeof setInterval> | null = null
+    let reconnectTimeout: ReturnType<typeof setTimeout> | null = null
+    let closed = false
+
+    const connect = () => {
+      ws = new WebSocket(`${WS_BASE_URL}${path}`)
+
+      ws.onopen = () => {
+        setIsConnected(true)
+        onOpenRef.current?.()
+        pingInterval = setInterval(() => {
+          ws?.send(JSON.stringify({ type: 'ping' }))
+        }, PING_INTERVAL)
+      }
+
+      ws.onmessage = (event: MessageEvent) => {
+        try {
+          onMessageRef.current(JSON.parse(event.data))
+        } catch (err) {
+          console.error('Failed to parse lobby message:', err)
+        }
+      }
+
+      ws.onclose = (event) => {
+        setIsConnected(false)
+        if (pingInterval) clearInterval(pingInterval)
+        // 4004: lobby does not exist; reconnecting will not help
+        if (!closed && event.code !== 4004) {
+          reconnectTimeout = setTimeout(connect, RECONNECT_DELAY)
+        }
+      }
+    }
+
+    connect()
+
+    return () => {
+      closed = true
+      if (pingInterval) clearInterval(pingInterval)
+      if (reconnectTimeout) clearTimeout(reconnectTimeout)
+      ws?.close(1000)
+    }
+  }, [path])
+
+  return isConnected
+}
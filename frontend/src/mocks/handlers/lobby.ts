@@ -61,8 +61,19 @@ export const lobbyHandlers = [
     await delay(50);
 
     return HttpResponse.json({
-      lobbies: Array.from(lobbies.values()),
-      total: lobbies.size,
+      lobbies: Array.from(lobbies.values())
+        .filter((lobby) => lobby.status === 'waiting')
+        .map((lobby) => ({
+          id: lobby.id,
+          name: lobby.name,
+          host_id: lobby.host_id,
+          host_username: lobby.players.find((p) => p.is_host)?.username ?? '',
+          status: lobby.status,
+          max_players: lobby.max_players,
+          player_count: lobby.players.length,
+          created_at: lobby.created_at,
+        })),
+      next_cursor: null,
     });
   }),
 
@@ -1,41 +1,57 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useCallback } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
 import { useAuthStore } from '../stores/authStore';
+import { useLobbyChannel, type LobbyChannelMessage } from '../hooks/useLobbyChannel';
 
-interface Lobby {
+interface LobbySummary {
   id: number;
   name: string;
   host_id: number;
-  invite_code: string;
+  host_username: string;
   status: string;
   max_players: number;
-  players: Array<{
-    id: number;
-    username: string;
-    is_host: boolean;
-  }>;
+  player_count: number;
   created_at: string;
 }
 
 export default function LobbyList() {
   const navigate = useNavigate();
   const { isAuthenticated, tokens } = useAuthStore();
-  const [lobbies, setLobbies] = useState<Lobby[]>([]);
+  const [lobbies, setLobbies] = useState<LobbySummary[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [showCreateModal, setShowCreateModal] = useState(false);
   const [newLobbyName, setNewLobbyName] = useState('');
   const [inviteCode, setInviteCode] = useState('');
 
+  // Listed lobbies are pushed; the first page is (re)loaded once the
+  // channel is open so no change falls in between
+  const handleChannelMessage = useCallback((message: LobbyChannelMessage) => {
+    if (message.type === 'lobby_listed') {
+      const listed = message.data.lobby as LobbySummary;
+      setLobbies((prev) => {
+        const rest = prev.filter((lobby) => lobby.id !== listed.id);
+        return [listed, ...rest].sort((a, b) => b.created_at.localeCompare(a.created_at));
+      });
+    } else if (message.type === 'lobby_unlisted') {
+      setLobbies((prev) => prev.filter((lobby) => lobby.id !== message.data.lobby_id));
+    }
+  }, []);
+  useLobbyChannel('/ws/lobbies', handleChannelMessage, () => fetchLobbies());
+
   useEffect(() => {
     fetchLobbies();
   }, []);
 
-  const fetchLobbies = async () => {
+  const fetchLobbies = async (cursor?: string) => {
     try {
-      const response = await fetch('/api/v1/lobbies');
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+      const response = await fetch(`/api/v1/lobbies${query}`);
       const data = await response.json();
-      setLobbies(data.lobbies || []);
+      const page: LobbySummary[] = data.lobbies || [];
+      setLobbies((prev) => (cursor ? [...prev, ...page] : page));
+      setNextCursor(data.next_cursor ?? null);
     } catch (err) {
       setError('로비 목록을 불러오는데 실패했습니다.');
     } finally {
@@ -186,9 +202,9 @@ export default function LobbyList() {
                   <div>
                     <h4 className="font-medium text-hanyang-navy">{lobby.name}</h4>
                     <p className="text-sm text-hanyang-stone">
-                      호스트: {lobby.players.find(p => p.is_host)?.username || '알 수 없음'}
+                      호스트: {lobby.host_username || '알 수 없음'}
                       {' • '}
-                      {lobby.players.length}/{lobby.max_players}명
+                      {lobby.player_count}/{lobby.max_players}명
                     </p>
                   </div>
                   <button
@@ -212,12 +228,22 @@ export default function LobbyList() {
             </div>
           )}
 
-          <button
-            onClick={fetchLobbies}
-            className="mt-4 text-hanyang-gold hover:underline"
-          >
-            새로고침
-          </button>
+          <div className="mt-4 space-x-4">
+            {nextCursor && (
+              <button
+                onClick={() => fetchLobbies(nextCursor)}
+                className="text-hanyang-gold hover:underline"
+              >
+                더 보기
+              </button>
+            )}
+            <button
+              onClick={() => fetchLobbies()}
+              className="text-hanyang-gold hover:underline"
+            >
+              새로고침
+            </button>
+          </div>
         </div>
 
         {/* Create lobby modal */}
@@ -1,6 +1,7 @@
 import { useState, useEffect, useCallback } from 'react';
 import { useParams, useNavigate, Link } from 'react-router-dom';
 import { useAuthStore } from '../stores/authStore';
+import { useLobbyChannel, type LobbyChannelMessage } from '../hooks/useLobbyChannel';
 
 interface Player {
   id: number;
@@ -67,13 +68,29 @@ export default function LobbyRoom() {
     }
   }, [id, navigate]);
 
+  // Changes are pushed over the lobby channel (state on connect included)
+  const handleChannelMessage = useCallback((message: LobbyChannelMessage) => {
+    if (message.type !== 'lobby_state') return;
+    const data = message.data.lobby as Lobby;
+    setLobby(data);
+    setIsLoading(false);
+
+    if (data.status === 'started' && data.game_id) {
+      navigate(`/game/${data.game_id}`);
+    }
+  }, [navigate]);
+  const isLive = useLobbyChannel(id ? `/ws/lobby/${id}` : null, handleChannelMessage);
+
   useEffect(() => {
     fetchLobby();
+  }, [fetchLobby]);
 
-    // Poll for updates every 2 seconds
-    const interval = setInterval(fetchLobby, 2000);
+  // Poll only while the channel is down
+  useEffect(() => {
+    if (isLive) return;
+    const interval = setInterval(fetchLobby, 5000);
     return () => clearInterval(interval);
-  }, [fetchLobby]);
+  }, [fetchLobby, isLive]);
 
   const currentPlayer = lobby?.players.find(p => p.user_id === user?.id);
   const isHost = lobby?.host_id === user?.id;
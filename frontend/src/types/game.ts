@@ -66,8 +66,10 @@ export interface GamePlayer {
   is_ready: boolean
   resources: Resources
   workers: PlayerWorkers
-  dealt_blueprints: string[]  // 선택 전 배분된 청사진
-  blueprints: string[]  // 선택한 청사진
+  dealt_blueprints?: string[]  // 선택 전 배분된 청사진 (본인만)
+  blueprints?: string[]  // 선택한 청사진 (본인만)
+  dealt_blueprint_count?: number  // 다른 플레이어에게 공개되는 장수
+  blueprint_count?: number
   score: number
   placed_tiles: string[]
   is_ai?: boolean  // AI 플레이어 여부
@@ -82,6 +84,7 @@ export interface GameState {
   current_round: number
   total_rounds: number
   current_turn_player_id: number
+  version?: number
   turn_order: number[]
   board: BoardCell[][]
   players: GamePlayer[]
@@ -0,0 +1,52 @@
+/**
+ * Minimal JSON Patch (RFC 6902) support for WebSocket state deltas
+ */
+
+export interface JsonPatchOperation {
+  op: 'add' | 'remove' | 'replace'
+  path: string
+  value?: unknown
+}
+
+function unescapeToken(token: string): string {
+  return token.replace(/~1/g, '/').replace(/~0/g, '~')
+}
+
+/**
+ * Apply add/remove/replace operations to a copy of a document.
+ * The original document is left unchanged.
+ */
+export function applyJsonPatch<T>(document: T, patch: JsonPatchOperation[]): T {
+  let result: unknown = structuredClone(document)
+
+  for (const op of patch) {
+    if (op.path === '') {
+      result = op.op === 'remove' ? null : structuredClone(op.value)
+      continue
+    }
+
+    const tokens = op.path.split('/').slice(1).map(unescapeToken)
+    const last = tokens.pop() as string
+    let target = result as Record<string, unknown> | unknown[]
+    for (const token of tokens) {
+      target = (Array.isArray(target) ? target[Number(token)] : target[token]) as typeof target
+    }
+
+    if (Array.isArray(target)) {
+      const index = last === '-' ? target.length : Number(last)
+      if (op.op === 'add') {
+        target.splice(index, 0, structuredClone(op.value))
+      } else if (op.op === 'remove') {
+        target.splice(index, 1)
+      } else {
+        target[index] = structuredClone(op.value)
+      }
+    } else if (op.op === 'remove') {
+      delete target[last]
+    } else {
+      target[last] = structuredClone(op.value)
+    }
+  }
+
+  return result as T
+}
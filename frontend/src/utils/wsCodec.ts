@@ -0,0 +1,139 @@
+/**
+ * WebSocket frame decoding (hanyang.json / hanyang.msgpack subprotocols)
+ *
+ * Text frames are JSON. Binary frames start with a flags byte; the rest is
+ * a MessagePack object, zlib-compressed when flag bit 0 is set.
+ */
+
+export const JSON_SUBPROTOCOL = 'hanyang.json'
+export const MSGPACK_SUBPROTOCOL = 'hanyang.msgpack'
+
+const FLAG_COMPRESSED = 0x01
+
+const textDecoder = new TextDecoder()
+
+/**
+ * Minimal MessagePack decoder covering what the server's msgpack.packb
+ * emits for JSON-like data (no extension types).
+ */
+class MsgpackReader {
+  private offset = 0
+  private readonly view: DataView
+
+  constructor(private readonly bytes: Uint8Array) {
+    this.view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength)
+  }
+
+  read(): unknown {
+    const byte = this.bytes[this.offset++]
+
+    if (byte <= 0x7f) return byte
+    if (byte >= 0xe0) return byte - 0x100
+    if ((byte & 0xf0) === 0x80) return this.map(byte & 0x0f)
+    if ((byte & 0xf0) === 0x90) return this.array(byte & 0x0f)
+    if ((byte & 0xe0) === 0xa0) return this.str(byte & 0x1f)
+
+    switch (byte) {
+      case 0xc0: return null
+      case 0xc2: return false
+      case 0xc3: return true
+      case 0xc4: return this.bin(this.uint(1))
+      case 0xc5: return this.bin(this.uint(2))
+      case 0xc6: return this.bin(this.uint(4))
+      case 0xca: return this.number((o) => this.view.getFloat32(o), 4)
+      case 0xcb: return this.number((o) => this.view.getFloat64(o), 8)
+      case 0xcc: return this.uint(1)
+      case 0xcd: return this.uint(2)
+      case 0xce: return this.uint(4)
+      case 0xcf: return this.number((o) => Number(this.view.getBigUint64(o)), 8)
+      case 0xd0: return this.number((o) => this.view.getInt8(o), 1)
+      case 0xd1: return this.number((o) => this.view.getInt16(o), 2)
+      case 0xd2: return this.number((o) => this.view.getInt32(o), 4)
+      case 0xd3: return this.number((o) => Number(this.view.getBigInt64(o)), 8)
+      case 0xd9: return this.str(this.uint(1))
+      case 0xda: return this.str(this.uint(2))
+      case 0xdb: return this.str(this.uint(4))
+      case 0xdc: return this.array(this.uint(2))
+      case 0xdd: return this.array(this.uint(4))
+      case 0xde: return this.map(this.uint(2))
+      case 0xdf: return this.map(this.uint(4))
+    }
+    throw new Error(`Unsupported MessagePack type 0x${byte.toString(16)}`)
+  }
+
+  private number(get: (offset: number) => number, size: number): number {
+    const value = get(this.offset)
+    this.offset += size
+    return value
+  }
+
+  private uint(size: 1 | 2 | 4): number {
+    if (size === 1) return this.number((o) => this.view.getUint8(o), 1)
+    if (size === 2) return this.number((o) => this.view.getUint16(o), 2)
+    return this.number((o) => this.view.getUint32(o), 4)
+  }
+
+  private str(length: number): string {
+    const value = textDecoder.decode(this.bytes.subarray(this.offset, this.offset + length))
+    this.offset += length
+    return value
+  }
+
+  private bin(length: number): Uint8Array {
+    const value = this.bytes.slice(this.offset, this.offset + length)
+    this.offset += length
+    return value
+  }
+
+  private array(length: number): unknown[] {
+    const result: unknown[] = []
+    for (let i = 0; i < length; i++) result.push(this.read())
+    return result
+  }
+
+  private map(length: number): Record<string, unknown> {
+    const result: Record<string, unknown> = {}
+    for (let i = 0; i < length; i++) {
+      const key = String(this.read())
+      result[key] = this.read()
+    }
+    return result
+  }
+}
+
+export function decodeMsgpack(bytes: Uint8Array): unknown {
+  return new MsgpackReader(bytes).read()
+}
+
+async function inflate(bytes: Uint8Array): Promise<Uint8Array> {
+  // "deflate" in the Compression Streams API is zlib (RFC 1950)
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('deflate'))
+  return new Uint8Array(await new Response(stream).arrayBuffer())
+}
+
+/**
+ * Decode a server frame (text JSON or binary MessagePack) into a message.
+ */
+export async function decodeFrame<T>(data: string | ArrayBuffer): Promise<T> {
+  if (typeof data === 'string') {
+    return JSON.parse(data) as T
+  }
+
+  const frame = new Uint8Array(data)
+  let body = frame.subarray(1)
+  if (frame[0] & FLAG_COMPRESSED) {
+    body = await inflate(body)
+  }
+  return decodeMsgpack(body) as T
+}
+
+/**
+ * Subprotocols to offer, most preferred first. Binary frames are opt-in
+ * (VITE_WS_BINARY=true) and need DecompressionStream support.
+ */
+export function preferredSubprotocols(binary: boolean): string[] {
+  if (binary && typeof DecompressionStream !== 'undefined') {
+    return [MSGPACK_SUBPROTOCOL, JSON_SUBPROTOCOL]
+  }
+  return [JSON_SUBPROTOCOL]
+}